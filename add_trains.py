@@ -6,9 +6,10 @@
 import asyncio
 from datetime import datetime, timedelta
 import random
-from sqlalchemy import select
 from app.database.database import AsyncSession, engine, Base
-from app.models.tickets import Train, Wagon, Seat
+from app.models.tickets import Train, Wagon
+from app.repositories.ticket_repository import SeatRepository
+from app.services.fare_rules import FareRulesService
 
 # Города для маршрутов
 CITIES = [
@@ -27,11 +28,12 @@ CITIES = [
     "Сочи",
 ]
 
-# Типы вагонов: (название, количество мест, множитель цены)
+# Типы вагонов: (название, количество мест); множитель цены берется
+# из классов вагонов тарифных правил
 WAGON_TYPES = [
-    ("platzkart", 54, 0.8),      # Плацкарт: 54 места, цена -20%
-    ("coupe", 36, 1.5),          # Купе: 36 мест, цена +50%
-    ("suite", 18, 2.5),          # СВ (люкс): 18 мест, цена +150%
+    ("platzkart", 54),           # Плацкарт: 54 места
+    ("coupe", 36),               # Купе: 36 мест
+    ("suite", 18),               # СВ (люкс): 18 мест
 ]
 
 
@@ -105,7 +107,8 @@ async def create_wagons_for_train(session: AsyncSession, train_id: int, base_pri
     num_wagons = random.randint(2, 3)
     
     for wagon_num in range(1, num_wagons + 1):
-        wagon_type, seats_count, price_multiplier = random.choice(WAGON_TYPES)
+        wagon_type, seats_count = random.choice(WAGON_TYPES)
+        price_multiplier = FareRulesService.rules().class_multiplier(wagon_type)
         
         wagon = Wagon(
             train_id=train_id,
@@ -120,23 +123,19 @@ async def create_wagons_for_train(session: AsyncSession, train_id: int, base_pri
     await session.flush()  # Сохраняем вагоны, чтобы получить их ID
     
     # Создаём места в вагонах
-    for wagon in wagons:
-        wagon_result = await session.execute(
-            select(Wagon).where(Wagon.id == wagon.id)
-        )
-        wagon_obj = wagon_result.scalar_one()
-        
-        for seat_num in range(1, wagon_obj.total_seats + 1):
-            # 70% мест свободны, 30% зарезервированы
-            is_reserved = random.random() < 0.3
-            
-            seat = Seat(
-                wagon_id=wagon_obj.id,
-                seat_number=seat_num,
-                is_available=not is_reserved,
-                is_reserved=is_reserved,
-            )
-            session.add(seat)
+    def seat_rows():
+        for wagon in wagons:
+            for seat_num in range(1, wagon.total_seats + 1):
+                # 70% мест свободны, 30% зарезервированы
+                is_reserved = random.random() < 0.3
+                yield {
+                    "wagon_id": wagon.id,
+                    "seat_number": seat_num,
+                    "is_available": not is_reserved,
+                    "is_reserved": is_reserved,
+                }
+    
+    await SeatRepository(session).add_bulk(seat_rows())
 
 
 async def main():
@@ -1,8 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from starlette.responses import Response
 
-from app.api.dependencies import DBDep, UserIdDep
+from app.api.dependencies import (
+    DBDep,
+    UserIdDep,
+    get_token_or_none,
+    login_rate_limit,
+    register_rate_limit,
+)
 from app.exceptions.auth import (
+    InvalidJWTTokenError,
+    JWTTokenExpiredError,
     UserAlreadyExistsError,
     UserAlreadyExistsHTTPError,
     UserNotFoundError,
@@ -13,11 +21,16 @@ from app.exceptions.auth import (
 from app.schemes.users import SUserAddRequest, SUserAuth
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.auth import AuthService
+from app.services.token_revocation import TokenRevocationService
 
 router = APIRouter(prefix="/api/auth", tags=["Авторизация и аутентификация"])
 
 
-@router.post("/register", summary="Регистрация нового пользователя")
+@router.post(
+    "/register",
+    summary="Регистрация нового пользователя",
+    dependencies=[Depends(register_rate_limit)],
+)
 async def register_user(
     db: DBDep,
     user_data: SUserAddRequest,
@@ -29,7 +42,11 @@ async def register_user(
     return {"status": "OK"}
 
 
-@router.post("/login", summary="Аутентификация пользователя")
+@router.post(
+    "/login",
+    summary="Аутентификация пользователя",
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login_user(
     db: DBDep,
     response: Response,
@@ -55,6 +72,17 @@ async def get_me(db: DBDep, user_id: UserIdDep) -> SUserGetWithRels | None:
 
 
 @router.post("/logout", summary="Выход пользователя из системы")
-async def logout(response: Response) -> dict[str, str]:
+async def logout(
+    db: DBDep,
+    response: Response,
+    token: str | None = Depends(get_token_or_none),
+) -> dict[str, str]:
+    if token is not None:
+        try:
+            data = AuthService.decode_token(token)
+        except (InvalidJWTTokenError, JWTTokenExpiredError):
+            data = None
+        if data is not None:
+            await TokenRevocationService(db).revoke_token(data)
     response.delete_cookie("access_token")
     return {"status": "OK"}
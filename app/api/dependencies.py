@@ -1,55 +1,150 @@
+import math
 from typing import Annotated
 
 from fastapi import Depends, Request
 from pydantic import BaseModel, Field
+from starlette.requests import HTTPConnection
 
+from app.config import settings
 from app.database.database import async_session_maker
 from app.exceptions.auth import (
+    AdminRequiredHTTPError,
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
+    JWTTokenExpiredError,
     NoAccessTokenHTTPError,
+    TokenRevokedError,
+    TokenRevokedHTTPError,
 )
+from app.exceptions.rate_limit import RateLimitExceededHTTPError
 from app.services.auth import AuthService
+from app.services.token_revocation import TokenRevocationService
 from app.database.db_manager import DBManager
+from app.utils.rate_limit import TokenBucketLimiter
 
 
 class PaginationParams(BaseModel):
-    page: int | None = Field(default=1, ge=1)
-    per_page: int | None = Field(default=5, ge=1, le=30)
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: str | None = Field(
+        default=None, description="next_cursor из предыдущей страницы"
+    )
+    fields: str | None = Field(
+        default=None, description="Нужные поля через запятую, например route_from,route_to"
+    )
+
+    @property
+    def field_names(self) -> tuple[str, ...] | None:
+        if not self.fields:
+            return None
+        names = (name.strip() for name in self.fields.split(","))
+        return tuple(dict.fromkeys(name for name in names if name))
 
 
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
-def get_token(request: Request) -> str:
+def get_token_or_none(request: HTTPConnection) -> str | None:
     # Сначала пытаемся получить токен из Authorization заголовка (Bearer token)
     auth_header = request.headers.get("Authorization", None)
     if auth_header and auth_header.startswith("Bearer "):
         return auth_header.replace("Bearer ", "")
     
     # Если нет, пытаемся получить из cookies (для обратной совместимости)
-    token = request.cookies.get("access_token", None)
-    if token is not None:
-        return token
-    
+    return request.cookies.get("access_token", None)
+
+
+def get_token(token: str | None = Depends(get_token_or_none)) -> str:
     # Если нигде нет токена - ошибка
-    raise NoAccessTokenHTTPError
+    if token is None:
+        raise NoAccessTokenHTTPError
+    return token
+
 
+async def get_db():
+    async with DBManager(session_factory=async_session_maker) as db:
+        yield db
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+
+DBDep = Annotated[DBManager, Depends(get_db)]
+
+
+async def get_token_data(db: DBDep, token: str = Depends(get_token)) -> dict:
     try:
         data = AuthService.decode_token(token)
+        await TokenRevocationService(db).ensure_not_revoked(data)
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
+    except TokenRevokedError:
+        raise TokenRevokedHTTPError
+    return data
+
+
+async def get_current_user_id(data: dict = Depends(get_token_data)) -> int:
     return data["user_id"]
 
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
-async def get_db():
-    async with DBManager(session_factory=async_session_maker) as db:
-        yield db
+async def get_admin_user_id(data: dict = Depends(get_token_data)) -> int:
+    if data.get("role") != settings.ADMIN_ROLE:
+        raise AdminRequiredHTTPError
+    return data["user_id"]
 
 
-DBDep = Annotated[DBManager, Depends(get_db)]
+AdminIdDep = Annotated[int, Depends(get_admin_user_id)]
+
+
+def get_stream_token(connection: HTTPConnection) -> str | None:
+    """Токен потока изменений (WebSocket, Server-Sent Events).
+
+    Браузер не передает заголовок Authorization ни в WebSocket, ни в
+    EventSource, поэтому токен берется из параметра ?token=, а затем, как
+    обычно, из заголовка или cookie access_token.
+    """
+    return connection.query_params.get("token") or get_token_or_none(connection)
+
+
+async def is_stream_authorized(connection: HTTPConnection) -> bool:
+    token = get_stream_token(connection)
+    if token is None:
+        return False
+    try:
+        data = AuthService.decode_token(token)
+    except (InvalidJWTTokenError, JWTTokenExpiredError):
+        return False
+    if not TokenRevocationService.may_be_revoked(data):
+        return True
+    async with DBManager(session_factory=async_session_maker) as db:
+        return not await TokenRevocationService(db).is_revoked(data)
+
+
+class RateLimit:
+    """Token bucket на маршрут, ключ - адрес клиента.
+
+    Подключается через `dependencies=[Depends(RateLimit(...))]`.
+    """
+
+    def __init__(self, limit: str):
+        self.limiter = TokenBucketLimiter.from_string(limit)
+
+    def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        client = request.client.host if request.client else "unknown"
+        allowed, remaining, retry_after, reset_after = self.limiter.acquire(client)
+        headers = {
+            "X-RateLimit-Limit": str(self.limiter.capacity),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(math.ceil(reset_after)),
+        }
+        # Ставятся на ответ в main.py, в том числе когда маршрут ответил ошибкой
+        request.state.rate_limit_headers = headers
+        if not allowed:
+            headers = {**headers, "Retry-After": str(max(1, math.ceil(retry_after)))}
+            raise RateLimitExceededHTTPError(headers)
+
+
+login_rate_limit = RateLimit(settings.RATE_LIMIT_LOGIN)
+register_rate_limit = RateLimit(settings.RATE_LIMIT_REGISTER)
+search_rate_limit = RateLimit(settings.RATE_LIMIT_SEARCH)
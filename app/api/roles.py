@@ -1,12 +1,19 @@
 from fastapi import APIRouter
 
-from app.api.dependencies import DBDep
+from app.api.dependencies import DBDep, PaginationDep
+from app.exceptions.pagination import (
+    InvalidCursorError,
+    InvalidCursorHTTPError,
+    InvalidFieldsError,
+    InvalidFieldsHTTPError,
+)
 from app.exceptions.roles import (
     RoleAlreadyExistsError,
     RoleAlreadyExistsHTTPError,
     RoleNotFoundError,
     RoleNotFoundHTTPError,
 )
+from app.schemes.pagination import Page
 from app.schemes.roles import SRoleAdd, SRoleGet
 from app.schemes.relations_users_roles import SRoleGetWithRels
 from app.services.roles import RoleService
@@ -26,11 +33,23 @@ async def create_new_role(
     return {"status": "OK"}
 
 
-@router.get("/roles", summary="Получение списка ролей")
+@router.get(
+    "/roles",
+    summary="Получение списка ролей",
+    response_model_exclude_unset=True,
+)
 async def get_all_roles(
     db: DBDep,
-) -> list[SRoleGet]:
-    return await RoleService(db).get_roles()
+    pagination: PaginationDep,
+) -> Page[SRoleGet]:
+    try:
+        return await RoleService(db).get_roles(
+            pagination.limit, pagination.cursor, pagination.field_names
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
 
 
 @router.get("/roles/{id}", summary="Получение конкретной роли")
@@ -1,40 +1,64 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from datetime import datetime
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
+from datetime import date, datetime
 
-from app.database.database import get_async_session
+from app.api.dependencies import DBDep, PaginationDep, UserIdDep, is_stream_authorized, search_rate_limit
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.booking import (
+    InvalidItineraryError, InvalidItineraryHTTPError, InvalidSegmentError, InvalidSegmentHTTPError,
+    SeatUnavailableError, SeatUnavailableHTTPError
+)
+from app.exceptions.auth import InvalidTokenHTTPError
+from app.exceptions.schedules import ScheduleAlreadyExistsError, ScheduleAlreadyExistsHTTPError
+from app.exceptions.pagination import (
+    InvalidCursorError, InvalidCursorHTTPError, InvalidFieldsError, InvalidFieldsHTTPError
+)
 from app.models.tickets import Train, Wagon, Seat, Ticket
 from app.schemes.ticket_schemes import (
-    TrainCreate, TrainResponse, TrainScheduleResponse,
+    TrainCreate, TrainResponse, TrainScheduleResponse, TrainStopResponse, SegmentAvailability,
     WagonCreate, WagonResponse, WagonWithSeatsResponse,
-    SeatResponse,
-    TicketCreate, TicketResponse, TicketDetailResponse,
+    SeatResponse, SeatMapResponse, SeatMapChanges,
+    TicketCreate, TicketResponse, TicketDetailResponse, ItineraryCreate, ItineraryResponse,
     SearchRequest,
-    PriceCalculationRequest, PriceCalculationResponse,
-    PaymentRequest, PaymentResponse
-)
-from app.repositories.ticket_repository import (
-    TrainRepository, WagonRepository, SeatRepository, TicketRepository
+    PriceCalculationRequest, PriceCalculationResponse, FareMatrixResponse, JourneyOption,
+    PaymentRequest, PaymentResponse, CitySuggestion
 )
+from app.schemes.pagination import Page
+from app.schemes.route_calendar import SRouteCalendarDay
+from app.schemes.schedules import SScheduleAdd, SScheduleGet
+from app.services.cities import CityIndexService
+from app.services.journeys import JourneyPlannerService
+from app.services.loaders import TicketLoaders
+from app.services.route_calendar import RouteCalendarService
+from app.services.schedules import ScheduleService
 from app.services.ticket_service import (
     TrainService, WagonService, SeatService, TicketService, DiscountService
 )
 
 router = APIRouter(prefix="/api/tickets", tags=["Tickets"])
 
-# Зависимости
-async def get_train_service(session: AsyncSession = Depends(get_async_session)) -> TrainService:
-    return TrainService(TrainRepository(session))
+# Зависимости: все сервисы запроса работают в одном DBManager (одна транзакция)
+async def get_train_service(db: DBDep) -> TrainService:
+    return TrainService(db)
 
-async def get_wagon_service(session: AsyncSession = Depends(get_async_session)) -> WagonService:
-    return WagonService(WagonRepository(session), SeatRepository(session))
+async def get_wagon_service(db: DBDep) -> WagonService:
+    return WagonService(db)
 
-async def get_seat_service(session: AsyncSession = Depends(get_async_session)) -> SeatService:
-    return SeatService(SeatRepository(session))
+async def get_seat_service(db: DBDep) -> SeatService:
+    return SeatService(db)
 
-async def get_ticket_service(session: AsyncSession = Depends(get_async_session)) -> TicketService:
-    return TicketService(TicketRepository(session), SeatRepository(session))
+async def get_ticket_service(db: DBDep) -> TicketService:
+    return TicketService(db)
+
+async def get_schedule_service(db: DBDep) -> ScheduleService:
+    return ScheduleService(db)
+
+async def get_loaders(db: DBDep) -> TicketLoaders:
+    return TicketLoaders(db)
 
 # ============= МАРШРУТЫ ПОЕЗДОВ =============
 
@@ -46,29 +70,62 @@ async def create_train(
     """Создать новый поезд в системе"""
     return await service.create_train(train_data)
 
-@router.get("/trains/search", response_model=List[TrainScheduleResponse], summary="Поиск поездов")
+@router.get("/trains/search", response_model=List[TrainScheduleResponse], summary="Поиск поездов",
+            dependencies=[Depends(search_rate_limit)])
 async def search_trains(
     route_from: str,
     route_to: str,
+    departure_date: Optional[date] = None,
+    wagon_type: Optional[str] = None,
+    alternatives: int = Query(0, ge=0, le=10),
+    flex_days: int = Query(3, ge=1, le=14),
     train_service: TrainService = Depends(get_train_service),
-    wagon_service: WagonService = Depends(get_wagon_service),
-    seat_service: SeatService = Depends(get_seat_service)
+    loaders: TicketLoaders = Depends(get_loaders)
 ):
-    """Поиск доступных поездов по маршруту"""
-    trains = await train_service.search_trains(route_from, route_to)
+    """Поиск доступных поездов по маршруту.
+    
+    С `departure_date` и `alternatives=N`: если на этот день в вагонах
+    `wagon_type` (любых, если не указан) мест нет, в конец ответа добавляются
+    до N ближайших поездов в пределах ±`flex_days` дней с `is_alternative=true`.
+    """
+    route_from, route_to = CityIndexService.resolve(route_from), CityIndexService.resolve(route_to)
+    trains = await train_service.search_trains(route_from, route_to, departure_date)
+    result = await _schedule(trains, loaders, wagon_type)
+    
+    if alternatives and departure_date is not None and not any(
+        free for _, free in result
+    ):
+        nearest = await train_service.find_alternatives(
+            route_from, route_to, departure_date, wagon_type, alternatives, flex_days
+        )
+        result += await _schedule(nearest, loaders, wagon_type, is_alternative=True)
+    
+    return [response for response, _ in result]
+
+async def _schedule(trains: List[Train], loaders: TicketLoaders, wagon_type: Optional[str],
+                    is_alternative: bool = False) -> List[tuple]:
+    """Расписание поездов и свободные места запрошенного класса по каждому"""
+    # Вагоны всех поездов и свободные места всех вагонов - по одному запросу
+    wagons_by_train = await loaders.wagons_by_train.load_many(train.id for train in trains)
+    available_by_wagon = await loaders.available_seat_counts.load_many(
+        wagon.id for wagons in wagons_by_train for wagon in wagons
+    )
+    available_iter = iter(available_by_wagon)
     
     result = []
-    for train in trains:
-        wagons = await wagon_service.get_wagons_by_train(train.id)
+    for train, wagons in zip(trains, wagons_by_train):
         wagon_responses = []
         available_seats = 0
+        requested_seats = 0
         
         for wagon in wagons:
-            available = await seat_service.count_available_seats(wagon.id)
+            available = next(available_iter)
             available_seats += available
+            if wagon_type is None or wagon.wagon_type == wagon_type:
+                requested_seats += available
             wagon_responses.append(WagonResponse.model_validate(wagon))
         
-        result.append(TrainScheduleResponse(
+        result.append((TrainScheduleResponse(
             id=train.id,
             train_number=train.train_number,
             route_from=train.route_from,
@@ -78,11 +135,55 @@ async def search_trains(
             duration_hours=train.duration_hours,
             base_price=train.base_price,
             available_seats_count=available_seats,
-            wagons=wagon_responses
-        ))
+            wagons=wagon_responses,
+            is_alternative=is_alternative
+        ), requested_seats))
     
     return result
 
+@router.get("/trains/cities", response_model=List[CitySuggestion], summary="Автодополнение городов")
+async def suggest_cities(
+    q: str = "",
+    limit: int = Query(10, ge=1, le=20)
+):
+    """Города по началу названия (кириллица или латиница), популярные первыми"""
+    return [
+        CitySuggestion.model_construct(name=name, departures=departures)
+        for name, departures in CityIndexService.index().suggest(q, limit)
+    ]
+
+@router.get("/trains/journeys", response_model=List[JourneyOption], summary="Маршруты с пересадками",
+            dependencies=[Depends(search_rate_limit)])
+async def plan_journeys(
+    route_from: str,
+    route_to: str,
+    departure_after: Optional[datetime] = None,
+    max_transfers: int = Query(2, ge=0, le=3),
+    min_connection_minutes: int = Query(30, ge=0, le=720),
+    max_hours: int = Query(72, ge=1, le=168)
+):
+    """Варианты поездки с пересадками, оптимальные по прибытию, числу пересадок и цене"""
+    return JourneyPlannerService.plan(
+        CityIndexService.resolve(route_from), CityIndexService.resolve(route_to),
+        departure_after or datetime.now(),
+        max_transfers, min_connection_minutes, max_hours
+    )
+
+@router.get("/trains/calendar", response_model=List[SRouteCalendarDay], summary="Календарь низких цен",
+            dependencies=[Depends(search_rate_limit)])
+async def get_route_calendar(
+    db: DBDep,
+    route_from: str,
+    route_to: str,
+    start: Optional[date] = None,
+    days: int = Query(60, ge=1, le=120)
+):
+    """Минимальная цена и свободные места по дням маршрута (одно чтение сводки)"""
+    return await RouteCalendarService(db).get_calendar(
+        CityIndexService.resolve(route_from), CityIndexService.resolve(route_to),
+        start or date.today(), days
+    )
+
 @router.get("/trains/{train_id}", response_model=TrainResponse, summary="Получить информацию о поезде")
 async def get_train(
     train_id: int,
@@ -94,26 +195,75 @@ async def get_train(
         raise HTTPException(status_code=404, detail="Поезд не найден")
     return train
 
-@router.get("/trains", response_model=List[TrainResponse], summary="Получить все поезда")
+@router.get("/trains/{train_id}/stops", response_model=List[TrainStopResponse], summary="Остановки поезда")
+async def get_train_stops(
+    train_id: int,
+    service: TrainService = Depends(get_train_service)
+):
+    """Остановки поезда по порядку; номера остановок задают участок при бронировании"""
+    train = await service.get_train(train_id)
+    if not train:
+        raise HTTPException(status_code=404, detail="Поезд не найден")
+    return await service.get_stops(train)
+
+@router.get("/trains/{train_id}/availability", response_model=List[SegmentAvailability],
+            summary="Свободные места на участке маршрута")
+async def get_segment_availability(
+    train_id: int,
+    from_stop: Optional[int] = Query(None, ge=0, description="Номер остановки посадки"),
+    to_stop: Optional[int] = Query(None, ge=1, description="Номер остановки высадки"),
+    service: TrainService = Depends(get_train_service)
+):
+    """Свободные места по вагонам между остановками (без остановок - на всем маршруте)"""
+    train = await service.get_train(train_id)
+    if not train:
+        raise HTTPException(status_code=404, detail="Поезд не найден")
+    try:
+        return await service.get_segment_availability(train, from_stop, to_stop)
+    except InvalidSegmentError:
+        raise InvalidSegmentHTTPError
+
+@router.get("/trains", response_model=Page[TrainResponse], response_model_exclude_unset=True,
+            summary="Получить все поезда")
 async def get_all_trains(
+    pagination: PaginationDep,
     service: TrainService = Depends(get_train_service)
 ):
-    """Получить список всех активных поездов"""
-    return await service.get_all_trains()
+    """Получить список поездов постранично; fields= оставляет в ответе только нужные поля"""
+    try:
+        return await service.get_all_trains(pagination.limit, pagination.cursor, pagination.field_names)
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
+
+# ============= РАСПИСАНИЕ =============
+
+@router.post("/schedules", response_model=SScheduleGet, summary="Создать расписание поезда")
+async def create_schedule(
+    schedule_data: SScheduleAdd,
+    service: ScheduleService = Depends(get_schedule_service)
+):
+    """Шаблон рейса: отправления по нему создаются при поиске на дату и на ближайшие дни"""
+    try:
+        return await service.create_schedule(schedule_data)
+    except ScheduleAlreadyExistsError:
+        raise ScheduleAlreadyExistsHTTPError
+
+@router.get("/schedules", response_model=List[SScheduleGet], summary="Расписания поездов")
+async def get_schedules(service: ScheduleService = Depends(get_schedule_service)):
+    """Все шаблоны рейсов с составом"""
+    return await service.get_schedules()
 
 # ============= МАРШРУТЫ ВАГОНОВ =============
 
 @router.post("/wagons", response_model=WagonResponse, summary="Создать вагон")
 async def create_wagon(
     wagon_data: WagonCreate,
-    wagon_service: WagonService = Depends(get_wagon_service),
-    seat_service: SeatService = Depends(get_seat_service)
+    wagon_service: WagonService = Depends(get_wagon_service)
 ):
-    """Создать новый вагон"""
-    wagon = await wagon_service.create_wagon(wagon_data)
-    # Создать места для вагона
-    await seat_service.create_seats(wagon.id, wagon.total_seats)
-    return wagon
+    """Создать новый вагон вместе с местами"""
+    return await wagon_service.create_wagon(wagon_data)
 
 @router.get("/wagons/{wagon_id}", response_model=WagonWithSeatsResponse, summary="Получить схему вагона")
 async def get_wagon(
@@ -154,24 +304,105 @@ async def get_wagons_by_type(
 
 # ============= МАРШРУТЫ МЕСТ =============
 
-@router.get("/wagons/{wagon_id}/layout", response_model=List[SeatResponse], summary="Получить схему мест вагона")
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+@router.get("/wagons/{wagon_id}/layout", response_model=Union[List[SeatResponse], SeatMapResponse, SeatMapChanges],
+            summary="Получить схему мест вагона", responses={304: {"description": "Места не менялись"}})
 async def get_wagon_layout(
     wagon_id: int,
+    response: Response,
+    compact: bool = Query(False, description="Свободные места битовой маской в base64 вместо списка мест"),
+    since: Optional[int] = Query(None, description="Версия схемы у клиента: вернуть только изменившиеся места"),
+    if_none_match: Optional[str] = Header(None),
     service: SeatService = Depends(get_seat_service)
 ):
-    """Получить визуальную схему всех мест в вагоне"""
+    """Получить визуальную схему всех мест в вагоне.
+    
+    ETag - версия мест вагона в БД, общая для всех процессов. Если версия
+    не изменилась (If-None-Match или since) - 304. С since отдаются только
+    изменившиеся места (SeatMapChanges), а если версии нет в журнале вагона - полная схема."""
+    seat_map = await service.get_seat_map(wagon_id)
+    if seat_map is None:
+        raise HTTPException(status_code=404, detail="Вагон не найден или нет мест")
+    etag = f'"{seat_map.version}"'
+    if since == seat_map.version or _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    if since is not None:
+        changes = service.get_seat_map_changes(wagon_id, since)
+        if changes is not None:
+            return changes
+    if compact:
+        return seat_map
     seats = await service.get_wagon_layout(wagon_id)
     if not seats:
         raise HTTPException(status_code=404, detail="Вагон не найден или нет мест")
     return [SeatResponse.model_validate(seat) for seat in seats]
 
+async def _watch_seat_map(wagon_id: int):
+    # Подписка живет долго: соединение с БД нужно только для первой схемы
+    async with DBManager(session_factory=async_session_maker) as db:
+        return await SeatService(db).watch_seat_map(wagon_id)
+
+@router.get("/wagons/{wagon_id}/layout/events", summary="Изменения мест вагона (SSE)")
+async def stream_wagon_layout(wagon_id: int, request: Request):
+    """Server-Sent Events: сначала схема (`snapshot`, как `layout?compact=true`),
+    затем изменения мест (`delta`) после каждой брони и отмены; `ping` раз в
+    SEAT_EVENTS_PING_SECONDS. Отставшему клиенту вместо изменений приходит новая схема.
+    EventSource не передает заголовки: токен - ?token= или cookie, как у /layout/ws."""
+    if not await is_stream_authorized(request):
+        raise InvalidTokenHTTPError
+    stream = await _watch_seat_map(wagon_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Вагон не найден или нет мест")
+    
+    async def events():
+        try:
+            async for message in stream:
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            await stream.aclose()
+    
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/wagons/{wagon_id}/layout/ws")
+async def watch_wagon_layout(websocket: WebSocket, wagon_id: int):
+    """Те же сообщения, что у /layout/events, через WebSocket (токен - ?token= или cookie)"""
+    if not await is_stream_authorized(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    stream = await _watch_seat_map(wagon_id)
+    if stream is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Вагон не найден")
+        return
+    await websocket.accept()
+    try:
+        async for message in stream:
+            await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await stream.aclose()
+
 @router.get("/wagons/{wagon_id}/available", response_model=List[SeatResponse], summary="Свободные места")
 async def get_available_seats(
     wagon_id: int,
+    from_stop: Optional[int] = Query(None, ge=0, description="Номер остановки посадки"),
+    to_stop: Optional[int] = Query(None, ge=1, description="Номер остановки высадки"),
     service: SeatService = Depends(get_seat_service)
 ):
-    """Получить список свободных мест в вагоне"""
-    seats = await service.get_available_seats(wagon_id)
+    """Получить список свободных мест в вагоне на всем маршруте или на участке"""
+    try:
+        seats = await service.get_available_seats(wagon_id, from_stop, to_stop)
+    except InvalidSegmentError:
+        raise InvalidSegmentHTTPError
     return [SeatResponse.model_validate(seat) for seat in seats]
 
 # ============= МАРШРУТЫ РАСЧЕТА ЦЕНЫ И СКИДОК =============
@@ -179,72 +410,112 @@ async def get_available_seats(
 @router.post("/calculate-price", response_model=PriceCalculationResponse, summary="Расчет стоимости билета")
 async def calculate_price(
     request: PriceCalculationRequest,
-    train_service: TrainService = Depends(get_train_service),
-    wagon_service: WagonService = Depends(get_wagon_service),
+    loaders: TicketLoaders = Depends(get_loaders),
     ticket_service: TicketService = Depends(get_ticket_service)
 ):
     """Рассчитать стоимость билета с учетом скидок"""
-    train = await train_service.get_train(request.train_id)
+    train, wagon = await asyncio.gather(
+        loaders.trains.load(request.train_id),
+        loaders.wagons.load(request.wagon_id)
+    )
     if not train:
         raise HTTPException(status_code=404, detail="Поезд не найден")
     
-    wagon = await wagon_service.get_wagon(request.wagon_id)
     if not wagon:
         raise HTTPException(status_code=404, detail="Вагон не найден")
     
     return await ticket_service.calculate_price(train, wagon, request.discount_type)
 
+@router.get("/fare-matrix", response_model=FareMatrixResponse, summary="Матрица цен по вагонам и скидкам")
+async def get_fare_matrix(
+    train_ids: List[int] = Query(min_length=1, max_length=100),
+    ticket_service: TicketService = Depends(get_ticket_service)
+):
+    """Цены всех вагонов поездов (?train_ids=1&train_ids=2...) по всем типам скидок за один запрос"""
+    return await ticket_service.get_fare_matrix(train_ids)
+
 @router.get("/discounts", summary="Информация о скидках")
 async def get_discounts():
     """Получить информацию о доступных скидках"""
-    return {
-        "discounts": [
-            {"type": "child", "description": "Детская скидка (0-12 лет)", "percent": 50},
-            {"type": "student", "description": "Студенческая скидка", "percent": 25},
-            {"type": "pensioner", "description": "Пенсионная скидка", "percent": 40},
-            {"type": "none", "description": "Без скидки", "percent": 0}
-        ]
-    }
+    return {"discounts": DiscountService.get_discounts()}
 
 # ============= МАРШРУТЫ БИЛЕТОВ =============
 
 @router.post("/create", response_model=TicketResponse, summary="Создать и забронировать билет")
 async def create_ticket(
     ticket_data: TicketCreate,
-    train_service: TrainService = Depends(get_train_service),
-    wagon_service: WagonService = Depends(get_wagon_service),
-    seat_service: SeatService = Depends(get_seat_service),
+    user_id: UserIdDep,
+    loaders: TicketLoaders = Depends(get_loaders),
     ticket_service: TicketService = Depends(get_ticket_service)
 ):
-    """Создать новый билет и зарезервировать место"""
+    """Создать новый билет и зарезервировать место (по seat_id или seat_number) на маршруте или участке"""
+    train, wagon = await asyncio.gather(
+        loaders.trains.load(ticket_data.train_id),
+        loaders.wagons.load(ticket_data.wagon_id)
+    )
+    
     # Проверить поезд
-    train = await train_service.get_train(ticket_data.train_id)
     if not train:
         raise HTTPException(status_code=404, detail="Поезд не найден")
     
     # Проверить вагон
-    wagon = await wagon_service.get_wagon(ticket_data.wagon_id)
     if not wagon:
         raise HTTPException(status_code=404, detail="Вагон не найден")
     
-    # Проверить место
-    seat = await seat_service.get_seat(ticket_data.seat_id)
-    if not seat or not seat.is_available or seat.is_reserved:
+    # Проверить место; у непроданного места LAZY_SEAT_ROWS строка создается здесь
+    if ticket_data.seat_id is not None:
+        seat = await loaders.seats.load(ticket_data.seat_id)
+    else:
+        seat = await ticket_service.materialize_seat(wagon, ticket_data.seat_number)
+    if not seat:
+        raise HTTPException(status_code=400, detail="Место недоступно для бронирования")
+    # Место, проданное на части маршрута, еще может быть свободно на другом участке
+    if ticket_data.from_stop is None and (not seat.is_available or seat.is_reserved):
         raise HTTPException(status_code=400, detail="Место недоступно для бронирования")
+    ticket_data.seat_id = seat.id
     
     # Рассчитать цену
     price_calc = await ticket_service.calculate_price(train, wagon, ticket_data.discount_type)
     
     # Создать билет
-    ticket = await ticket_service.create_ticket(
-        ticket_data,
-        price_calc.base_price,
-        price_calc.final_price,
-        train
-    )
+    try:
+        ticket = await ticket_service.create_ticket(
+            ticket_data,
+            price_calc.base_price,
+            price_calc.final_price,
+            train,
+            user_id=user_id
+        )
+    except InvalidItineraryError:
+        raise InvalidItineraryHTTPError
+    except InvalidSegmentError:
+        raise InvalidSegmentHTTPError
+    except SeatUnavailableError:
+        raise SeatUnavailableHTTPError
     
     return TicketResponse.model_validate(ticket)
 
+@router.post("/itinerary", response_model=ItineraryResponse, summary="Забронировать поездку из нескольких поездов")
+async def create_itinerary(
+    itinerary: ItineraryCreate,
+    user_id: UserIdDep,
+    ticket_service: TicketService = Depends(get_ticket_service)
+):
+    """Туда-обратно или с пересадками: все билеты одной транзакцией или ни одного"""
+    try:
+        tickets = await ticket_service.create_itinerary(itinerary, user_id=user_id)
+    except InvalidItineraryError:
+        raise InvalidItineraryHTTPError
+    except InvalidSegmentError:
+        raise InvalidSegmentHTTPError
+    except SeatUnavailableError:
+        raise SeatUnavailableHTTPError
+    
+    return ItineraryResponse(
+        tickets=[TicketResponse.model_validate(ticket) for ticket in tickets],
+        total_price=round(sum(ticket.final_price for ticket in tickets), 2)
+    )
+
 @router.get("/ticket/{ticket_id}", response_model=TicketResponse, summary="Получить информацию о билете")
 async def get_ticket(
     ticket_id: int,
@@ -256,6 +527,41 @@ async def get_ticket(
         raise HTTPException(status_code=404, detail="Билет не найден")
     return ticket
 
+@router.get("/ticket/{ticket_id}/details", response_model=TicketDetailResponse,
+            summary="Билет с данными поезда, вагона и места")
+async def get_ticket_detail(
+    ticket_id: int,
+    user_id: UserIdDep,
+    service: TicketService = Depends(get_ticket_service)
+):
+    """Получить свой билет вместе с номером поезда, маршрутом, вагоном и местом одним запросом"""
+    ticket = await service.get_ticket_detail(ticket_id, user_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Билет не найден")
+    return ticket
+
+@router.get("/details", response_model=List[TicketDetailResponse], summary="Детали нескольких билетов")
+async def get_ticket_details(
+    user_id: UserIdDep,
+    ids: List[int] = Query(min_length=1, max_length=100),
+    service: TicketService = Depends(get_ticket_service)
+):
+    """Получить детали нескольких своих билетов одним запросом (?ids=1&ids=2...); чужие id пропускаются"""
+    return await service.get_ticket_details(ids, user_id)
+
+@router.get("/my-tickets", response_model=Page[TicketDetailResponse], summary="Мои билеты")
+async def get_my_tickets(
+    user_id: UserIdDep,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor из предыдущей страницы"),
+    service: TicketService = Depends(get_ticket_service)
+):
+    """Билеты текущего пользователя, новые первыми, постранично по курсору"""
+    try:
+        return await service.get_my_tickets(user_id, limit, cursor)
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+
 @router.get("/user/{passenger_email}", response_model=List[TicketResponse], summary="Билеты пассажира")
 async def get_user_tickets(
     passenger_email: str,
@@ -267,7 +573,6 @@ async def get_user_tickets(
 @router.delete("/delete/{ticket_id}", summary="Удалить билет")
 async def delete_ticket(
     ticket_id: int,
-    seat_service: SeatService = Depends(get_seat_service),
     ticket_service: TicketService = Depends(get_ticket_service)
 ):
     """Удалить билет и освободить место"""
@@ -275,11 +580,8 @@ async def delete_ticket(
     if not ticket:
         raise HTTPException(status_code=404, detail="Билет не найден")
     
-    # Освободить место
-    await seat_service.release_seat(ticket.seat_id)
-    
-    # Удалить билет
-    await ticket_service.delete_ticket(ticket_id)
+    # Освободить место и удалить билет
+    await ticket_service.cancel_ticket(ticket)
     
     return {"message": "Билет успешно удален", "ticket_id": ticket_id}
 
@@ -297,18 +599,12 @@ async def pay_ticket(
 @router.get("/ticket/{ticket_id}/pdf", summary="Получить электронный билет")
 async def get_ticket_pdf(
     ticket_id: int,
-    train_service: TrainService = Depends(get_train_service),
-    wagon_service: WagonService = Depends(get_wagon_service),
-    seat_service: SeatService = Depends(get_seat_service),
+    user_id: UserIdDep,
     ticket_service: TicketService = Depends(get_ticket_service)
 ):
-    """Получить данные для электронного билета в формате JSON"""
-    ticket = await ticket_service.get_ticket(ticket_id)
+    """Получить данные для своего электронного билета в формате JSON"""
+    ticket = await ticket_service.get_ticket_detail(ticket_id, user_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Билет не найден")
     
-    train = await train_service.get_train(ticket.train_id)
-    wagon = await wagon_service.get_wagon(ticket.wagon_id)
-    seat = await seat_service.get_seat(ticket.seat_id)
-    
-    return await ticket_service.generate_pdf_ticket(ticket, train, wagon, seat)
\ No newline at end of file
+    return await ticket_service.generate_pdf_ticket(ticket)
\ No newline at end of file
@@ -6,6 +6,48 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     DB_NAME: str
+    # Размер кэша скомпилированных SQL-выражений движка (query_cache_size)
+    SQL_COMPILED_CACHE_SIZE: int = 1200
+    # Роль (roles.name), которой доступны служебные эндпоинты
+    ADMIN_ROLE: str = "admin"
+    # Bloom-фильтр отозванных токенов живет в памяти процесса и узнает об
+    # отзыве только в своем процессе или при пересборке из таблицы. Сервис
+    # рассчитан на один процесс (uvicorn без --workers); при нескольких
+    # воркерах токен, отозванный в одном, принимается остальными до их
+    # ближайшей пересборки - не дольше REVOKED_TOKENS_REBUILD_SECONDS
+    REVOKED_TOKENS_BLOOM_CAPACITY: int = 10_000
+    REVOKED_TOKENS_BLOOM_ERROR_RATE: float = 0.01
+    REVOKED_TOKENS_REBUILD_SECONDS: int = 30
+    # Тарифные правила перечитываются из БД при изменении через админку
+    # и на случай правок из других процессов - с этим интервалом
+    FARE_RULES_RELOAD_SECONDS: int = 60
+    # Счетчики загрузки для цены по загрузке ведутся в памяти и сверяются
+    # с таблицей мест с этим интервалом
+    OCCUPANCY_RESYNC_SECONDS: int = 300
+    # Расписание для поиска с пересадками обновляется при создании поездов
+    # и вагонов, целиком пересобирается с этим интервалом
+    TIMETABLE_REBUILD_SECONDS: int = 300
+    # Не создавать строки мест вместе с вагоном: места 1..total_seats
+    # подразумеваются свободными, строка появляется при первой продаже
+    LAZY_SEAT_ROWS: bool = False
+    # Отправления по шаблонам рейсов создаются при поиске на дату, а на
+    # ближайшие дни - заданием с этим интервалом
+    SCHEDULE_HORIZON_DAYS: int = 3
+    SCHEDULE_MATERIALIZE_SECONDS: int = 3600
+    # Продажа открывается за столько дней: дальше отправления не создаются
+    # и поиск на дату ничего не находит
+    SCHEDULE_BOOKING_DAYS: int = 90
+    # Подписка на схему вагона: сколько изменений держать для медленного
+    # клиента, прежде чем отправить ему полную схему, и интервал ping
+    SEAT_EVENTS_QUEUE_SIZE: int = 256
+    SEAT_EVENTS_PING_SECONDS: int = 15
+    # Сколько последних сверок мест с БД помнит вагон для /layout?since=<версия>
+    SEAT_CHANGE_LOG_SIZE: int = 64
+    # Лимиты запросов в формате "<запросов>/<секунд>" на клиента и маршрут
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "10/60"
+    RATE_LIMIT_REGISTER: str = "5/60"
+    RATE_LIMIT_SEARCH: str = "60/60"
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
     )
@@ -10,8 +10,12 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
+from app.database.statement_cache import StatementCacheStats
 
-engine = create_async_engine(settings.get_db_url)
+engine = create_async_engine(
+    settings.get_db_url, query_cache_size=settings.SQL_COMPILED_CACHE_SIZE
+)
+statement_cache_stats = StatementCacheStats(engine)
 
 engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
 
@@ -31,7 +35,19 @@ class Base(DeclarativeBase):
 
 # Импортируем модели для регистрации в Base.metadata
 # Это ВАЖНО для создания таблиц через Base.metadata.create_all()
-from app.models.tickets import Train, Wagon, Seat, Ticket  # noqa: E402, F401
+from app.models.roles import RoleModel  # noqa: E402, F401
+from app.models.users import UserModel  # noqa: E402, F401
+from app.models.stations import StationModel  # noqa: E402, F401
+from app.models.tickets import Train, TrainStop, Wagon, Seat, Ticket  # noqa: E402, F401
+from app.models.revoked_tokens import RevokedTokenModel  # noqa: E402, F401
+from app.models.route_calendar import RouteDayFareModel  # noqa: E402, F401
+from app.models.schedules import TrainScheduleModel, ScheduleWagonModel  # noqa: E402, F401
+from app.models.fares import (  # noqa: E402, F401
+    DiscountCategoryModel,
+    WagonClassModel,
+    FareRuleModel,
+    OccupancyTierModel,
+)
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
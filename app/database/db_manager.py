@@ -1,6 +1,22 @@
 from app.database.database import async_session_maker
+from app.repositories.fares import (
+    DiscountCategoriesRepository,
+    FareRulesRepository,
+    OccupancyTiersRepository,
+    WagonClassesRepository,
+)
+from app.repositories.revoked_tokens import RevokedTokensRepository
 from app.repositories.roles import RolesRepository
+from app.repositories.route_calendar import RouteDayFaresRepository
+from app.repositories.schedules import TrainSchedulesRepository
+from app.repositories.stations import StationsRepository
 from app.repositories.users import UsersRepository
+from app.repositories.ticket_repository import (
+    TrainRepository,
+    WagonRepository,
+    SeatRepository,
+    TicketRepository,
+)
 
 
 class DBManager:
@@ -13,6 +29,18 @@ class DBManager:
         # Пример:
         self.users = UsersRepository(self.session)
         self.roles = RolesRepository(self.session)
+        self.revoked_tokens = RevokedTokensRepository(self.session)
+        self.stations = StationsRepository(self.session)
+        self.trains = TrainRepository(self.session)
+        self.wagons = WagonRepository(self.session)
+        self.seats = SeatRepository(self.session)
+        self.tickets = TicketRepository(self.session)
+        self.discount_categories = DiscountCategoriesRepository(self.session)
+        self.wagon_classes = WagonClassesRepository(self.session)
+        self.fare_rules = FareRulesRepository(self.session)
+        self.occupancy_tiers = OccupancyTiersRepository(self.session)
+        self.route_day_fares = RouteDayFaresRepository(self.session)
+        self.train_schedules = TrainSchedulesRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
@@ -0,0 +1,57 @@
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import default
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class StatementCacheStats:
+    """Статистика попаданий в кэш скомпилированного SQL движка.
+
+    SQLAlchemy помечает каждое выполнение в ExecutionContext.cache_hit;
+    здесь эти отметки считаются, а для промахов запоминается текст SQL,
+    чтобы было видно, какие запросы компилируются повторно. Считается
+    выполнение выражения (after_execute), а не вызовы курсора: executemany
+    на 36 строк мест - одно выполнение, а не 36.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_tracked_misses: int = 200) -> None:
+        self.engine = engine
+        self.max_tracked_misses = max_tracked_misses
+        self.counts: Counter = Counter()
+        self.misses: Counter = Counter()
+        event.listen(engine.sync_engine, "after_execute", self._on_execute)
+
+    def _on_execute(self, conn, clauseelement, multiparams, params, options, result):
+        context = result.context
+        cache_hit = getattr(context, "cache_hit", default.NO_CACHE_KEY)
+        self.counts[cache_hit] += 1
+        statement = context.statement
+        if cache_hit is default.CACHE_MISS and (
+            statement in self.misses or len(self.misses) < self.max_tracked_misses
+        ):
+            self.misses[statement] += 1
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.misses.clear()
+
+    def report(self, top: int = 10) -> dict:
+        hits = self.counts[default.CACHE_HIT]
+        misses = self.counts[default.CACHE_MISS]
+        compiled_cache = self.engine.sync_engine._compiled_cache
+        return {
+            "executions": sum(self.counts.values()),
+            "hits": hits,
+            "misses": misses,
+            "uncached": sum(self.counts.values()) - hits - misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "cache_entries": len(compiled_cache) if compiled_cache is not None else 0,
+            "cache_capacity": (
+                compiled_cache.capacity if compiled_cache is not None else 0
+            ),
+            "top_misses": [
+                {"statement": statement, "count": count}
+                for statement, count in self.misses.most_common(top)
+            ],
+        }
@@ -13,6 +13,10 @@ class JWTTokenExpiredError(MyAppError):
     detail = "Токен истек, необходимо снова авторизоваться"
 
 
+class TokenRevokedError(MyAppError):
+    detail = "Токен отозван, необходимо снова авторизоваться"
+
+
 class InvalidPasswordError(MyAppError):
     detail = "Неверный пароль"
 
@@ -31,6 +35,16 @@ class JWTTokenExpiredHTTPError(MyAppHTTPError):
     detail = "Токен истек, необходимо снова авторизоваться"
 
 
+class TokenRevokedHTTPError(MyAppHTTPError):
+    status_code = 401
+    detail = "Токен отозван, необходимо снова авторизоваться"
+
+
+class AdminRequiredHTTPError(MyAppHTTPError):
+    status_code = 403
+    detail = "Недостаточно прав: нужна роль администратора"
+
+
 class NoAccessTokenHTTPError(MyAppHTTPError):
     detail = "Вы не предоставили токен доступа"
     status_code = 401
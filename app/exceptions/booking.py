@@ -0,0 +1,28 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class SeatUnavailableError(MyAppError):
+    detail = "Место недоступно для бронирования"
+
+
+class SeatUnavailableHTTPError(MyAppHTTPError):
+    status_code = 409
+    detail = "Место недоступно для бронирования"
+
+
+class InvalidItineraryError(MyAppError):
+    detail = "Поезд, вагон или место маршрута не найдены или не согласованы"
+
+
+class InvalidItineraryHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Поезд, вагон или место маршрута не найдены или не согласованы"
+
+
+class InvalidSegmentError(MyAppError):
+    detail = "У поезда нет такого участка маршрута"
+
+
+class InvalidSegmentHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "У поезда нет такого участка маршрута"
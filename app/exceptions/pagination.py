@@ -0,0 +1,19 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidCursorError(MyAppError):
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidFieldsError(MyAppError):
+    detail = "Запрошены неизвестные поля"
+
+
+class InvalidFieldsHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Запрошены неизвестные поля"
@@ -0,0 +1,11 @@
+from app.exceptions.base import MyAppHTTPError
+
+
+class RateLimitExceededHTTPError(MyAppHTTPError):
+    status_code = 429
+    detail = "Слишком много запросов, повторите попытку позже"
+
+    def __init__(self, headers: dict[str, str]):
+        super(MyAppHTTPError, self).__init__(
+            status_code=self.status_code, detail=self.detail, headers=headers
+        )
@@ -0,0 +1,10 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class ScheduleAlreadyExistsError(MyAppError):
+    detail = "Расписание поезда с таким номером уже существует"
+
+
+class ScheduleAlreadyExistsHTTPError(MyAppHTTPError):
+    status_code = 409
+    detail = "Расписание поезда с таким номером уже существует"
@@ -0,0 +1,100 @@
+from sqlalchemy import Boolean, CheckConstraint, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+def month_day_check(column: str) -> str:
+    """SQL-условие: column пусто или существующий день года 'MM-DD' (29.02 допустимо)"""
+    digit = "('0','1','2','3','4','5','6','7','8','9')"
+    return (
+        f"{column} IS NULL OR (length({column}) = 5 AND substr({column}, 3, 1) = '-' "
+        f"AND substr({column}, 4, 1) IN ('0','1','2','3') AND substr({column}, 5, 1) IN {digit} "
+        f"AND substr({column}, 4, 2) >= '01' AND substr({column}, 4, 2) <= "
+        f"CASE substr({column}, 1, 2) WHEN '02' THEN '29' WHEN '04' THEN '30' "
+        f"WHEN '06' THEN '30' WHEN '09' THEN '30' WHEN '11' THEN '30' "
+        f"WHEN '01' THEN '31' WHEN '03' THEN '31' WHEN '05' THEN '31' WHEN '07' THEN '31' "
+        f"WHEN '08' THEN '31' WHEN '10' THEN '31' WHEN '12' THEN '31' ELSE '00' END)"
+    )
+
+
+class DiscountCategoryModel(Base):
+    __tablename__ = "discount_categories"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
+    description: Mapped[str] = mapped_column(String(200), default="")
+    percent: Mapped[float] = mapped_column(Float, default=0.0)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+
+class WagonClassModel(Base):
+    __tablename__ = "wagon_classes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    wagon_type: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
+    description: Mapped[str] = mapped_column(String(200), default="")
+    multiplier: Mapped[float] = mapped_column(Float, default=1.0)
+
+
+class FareRuleModel(Base):
+    """Множитель цены; пустые поля условия означают "любое значение"."""
+
+    __tablename__ = "fare_rules"
+    __table_args__ = (
+        # Сезон и срок покупки задаются отдельными правилами и перемножаются
+        CheckConstraint(
+            "season_start IS NULL OR "
+            "(advance_min_days IS NULL AND advance_max_days IS NULL)",
+            name="ck_fare_rules_season_or_advance",
+        ),
+        CheckConstraint(
+            "(season_start IS NULL) = (season_end IS NULL)",
+            name="ck_fare_rules_season_pair",
+        ),
+        CheckConstraint(
+            month_day_check("season_start"), name="ck_fare_rules_season_start"
+        ),
+        CheckConstraint(month_day_check("season_end"), name="ck_fare_rules_season_end"),
+        CheckConstraint(
+            "(advance_min_days IS NULL OR advance_min_days >= 0) AND "
+            "(advance_max_days IS NULL OR advance_max_days >= 0)",
+            name="ck_fare_rules_advance_days",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+    route_from: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    route_to: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    wagon_type: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    season_start: Mapped[str | None] = mapped_column(String(5), nullable=True)  # MM-DD
+    season_end: Mapped[str | None] = mapped_column(String(5), nullable=True)
+    advance_min_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    advance_max_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    multiplier: Mapped[float] = mapped_column(Float, default=1.0)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+
+class OccupancyTierModel(Base):
+    """Ступень цены по загрузке: с min_load_percent занятых мест действует multiplier.
+
+    Пустые train_id / wagon_type - шкала для любых поездов / классов;
+    берется самая конкретная из имеющихся шкал.
+    """
+
+    __tablename__ = "occupancy_tiers"
+    __table_args__ = (
+        CheckConstraint(
+            "min_load_percent BETWEEN 0 AND 100",
+            name="ck_occupancy_tiers_min_load_percent",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    train_id: Mapped[int | None] = mapped_column(
+        ForeignKey("trains.id", ondelete="CASCADE"), nullable=True
+    )
+    wagon_type: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    min_load_percent: Mapped[int] = mapped_column(Integer, default=0)
+    multiplier: Mapped[float] = mapped_column(Float, default=1.0)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
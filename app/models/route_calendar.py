@@ -0,0 +1,36 @@
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class RouteDayFareModel(Base):
+    """Сводка по маршруту на день: самый дешевый тариф среди вагонов
+    со свободными местами и число свободных мест.
+
+    Пересчитывается при бронировании, отмене и изменении расписания;
+    календарь цен читает диапазон дней по уникальному индексу.
+    """
+
+    __tablename__ = "route_day_fares"
+    __table_args__ = (
+        UniqueConstraint(
+            "from_station_id",
+            "to_station_id",
+            "day",
+            name="uq_route_day_fares_route_day",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    from_station_id: Mapped[int] = mapped_column(
+        ForeignKey("stations.id"), nullable=False
+    )
+    to_station_id: Mapped[int] = mapped_column(
+        ForeignKey("stations.id"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    min_fare: Mapped[float | None] = mapped_column(Float, nullable=True)
+    available_seats: Mapped[int] = mapped_column(Integer, default=0)
+    trains_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,104 @@
+from datetime import date, time
+
+from sqlalchemy import (
+    Boolean,
+    Date,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Time,
+    UniqueConstraint,
+    event,
+    select,
+)
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from app.database.database import Base
+from app.models.stations import StationModel, station_id
+
+# Дни курсирования: бит 0 - понедельник ... бит 6 - воскресенье
+EVERY_DAY = 0b1111111
+
+
+class TrainScheduleModel(Base):
+    """Шаблон рейса: номер, маршрут, время отправления, дни курсирования,
+    период действия и состав.
+
+    Отправления (trains) по шаблону заранее не создаются: поезд на дату
+    с вагонами появляется при первом поиске на эту дату или заданием,
+    которое держит заполненными ближайшие SCHEDULE_HORIZON_DAYS дней.
+    """
+
+    __tablename__ = "train_schedules"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    train_number: Mapped[str] = mapped_column(String(50), unique=True)
+    from_station_id: Mapped[int] = mapped_column(ForeignKey("stations.id"))
+    to_station_id: Mapped[int] = mapped_column(ForeignKey("stations.id"))
+    route_from: Mapped[str] = column_property(
+        select(StationModel.name)
+        .where(StationModel.id == from_station_id)
+        .scalar_subquery(),
+        expire_on_flush=False,
+    )
+    route_to: Mapped[str] = column_property(
+        select(StationModel.name)
+        .where(StationModel.id == to_station_id)
+        .scalar_subquery(),
+        expire_on_flush=False,
+    )
+    departure_time: Mapped[time] = mapped_column(Time)
+    duration_minutes: Mapped[int] = mapped_column(Integer)
+    base_price: Mapped[float] = mapped_column(Float)
+    days_of_week: Mapped[int] = mapped_column(Integer, default=EVERY_DAY)
+    valid_from: Mapped[date] = mapped_column(Date)
+    valid_to: Mapped[date | None] = mapped_column(Date, nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    wagons: Mapped[list["ScheduleWagonModel"]] = relationship(
+        back_populates="schedule",
+        cascade="all, delete-orphan",
+        order_by="ScheduleWagonModel.wagon_number",
+        lazy="selectin",
+    )
+
+    def runs_on(self, day: date) -> bool:
+        """Ходит ли поезд по шаблону в этот день"""
+        return (
+            self.valid_from <= day
+            and (self.valid_to is None or day <= self.valid_to)
+            and bool(self.days_of_week >> day.weekday() & 1)
+        )
+
+
+@event.listens_for(TrainScheduleModel, "before_insert")
+def _assign_schedule_stations(mapper, connection, schedule: TrainScheduleModel) -> None:
+    if schedule.from_station_id is None:
+        schedule.from_station_id = station_id(connection, schedule.route_from)
+    if schedule.to_station_id is None:
+        schedule.to_station_id = station_id(connection, schedule.route_to)
+
+
+class ScheduleWagonModel(Base):
+    """Вагон состава шаблона; копируется в каждое отправление"""
+
+    __tablename__ = "schedule_wagons"
+    __table_args__ = (
+        UniqueConstraint(
+            "schedule_id",
+            "wagon_number",
+            name="uq_schedule_wagons_schedule_id_wagon_number",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    schedule_id: Mapped[int] = mapped_column(
+        ForeignKey("train_schedules.id", ondelete="CASCADE")
+    )
+    wagon_number: Mapped[int] = mapped_column(Integer)
+    wagon_type: Mapped[str] = mapped_column(String(20))
+    total_seats: Mapped[int] = mapped_column(Integer)
+    # None - множитель класса вагона из тарифных правил на момент создания отправления
+    price_multiplier: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    schedule: Mapped[TrainScheduleModel] = relationship(back_populates="wagons")
@@ -0,0 +1,26 @@
+from sqlalchemy import String, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class StationModel(Base):
+    """Справочник станций: маршруты поездов ссылаются на него по id"""
+
+    __tablename__ = "stations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+
+
+def station_id(connection: Connection, name: str) -> int:
+    """id станции по названию; новая станция добавляется в справочник"""
+    stations = StationModel.__table__
+    found = connection.execute(
+        select(stations.c.id).where(stations.c.name == name)
+    ).scalar()
+    if found is None:
+        found = connection.execute(
+            insert(stations).values(name=name)
+        ).inserted_primary_key[0]
+    return found
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Float, DateTime, Boolean, Enum, ForeignKey, Integer
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, String, Float, Date, DateTime, Boolean, Enum, ForeignKey, Integer, BigInteger, Index, UniqueConstraint, event, select
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
 from app.database.database import Base
-from datetime import datetime
+from app.models.stations import StationModel, station_id
+from datetime import date, datetime
 import enum
 
 if TYPE_CHECKING:
@@ -21,22 +22,84 @@ class DiscountType(str, enum.Enum):
 
 class Train(Base):
     __tablename__ = "trains"
+    # Поиск по маршруту и обход отправлений по дате - по одному индексу из целых
+    __table_args__ = (
+        Index("ix_trains_route_departure", "from_station_id", "to_station_id", "departure_time"),
+        # Номер поезда повторяется у отправлений по расписанию, уникален в паре с датой
+        UniqueConstraint("train_number", "departure_time", name="uq_trains_train_number_departure_time"),
+        # Отправление шаблона на дату создается один раз, даже при параллельных поисках
+        UniqueConstraint("schedule_id", "service_date", name="uq_trains_schedule_id_service_date"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    train_number: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    route_from: Mapped[str] = mapped_column(String(100), index=True)
-    route_to: Mapped[str] = mapped_column(String(100), index=True)
+    train_number: Mapped[str] = mapped_column(String(50), index=True)
+    from_station_id: Mapped[int] = mapped_column(ForeignKey("stations.id"))
+    to_station_id: Mapped[int] = mapped_column(ForeignKey("stations.id"))
+    # Названия станций читаются тем же SELECT, что и поезд; в таблице только id
+    route_from: Mapped[str] = column_property(
+        select(StationModel.name).where(StationModel.id == from_station_id).scalar_subquery(),
+        expire_on_flush=False
+    )
+    route_to: Mapped[str] = column_property(
+        select(StationModel.name).where(StationModel.id == to_station_id).scalar_subquery(),
+        expire_on_flush=False
+    )
     departure_time: Mapped[datetime] = mapped_column(DateTime)
     arrival_time: Mapped[datetime] = mapped_column(DateTime)
     duration_hours: Mapped[int] = mapped_column(Integer)
     base_price: Mapped[float] = mapped_column(Float)  # Базовая цена за место
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Отправление по шаблону рейса: шаблон и день; у поезда, созданного вручную, - None
+    schedule_id: Mapped[int | None] = mapped_column(
+        ForeignKey("train_schedules.id", ondelete="SET NULL"), nullable=True
+    )
+    service_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships для SQLAdmin
     wagons: Mapped[list["Wagon"]] = relationship(back_populates="train", cascade="all, delete-orphan")
     tickets: Mapped[list["Ticket"]] = relationship(back_populates="train", cascade="all, delete-orphan")
+    from_station: Mapped[StationModel] = relationship(foreign_keys=[from_station_id])
+    to_station: Mapped[StationModel] = relationship(foreign_keys=[to_station_id])
+    stops: Mapped[list["TrainStop"]] = relationship(
+        back_populates="train", cascade="all, delete-orphan", order_by="TrainStop.stop_index"
+    )
+
+@event.listens_for(Train, "before_insert")
+def _assign_stations(mapper, connection, train: Train) -> None:
+    # Поезд можно создать по названиям станций (Train(route_from=...)): id подставляются при вставке
+    if train.from_station_id is None:
+        train.from_station_id = station_id(connection, train.route_from)
+    if train.to_station_id is None:
+        train.to_station_id = station_id(connection, train.route_to)
+
+class TrainStop(Base):
+    __tablename__ = "train_stops"
+    # Остановки поезда по порядку, первая - route_from, последняя - route_to.
+    # У поезда без строк остановок их две: route_from и route_to
+    __table_args__ = (
+        UniqueConstraint("train_id", "stop_index", name="uq_train_stops_train_id_stop_index"),
+        Index("ix_train_stops_station_id_train_id", "station_id", "train_id"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    train_id: Mapped[int] = mapped_column(ForeignKey("trains.id"))
+    stop_index: Mapped[int] = mapped_column(Integer)
+    station_id: Mapped[int] = mapped_column(ForeignKey("stations.id"))
+    station: Mapped[str] = column_property(
+        select(StationModel.name).where(StationModel.id == station_id).scalar_subquery(),
+        expire_on_flush=False
+    )
+    arrival_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # None у первой
+    departure_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # None у последней
+    
+    train: Mapped["Train"] = relationship(back_populates="stops")
+
+@event.listens_for(TrainStop, "before_insert")
+def _assign_stop_station(mapper, connection, stop: TrainStop) -> None:
+    if stop.station_id is None:
+        stop.station_id = station_id(connection, stop.station)
 
 class Wagon(Base):
     __tablename__ = "wagons"
@@ -47,6 +110,8 @@ class Wagon(Base):
     wagon_type: Mapped[str] = mapped_column(String(20))  # platzkart, coupe, suite
     total_seats: Mapped[int] = mapped_column(Integer)
     price_multiplier: Mapped[float] = mapped_column(Float, default=1.0)  # Множитель цены в зависимости от типа
+    # Версия мест вагона: растет при каждой записи мест (триггеры SEAT_VERSION_TRIGGERS)
+    seat_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -57,12 +122,19 @@ class Wagon(Base):
 
 class Seat(Base):
     __tablename__ = "seats"
+    # Одно место вагона - одна строка. При LAZY_SEAT_ROWS строки есть только
+    # у проданных и придержанных мест, остальные места 1..total_seats вагона
+    # подразумеваются свободными
+    __table_args__ = (UniqueConstraint("wagon_id", "seat_number", name="uq_seats_wagon_id_seat_number"),)
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    wagon_id: Mapped[int] = mapped_column(ForeignKey("wagons.id"), index=True)
+    wagon_id: Mapped[int] = mapped_column(ForeignKey("wagons.id"))
     seat_number: Mapped[int] = mapped_column(Integer)
     is_available: Mapped[bool] = mapped_column(Boolean, default=True)
     is_reserved: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Бит k - продан участок от остановки k до k + 1 (FULL_ROUTE = -1 - весь маршрут).
+    # is_available/is_reserved описывают весь маршрут: место свободно, пока маска 0
+    segments_mask: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -70,10 +142,35 @@ class Seat(Base):
     wagon: Mapped["Wagon"] = relationship(back_populates="seats")
     tickets: Mapped[list["Ticket"]] = relationship(back_populates="seat", cascade="all, delete-orphan")
 
+# Версия мест вагона растет в той же транзакции, что и запись места, кто бы
+# ее ни сделал: сервисы, админка, другой процесс или SQL вручную. ETag схемы
+# вагона по ней одинаков во всех процессах и не сбрасывается при перезапуске
+_SEAT_STATE_CHANGED = (
+    "OLD.is_available IS NOT NEW.is_available OR OLD.is_reserved IS NOT NEW.is_reserved "
+    "OR OLD.segments_mask IS NOT NEW.segments_mask OR OLD.seat_number IS NOT NEW.seat_number "
+    "OR OLD.wagon_id IS NOT NEW.wagon_id"
+)
+SEAT_VERSION_TRIGGERS = (
+    "CREATE TRIGGER seats_seat_version_insert AFTER INSERT ON seats BEGIN "
+    "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = NEW.wagon_id; END",
+    f"CREATE TRIGGER seats_seat_version_update AFTER UPDATE ON seats WHEN {_SEAT_STATE_CHANGED} BEGIN "
+    "UPDATE wagons SET seat_version = seat_version + 1 WHERE id IN (OLD.wagon_id, NEW.wagon_id); END",
+    "CREATE TRIGGER seats_seat_version_delete AFTER DELETE ON seats BEGIN "
+    "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = OLD.wagon_id; END",
+    "CREATE TRIGGER wagons_seat_version_total_seats AFTER UPDATE OF total_seats ON wagons "
+    "WHEN OLD.total_seats IS NOT NEW.total_seats BEGIN "
+    "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = NEW.id; END",
+)
+for trigger in SEAT_VERSION_TRIGGERS:
+    event.listen(Seat.__table__, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
+
 class Ticket(Base):
     __tablename__ = "tickets"
+    # История билетов пользователя читается по (user_id, created_at) без сортировки
+    __table_args__ = (Index("ix_tickets_user_id_created_at", "user_id", "created_at"),)
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     train_id: Mapped[int] = mapped_column(ForeignKey("trains.id"), index=True)
     wagon_id: Mapped[int] = mapped_column(ForeignKey("wagons.id"), index=True)
     seat_id: Mapped[int] = mapped_column(ForeignKey("seats.id"), index=True)
@@ -89,6 +186,9 @@ class Ticket(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     departure_time: Mapped[datetime] = mapped_column(DateTime)
     arrival_time: Mapped[datetime] = mapped_column(DateTime)
+    # Участок маршрута по номерам остановок; None - весь маршрут
+    from_stop: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    to_stop: Mapped[int | None] = mapped_column(Integer, nullable=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships для SQLAdmin - ВАЖНО для админ панели!
@@ -1,19 +1,79 @@
+from functools import cache
+from itertools import islice
+from typing import Iterable, Literal, Sequence
+
 from pydantic import BaseModel
 from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 
 
 from app.database.database import Base
 from app.exceptions.base import ObjectAlreadyExistsError
+from app.exceptions.pagination import InvalidCursorError, InvalidFieldsError
+from app.schemes.pagination import Page
+from app.utils.pagination import decode_cursor, split_page
+
+
+@cache
+def projection_columns(model: Base, schema: BaseModel) -> tuple | None:
+    """Колонки модели, из которых целиком собирается схема.
+
+    None - если схема требует полей, которых нет среди колонок модели
+    (например, вложенных связей), и проекция невозможна.
+    """
+    column_keys = {attr.key for attr in model.__mapper__.column_attrs}
+    if not set(schema.model_fields) <= column_keys:
+        return None
+    return tuple(getattr(model, key) for key in schema.model_fields)
+
+
+@cache
+def sparse_columns(
+    model: Base, schema: BaseModel, fields: tuple[str, ...] | None = None
+) -> tuple:
+    """Колонки для выборки части полей схемы; id выбирается всегда (он же курсор)"""
+    column_keys = {attr.key for attr in model.__mapper__.column_attrs}
+    available = [key for key in schema.model_fields if key in column_keys]
+    if fields is None:
+        return tuple(getattr(model, key) for key in available)
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise InvalidFieldsError(sorted(unknown))
+    keys = ["id", *(key for key in fields if key != "id")]
+    return tuple(getattr(model, key) for key in keys)
 
 
 class BaseRepository:
     model: Base = None
     schema: BaseModel = None
+    # Режим проекции: выбирать только нужные схеме колонки и собирать схемы
+    # из кортежей строк без создания ORM-сущностей и повторной валидации
+    projection: bool = False
 
     def __init__(self, session):
         self.session = session
 
+    def _select(self):
+        """Возвращает (запрос, колонки проекции или None)"""
+        columns = (
+            projection_columns(self.model, self.schema) if self.projection else None
+        )
+        if columns is None:
+            return select(self.model), None
+        return select(*columns), columns
+
+    def _to_schemas(self, result, columns) -> list[BaseModel]:
+        if columns is None:
+            return [
+                self.schema.model_validate(model, from_attributes=True)
+                for model in result.scalars().all()
+            ]
+        # Данные из типизированных колонок БД уже прошли валидацию при записи
+        keys = [column.key for column in columns]
+        construct = self.schema.model_construct
+        return [construct(**dict(zip(keys, row))) for row in result.all()]
+
     async def get_filtered(
         self,
         limit: int | None = None,
@@ -24,28 +84,65 @@ class BaseRepository:
         filter_by = {k: v for k, v in filter_by.items() if v is not None}
         filter_ = [v for v in filter if v is not None]
 
-        query = select(self.model).filter(*filter_).filter_by(**filter_by)
+        query, columns = self._select()
+        query = query.filter(*filter_).filter_by(**filter_by)
 
         if limit is not None and offset is not None:
             query = query.limit(limit).offset(offset)
         # print(query.compile(bind=engine, compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
-        result = [
-            self.schema.model_validate(model, from_attributes=True)
-            for model in result.scalars().all()
-        ]
+        return self._to_schemas(result, columns)
 
-        return result
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        *filter,
+        **filter_by,
+    ) -> Page:
+        """Страница записей по возрастанию id с выбором полей (sparse fieldset).
+
+        Keyset-пагинация: курсор хранит id последней записи, запрос
+        `WHERE id > :after ORDER BY id LIMIT :n` идет по первичному ключу
+        и стоит одинаково на любой странице, в отличие от OFFSET.
+        Схемы собираются только из выбранных колонок, поэтому при
+        response_model_exclude_unset в ответ попадают только они.
+        """
+        columns = sparse_columns(self.model, self.schema, fields)
+        query = select(*columns).filter(*filter).filter_by(**filter_by)
+        if cursor is not None:
+            after = decode_cursor(cursor)
+            if len(after) != 1 or not isinstance(after[0], int):
+                raise InvalidCursorError
+            query = query.where(self.model.id > after[0])
+        result = await self.session.execute(
+            query.order_by(self.model.id).limit(limit + 1)
+        )
+        keys = [column.key for column in columns]
+        construct = self.schema.model_construct
+        items = [construct(**dict(zip(keys, row))) for row in result.all()]
+        items, next_cursor = split_page(items, limit, lambda item: (item.id,))
+        return Page[self.schema](items=items, next_cursor=next_cursor)
 
     async def get_all(self, *args, **kwargs) -> list[BaseModel]:
         """Возращает все записи в БД из связаной таблицы"""
         return await self.get_filtered(*args, **kwargs)
 
     async def get_one_or_none(self, **filter_by) -> None | BaseModel:
-        query = select(self.model).filter_by(**filter_by)
+        query, columns = self._select()
+        query = query.filter_by(**filter_by)
 
         result = await self.session.execute(query)
 
+        if columns is not None:
+            row = result.one_or_none()
+            if row is None:
+                return None
+            return self.schema.model_construct(
+                **{column.key: value for column, value in zip(columns, row)}
+            )
+
         model = result.scalars().one_or_none()
         if model is None:
             return None
@@ -69,13 +166,138 @@ class BaseRepository:
         except IntegrityError as exc:
             raise ObjectAlreadyExistsError from exc
 
-    async def add_bulk(self, data: list[BaseModel]) -> None | BaseModel:
+    def _upsert_stmt(
+        self,
+        on_conflict: Literal["update", "nothing"],
+        conflict_columns: Sequence[str] | None,
+        update_columns: Sequence[str],
+    ):
+        """INSERT ... ON CONFLICT диалекта; None - у диалекта его нет"""
+        dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+        dialect = self.session.bind.dialect.name
+        if dialect not in dialect_insert:
+            return None
+        add_stmt = dialect_insert[dialect](self.model)
+        if on_conflict == "nothing":
+            return add_stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        return add_stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: add_stmt.excluded[column] for column in update_columns},
+        )
+
+    async def _add_chunk_by_rows(
+        self,
+        params: list[dict],
+        on_conflict: Literal["update", "nothing"],
+        conflict_columns: Sequence[str] | None,
+        update_columns: Sequence[str],
+        returning: bool,
+    ) -> list:
+        """Upsert порции без ON CONFLICT: вставка целиком, при конфликте - по строке.
+
+        Каждая вставка идет в SAVEPOINT, поэтому конфликт откатывает только
+        ее; для on_conflict="update" конфликтующая строка обновляется по
+        conflict_columns.
+        """
+        primary_key = self.model.__mapper__.primary_key
+        add_stmt = insert(self.model)
+        if returning:
+            add_stmt = add_stmt.returning(*primary_key, sort_by_parameter_order=True)
+        try:
+            async with self.session.begin_nested():
+                result = await self.session.execute(add_stmt, params)
+                return list(result.scalars().all()) if returning else []
+        except IntegrityError:
+            pass
+
+        keys = []
+        for row in params:
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.execute(add_stmt, row)
+                    if returning:
+                        keys.extend(result.scalars().all())
+                continue
+            except IntegrityError as exc:
+                if on_conflict == "nothing":
+                    continue
+                if not conflict_columns:
+                    raise ObjectAlreadyExistsError from exc
+            update_stmt = (
+                update(self.model)
+                .where(*(getattr(self.model, c) == row[c] for c in conflict_columns))
+                .values({column: row[column] for column in update_columns})
+            )
+            if returning:
+                update_stmt = update_stmt.returning(*primary_key)
+            result = await self.session.execute(update_stmt)
+            if returning:
+                keys.extend(result.scalars().all())
+        return keys
+
+    async def add_bulk(
+        self,
+        data: Iterable[BaseModel | dict],
+        chunk_size: int = 500,
+        returning: bool = False,
+        on_conflict: Literal["update", "nothing"] | None = None,
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+    ) -> list | None:
         """
         Метод для множественного добавления данных в таблицу
+
+        Данные читаются из итератора порциями по chunk_size строк и
+        отправляются через executemany, поэтому размер пачки не упирается в
+        лимит параметров SQLite. При returning=True возвращает первичные
+        ключи добавленных строк в порядке входных данных.
+
+        on_conflict="nothing" пропускает конфликтующие строки (их ключи не
+        возвращаются), on_conflict="update" обновляет update_columns (по
+        умолчанию - все переданные колонки, кроме conflict_columns). У
+        диалектов без ON CONFLICT порция вставляется целиком, а при
+        конфликте - по строкам (_add_chunk_by_rows).
         """
-        add_stmt = insert(self.model).values([item.model_dump() for item in data])
-        # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
-        await self.session.execute(add_stmt)
+        rows = iter(data)
+        keys = []
+        add_stmt = None
+        by_rows = False
+        while chunk := list(islice(rows, chunk_size)):
+            params = [
+                item if isinstance(item, dict) else item.model_dump() for item in chunk
+            ]
+            if add_stmt is None and not by_rows:
+                if on_conflict is None:
+                    add_stmt = insert(self.model)
+                else:
+                    update_columns = update_columns or [
+                        c for c in params[0] if c not in (conflict_columns or ())
+                    ]
+                    add_stmt = self._upsert_stmt(
+                        on_conflict, conflict_columns, update_columns
+                    )
+                    # Диалект без ON CONFLICT: конфликты ловятся по строкам
+                    by_rows = add_stmt is None
+                if returning and not by_rows:
+                    add_stmt = add_stmt.returning(
+                        *self.model.__mapper__.primary_key,
+                        sort_by_parameter_order=on_conflict is None,
+                    )
+            if by_rows:
+                keys.extend(
+                    await self._add_chunk_by_rows(
+                        params, on_conflict, conflict_columns, update_columns, returning
+                    )
+                )
+                continue
+            # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
+            try:
+                result = await self.session.execute(add_stmt, params)
+            except IntegrityError as exc:
+                raise ObjectAlreadyExistsError from exc
+            if returning:
+                keys.extend(result.scalars().all())
+        return keys if returning else None
 
     async def delete(self, *filters, **filter_by) -> None:
         delete_stmt = delete(self.model)
@@ -85,7 +307,6 @@ class BaseRepository:
             delete_stmt = delete_stmt.filter_by(**filter_by)
 
         await self.session.execute(delete_stmt)
-        await self.session.commit()
 
     async def edit(
         self, data: BaseModel, exclude_unset: bool = False, **filter_by
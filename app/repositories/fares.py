@@ -0,0 +1,37 @@
+from app.models.fares import (
+    DiscountCategoryModel,
+    FareRuleModel,
+    OccupancyTierModel,
+    WagonClassModel,
+)
+from app.repositories.base import BaseRepository
+from app.schemes.fares import (
+    SDiscountCategoryGet,
+    SFareRuleGet,
+    SOccupancyTierGet,
+    SWagonClassGet,
+)
+
+
+class DiscountCategoriesRepository(BaseRepository):
+    model = DiscountCategoryModel
+    schema = SDiscountCategoryGet
+    projection = True
+
+
+class WagonClassesRepository(BaseRepository):
+    model = WagonClassModel
+    schema = SWagonClassGet
+    projection = True
+
+
+class FareRulesRepository(BaseRepository):
+    model = FareRuleModel
+    schema = SFareRuleGet
+    projection = True
+
+
+class OccupancyTiersRepository(BaseRepository):
+    model = OccupancyTierModel
+    schema = SOccupancyTierGet
+    projection = True
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from app.models.revoked_tokens import RevokedTokenModel
+from app.repositories.base import BaseRepository
+from app.schemes.revoked_tokens import SRevokedTokenGet
+
+
+class RevokedTokensRepository(BaseRepository):
+    model = RevokedTokenModel
+    schema = SRevokedTokenGet
+    projection = True
+
+    async def get_active_jtis(self, now: datetime) -> list[str]:
+        query = select(self.model.jti).where(self.model.expires_at > now)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def delete_expired(self, now: datetime) -> None:
+        delete_stmt = delete(self.model).where(self.model.expires_at <= now)
+        await self.session.execute(delete_stmt)
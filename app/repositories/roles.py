@@ -10,6 +10,7 @@ from app.schemes.relations_users_roles import SRoleGetWithRels
 class RolesRepository(BaseRepository):
     model = RoleModel
     schema = SRoleGet
+    projection = True
 
     async def get_one_or_none_with_users(self, **filter_by):
         query = (
@@ -0,0 +1,46 @@
+from datetime import date
+
+from sqlalchemy import delete
+
+from app.models.route_calendar import RouteDayFareModel
+from app.repositories.base import BaseRepository
+from app.schemes.route_calendar import SRouteDayFareAdd, SRouteDayFareGet
+
+ROUTE_DAY_KEY = ("from_station_id", "to_station_id", "day")
+
+
+class RouteDayFaresRepository(BaseRepository):
+    model = RouteDayFareModel
+    schema = SRouteDayFareGet
+    projection = True
+
+    async def get_range(
+        self, from_station_id: int, to_station_id: int, start: date, end: date
+    ) -> list[SRouteDayFareGet]:
+        """Дни маршрута в [start, end) одним чтением по уникальному индексу (откуда, куда, день)"""
+        query, columns = self._select()
+        query = query.where(
+            self.model.from_station_id == from_station_id,
+            self.model.to_station_id == to_station_id,
+            self.model.day >= start,
+            self.model.day < end,
+        ).order_by(self.model.day)
+        result = await self.session.execute(query)
+        return self._to_schemas(result, columns)
+
+    async def upsert(self, rows: list[SRouteDayFareAdd]) -> None:
+        await self.add_bulk(rows, on_conflict="update", conflict_columns=ROUTE_DAY_KEY)
+
+    async def delete_day(
+        self, from_station_id: int, to_station_id: int, day: date
+    ) -> None:
+        await self.session.execute(
+            delete(self.model).where(
+                self.model.from_station_id == from_station_id,
+                self.model.to_station_id == to_station_id,
+                self.model.day == day,
+            )
+        )
+
+    async def delete_all(self) -> None:
+        await self.session.execute(delete(self.model))
@@ -0,0 +1,59 @@
+from datetime import date
+
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.models.schedules import TrainScheduleModel
+from app.models.tickets import Train
+from app.repositories.base import BaseRepository
+from app.schemes.schedules import SScheduleGet
+
+
+class TrainSchedulesRepository(BaseRepository):
+    model = TrainScheduleModel
+    schema = SScheduleGet
+
+    async def create(self, schedule: TrainScheduleModel) -> TrainScheduleModel:
+        self.session.add(schedule)
+        try:
+            await self.session.flush()
+        except IntegrityError as exc:
+            raise ObjectAlreadyExistsError from exc
+        return schedule
+
+    async def get_schedules(self) -> list[TrainScheduleModel]:
+        result = await self.session.execute(
+            select(self.model).order_by(self.model.train_number)
+        )
+        return result.scalars().all()
+
+    async def get_running(
+        self, start: date, end: date, route: tuple[int, int] | None = None
+    ) -> list[TrainScheduleModel]:
+        """Активные шаблоны, период действия которых пересекает дни [start, end)"""
+        query = select(self.model).where(
+            self.model.is_active == True,
+            self.model.valid_from < end,
+            or_(self.model.valid_to == None, self.model.valid_to >= start),
+        )
+        if route is not None:
+            query = query.where(
+                self.model.from_station_id == route[0],
+                self.model.to_station_id == route[1],
+            )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_departure_days(
+        self, schedule_ids: list[int], start: date, end: date
+    ) -> set[tuple[int, date]]:
+        """(шаблон, день) уже созданных отправлений в днях [start, end)"""
+        result = await self.session.execute(
+            select(Train.schedule_id, Train.service_date).where(
+                Train.schedule_id.in_(schedule_ids),
+                Train.service_date >= start,
+                Train.service_date < end,
+            )
+        )
+        return set(result.tuples().all())
@@ -0,0 +1,21 @@
+from sqlalchemy import select
+
+from app.models.stations import StationModel
+from app.repositories.base import BaseRepository
+from app.schemes.stations import SStationGet
+
+
+class StationsRepository(BaseRepository):
+    model = StationModel
+    schema = SStationGet
+    projection = True
+
+    async def get_id(self, name: str) -> int | None:
+        result = await self.session.execute(
+            select(self.model.id).where(self.model.name == name)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_name_ids(self) -> list[tuple[str, int]]:
+        result = await self.session.execute(select(self.model.name, self.model.id))
+        return result.tuples().all()
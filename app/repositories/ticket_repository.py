@@ -1,109 +1,347 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, delete
-from datetime import datetime, date
-from typing import List, Optional
-from app.models.tickets import Train, Wagon, Seat, Ticket
+from functools import cache
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, and_, or_, delete, update, exists, func, lambda_stmt, literal, union_all
+from sqlalchemy.orm import aliased
+from typing import Dict, List, Optional, Tuple
+from app.models.stations import StationModel
+from app.models.tickets import Train, TrainStop, Wagon, Seat, Ticket
+from app.repositories.base import BaseRepository
+from app.schemes.pagination import Page
+from app.schemes.ticket_schemes import (
+    TrainResponse, WagonResponse, SeatResponse, TicketResponse, TicketDetailResponse
+)
+from app.utils.segments import FULL_ROUTE
 
-class TrainRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+# Репозитории не фиксируют транзакцию: commit делает сервис один раз на запрос
+# через DBManager. flush используется только там, где нужен сгенерированный id.
+#
+# Горячие запросы оформлены через lambda_stmt: конструкция select() строится
+# один раз, ключ кэша берется из кода лямбды, а значения из замыкания уходят
+# в связанные параметры. Повторные вызовы не пересобирают запрос и всегда
+# попадают в кэш скомпилированного SQL (см. statement_cache_stats).
+
+class TrainRepository(BaseRepository):
+    model = Train
+    schema = TrainResponse
     
     async def create_train(self, train: Train) -> Train:
         self.session.add(train)
-        await self.session.commit()
-        await self.session.refresh(train)
+        await self.session.flush()
         return train
     
     async def get_train(self, train_id: int) -> Optional[Train]:
-        result = await self.session.execute(select(Train).where(Train.id == train_id))
+        result = await self.session.execute(lambda_stmt(lambda: select(Train).where(Train.id == train_id)))
         return result.scalar_one_or_none()
     
+    async def get_trains_by_ids(self, train_ids: List[int]) -> Dict[int, Train]:
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Train).where(Train.id.in_(train_ids)))
+        )
+        return {train.id: train for train in result.scalars().all()}
+    
+    async def add_departures(self, departures: List[dict]) -> List[int]:
+        """Вставить отправления по шаблонам рейсов; id вставленных.
+        
+        Отправление, уже созданное параллельным запросом (тот же шаблон и
+        день) или вручную (тот же номер и время), пропускается.
+        """
+        return await self.add_bulk(departures, returning=True, on_conflict="nothing")
+    
     async def get_train_by_number(self, train_number: str) -> Optional[Train]:
-        result = await self.session.execute(select(Train).where(Train.train_number == train_number))
+        """Последнее по дате отправление с этим номером"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Train).where(Train.train_number == train_number)
+                        .order_by(Train.departure_time.desc()).limit(1))
+        )
         return result.scalar_one_or_none()
     
-    async def search_trains(self, route_from: str, route_to: str) -> List[Train]:
+    async def search_trains(self, from_station_id: int, to_station_id: int) -> List[Train]:
         result = await self.session.execute(
-            select(Train).where(
+            lambda_stmt(lambda: select(Train).where(
                 and_(
-                    Train.route_from == route_from,
-                    Train.route_to == route_to
+                    Train.from_station_id == from_station_id,
+                    Train.to_station_id == to_station_id
                 )
-            )
+            ))
         )
         return result.scalars().all()
     
-    async def get_all_trains(self) -> List[Train]:
-        result = await self.session.execute(select(Train))
+    async def get_trains_departing(self, from_station_id: int, to_station_id: int, day: date) -> List[Train]:
+        """Активные поезда маршрута, отправляющиеся в указанный день"""
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Train).where(
+                and_(
+                    Train.from_station_id == from_station_id,
+                    Train.to_station_id == to_station_id,
+                    Train.is_active == True,
+                    Train.departure_time >= start,
+                    Train.departure_time < end
+                )
+            ))
+        )
         return result.scalars().all()
+    
+    async def get_route_departures(
+        self,
+        from_station_id: int,
+        to_station_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False,
+    ) -> List[Train]:
+        """Активные отправления маршрута в [start, end) по порядку даты.
 
-class WagonRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+        Keyset по (departure_time, id) вперед или назад: каждая порция -
+        отрезок индекса (from_station_id, to_station_id, departure_time) длиной limit.
+        """
+        query = lambda_stmt(lambda: select(Train).where(
+            Train.from_station_id == from_station_id,
+            Train.to_station_id == to_station_id,
+            Train.is_active == True,
+            Train.departure_time >= start,
+            Train.departure_time < end,
+        ))
+        if after is not None:
+            departure_time, train_id = after
+            if descending:
+                query += lambda q: q.where(or_(
+                    Train.departure_time < departure_time,
+                    and_(Train.departure_time == departure_time, Train.id < train_id),
+                ))
+            else:
+                query += lambda q: q.where(or_(
+                    Train.departure_time > departure_time,
+                    and_(Train.departure_time == departure_time, Train.id > train_id),
+                ))
+        if descending:
+            query += lambda q: q.order_by(Train.departure_time.desc(), Train.id.desc())
+        else:
+            query += lambda q: q.order_by(Train.departure_time, Train.id)
+        query += lambda q: q.limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_stops(self, train_id: int) -> List[TrainStop]:
+        """Остановки поезда по порядку; пусто, если поезд идет без остановок"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(TrainStop).where(TrainStop.train_id == train_id).order_by(TrainStop.stop_index))
+        )
+        return result.scalars().all()
+
+    async def get_stops_by_train_ids(self, train_ids: List[int]) -> Dict[int, List[TrainStop]]:
+        """Остановки поездов по порядку; поездов без остановок в словаре нет"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(TrainStop).where(TrainStop.train_id.in_(train_ids))
+                        .order_by(TrainStop.train_id, TrainStop.stop_index))
+        )
+        stops: Dict[int, List[TrainStop]] = {}
+        for stop in result.scalars().all():
+            stops.setdefault(stop.train_id, []).append(stop)
+        return stops
+
+    async def get_active_trains(self) -> List[Train]:
+        result = await self.session.execute(lambda_stmt(lambda: select(Train).where(Train.is_active == True)))
+        return result.scalars().all()
+    
+    async def get_city_departures(self) -> List[Tuple[str, int]]:
+        """(город, число отправлений) по активным поездам и их остановкам, включая города только прибытия"""
+        later = aliased(TrainStop)
+        routes = union_all(
+            select(Train.from_station_id.label("station_id"), literal(1).label("departures"))
+            .where(Train.is_active == True),
+            select(Train.to_station_id, literal(0)).where(Train.is_active == True),
+            # Промежуточные остановки (не первая и не последняя): с них тоже отправляются
+            select(TrainStop.station_id, literal(1))
+            .join(Train, Train.id == TrainStop.train_id)
+            .where(Train.is_active == True, TrainStop.stop_index > 0,
+                   exists().where(later.train_id == TrainStop.train_id,
+                                  later.stop_index > TrainStop.stop_index)),
+        ).subquery()
+        result = await self.session.execute(
+            select(StationModel.name, func.sum(routes.c.departures))
+            .join(routes, routes.c.station_id == StationModel.id)
+            .group_by(StationModel.id)
+        )
+        return result.tuples().all()
+    
+    async def get_all_trains(self, limit: int, cursor: Optional[str] = None,
+                             fields: Optional[Tuple[str, ...]] = None) -> Page[TrainResponse]:
+        return await self.get_page(limit, cursor, fields)
+
+class WagonRepository(BaseRepository):
+    model = Wagon
+    schema = WagonResponse
     
     async def create_wagon(self, wagon: Wagon) -> Wagon:
         self.session.add(wagon)
-        await self.session.commit()
-        await self.session.refresh(wagon)
+        await self.session.flush()
         return wagon
     
     async def get_wagon(self, wagon_id: int) -> Optional[Wagon]:
-        result = await self.session.execute(select(Wagon).where(Wagon.id == wagon_id))
+        result = await self.session.execute(lambda_stmt(lambda: select(Wagon).where(Wagon.id == wagon_id)))
+        return result.scalar_one_or_none()
+    
+    async def get_seat_version(self, wagon_id: int) -> Optional[int]:
+        """Версия мест вагона (wagons.seat_version); None - нет вагона"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Wagon.seat_version).where(Wagon.id == wagon_id))
+        )
         return result.scalar_one_or_none()
     
+    async def get_wagons_by_ids(self, wagon_ids: List[int]) -> Dict[int, Wagon]:
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Wagon).where(Wagon.id.in_(wagon_ids)))
+        )
+        return {wagon.id: wagon for wagon in result.scalars().all()}
+    
+    async def get_wagons_by_train_ids(self, train_ids: List[int]) -> Dict[int, List[Wagon]]:
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Wagon).where(Wagon.train_id.in_(train_ids)).order_by(Wagon.wagon_number))
+        )
+        wagons = {train_id: [] for train_id in train_ids}
+        for wagon in result.scalars().all():
+            wagons[wagon.train_id].append(wagon)
+        return wagons
+    
+    async def get_occupancy_rows(self) -> List[Tuple[int, int, str, int, int]]:
+        """(wagon_id, train_id, wagon_type, total_seats, занято) по всем вагонам одним GROUP BY"""
+        occupied = func.count(Seat.id).filter(
+            or_(Seat.is_available == False, Seat.is_reserved == True)
+        )
+        result = await self.session.execute(
+            select(Wagon.id, Wagon.train_id, Wagon.wagon_type, Wagon.total_seats, occupied)
+            .outerjoin(Seat, Seat.wagon_id == Wagon.id)
+            .group_by(Wagon.id)
+        )
+        return result.tuples().all()
+    
     async def get_wagons_by_train(self, train_id: int) -> List[Wagon]:
-        result = await self.session.execute(select(Wagon).where(Wagon.train_id == train_id))
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Wagon).where(Wagon.train_id == train_id))
+        )
         return result.scalars().all()
     
     async def get_wagons_by_type(self, train_id: int, wagon_type: str) -> List[Wagon]:
         result = await self.session.execute(
-            select(Wagon).where(
+            lambda_stmt(lambda: select(Wagon).where(
                 and_(
                     Wagon.train_id == train_id,
                     Wagon.wagon_type == wagon_type
                 )
-            )
+            ))
         )
         return result.scalars().all()
 
-class SeatRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class SeatRepository(BaseRepository):
+    model = Seat
+    schema = SeatResponse
     
     async def create_seat(self, seat: Seat) -> Seat:
         self.session.add(seat)
-        await self.session.commit()
-        await self.session.refresh(seat)
+        await self.session.flush()
         return seat
     
+    async def create_seats(self, wagon_id: int, total_seats: int) -> List[int]:
+        """Создать все места вагона одной пачкой, вернуть их id"""
+        return await self.add_bulk(
+            ({"wagon_id": wagon_id, "seat_number": number} for number in range(1, total_seats + 1)),
+            returning=True
+        )
+    
     async def get_seat(self, seat_id: int) -> Optional[Seat]:
-        result = await self.session.execute(select(Seat).where(Seat.id == seat_id))
+        result = await self.session.execute(lambda_stmt(lambda: select(Seat).where(Seat.id == seat_id)))
         return result.scalar_one_or_none()
     
+    async def get_seats_by_ids(self, seat_ids: List[int]) -> Dict[int, Seat]:
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Seat).where(Seat.id.in_(seat_ids)))
+        )
+        return {seat.id: seat for seat in result.scalars().all()}
+    
+    async def count_available_seats_by_wagon_ids(self, wagon_ids: List[int]) -> Dict[int, int]:
+        """Свободные места вагонов: total_seats минус занятые строки (строк мест может не быть)"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(
+                Wagon.id,
+                Wagon.total_seats - func.count(Seat.id).filter(
+                    or_(Seat.is_available == False, Seat.is_reserved == True)
+                )
+            ).outerjoin(Seat, Seat.wagon_id == Wagon.id).where(Wagon.id.in_(wagon_ids)).group_by(Wagon.id))
+        )
+        counts = {wagon_id: 0 for wagon_id in wagon_ids}
+        counts.update(result.tuples().all())
+        return counts
+    
+    async def count_free_seats_by_segment(self, train_id: int, mask: int) -> List[Tuple[int, int, str, int]]:
+        """(wagon_id, wagon_number, wagon_type, свободно) вагонов поезда на участках mask одним GROUP BY"""
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(
+                Wagon.id,
+                Wagon.wagon_number,
+                Wagon.wagon_type,
+                Wagon.total_seats - func.count(Seat.id).filter(Seat.segments_mask.op("&")(mask) != 0)
+            ).outerjoin(Seat, Seat.wagon_id == Wagon.id)
+             .where(Wagon.train_id == train_id)
+             .group_by(Wagon.id)
+             .order_by(Wagon.wagon_number))
+        )
+        return result.tuples().all()
+    
     async def get_available_seats(self, wagon_id: int) -> List[Seat]:
         result = await self.session.execute(
-            select(Seat).where(
+            lambda_stmt(lambda: select(Seat).where(
                 and_(
                     Seat.wagon_id == wagon_id,
                     Seat.is_available == True,
                     Seat.is_reserved == False
                 )
-            ).order_by(Seat.seat_number)
+            ).order_by(Seat.seat_number))
         )
         return result.scalars().all()
     
     async def get_all_seats(self, wagon_id: int) -> List[Seat]:
         result = await self.session.execute(
-            select(Seat).where(Seat.wagon_id == wagon_id).order_by(Seat.seat_number)
+            lambda_stmt(lambda: select(Seat).where(Seat.wagon_id == wagon_id).order_by(Seat.seat_number))
         )
         return result.scalars().all()
-    
+
+    async def get_seat_map_rows(self, wagon_id: Optional[int] = None) -> List[Tuple[int, int, int, Optional[int], Optional[int], Optional[bool]]]:
+        """(wagon_id, total_seats, seat_version, seat_id, seat_number, свободно) по вагону и номеру места.
+        
+        Вагон без строк мест дает одну строку с None вместо данных места.
+        Версия читается тем же запросом, поэтому соответствует строкам мест.
+        """
+        query = lambda_stmt(lambda: (
+            select(Wagon.id, Wagon.total_seats, Wagon.seat_version, Seat.id, Seat.seat_number,
+                   and_(Seat.is_available == True, Seat.is_reserved == False))
+            .outerjoin(Seat, Seat.wagon_id == Wagon.id)
+            .order_by(Wagon.id, Seat.seat_number)
+        ))
+        if wagon_id is not None:
+            query += lambda q: q.where(Wagon.id == wagon_id)
+        result = await self.session.execute(query)
+        return result.tuples().all()
+
+    async def materialize_seat(self, wagon_id: int, seat_number: int) -> Seat:
+        """Строка места по номеру; создается, если место еще не продавалось"""
+        await self.add_bulk(
+            [{"wagon_id": wagon_id, "seat_number": seat_number}],
+            on_conflict="nothing",
+            conflict_columns=["wagon_id", "seat_number"]
+        )
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Seat).where(Seat.wagon_id == wagon_id, Seat.seat_number == seat_number))
+        )
+        return result.scalar_one()
+
     async def update_seat_availability(self, seat_id: int, is_available: bool) -> Seat:
         seat = await self.get_seat(seat_id)
         if seat:
             seat.is_available = is_available
-            await self.session.commit()
-            await self.session.refresh(seat)
         return seat
     
     async def reserve_seat(self, seat_id: int) -> Seat:
@@ -111,71 +349,205 @@ class SeatRepository:
         if seat:
             seat.is_reserved = True
             seat.is_available = False
-            await self.session.commit()
-            await self.session.refresh(seat)
+            seat.segments_mask = FULL_ROUTE
         return seat
     
+    async def claim_seats(self, claims: Dict[int, int]) -> Optional[Dict[int, int]]:
+        """Занять участки мест {seat_id: маска}; None, если хоть один уже продан.
+        
+        Каждое место занимается одним условным UPDATE: участки свободны
+        (маска места & маска брони = 0) -> биты брони выставлены, поэтому две
+        параллельные брони не получат один участок. Места берутся по
+        возрастанию id: брони с пересекающимися местами блокируют строки
+        в одном порядке и не ждут друг друга по кругу. Возвращает новые
+        маски мест.
+        """
+        masks = {}
+        for seat_id in sorted(claims):
+            mask = claims[seat_id]
+            result = await self.session.execute(lambda_stmt(lambda: (
+                update(Seat)
+                .where(Seat.id == seat_id, Seat.segments_mask.op("&")(mask) == 0)
+                .values(
+                    segments_mask=Seat.segments_mask.op("|")(mask),
+                    is_available=False,
+                    is_reserved=True
+                )
+                .returning(Seat.segments_mask)
+            )))
+            masks[seat_id] = result.scalar_one_or_none()
+            if masks[seat_id] is None:
+                return None
+        return masks
+    
+    async def release_segments(self, seat_id: int, mask: int) -> Optional[int]:
+        """Вернуть в продажу участки места; маска оставшихся проданных участков"""
+        keep = ~mask
+        result = await self.session.execute(lambda_stmt(lambda: (
+            update(Seat)
+            .where(Seat.id == seat_id)
+            .values(
+                segments_mask=Seat.segments_mask.op("&")(keep),
+                is_available=Seat.segments_mask.op("&")(keep) == 0,
+                is_reserved=Seat.segments_mask.op("&")(keep) != 0
+            )
+            .returning(Seat.segments_mask)
+        )))
+        return result.scalar_one_or_none()
+    
     async def release_seat(self, seat_id: int) -> Seat:
         """Освободить место (отменить резервацию)"""
         seat = await self.get_seat(seat_id)
         if seat:
             seat.is_reserved = False
             seat.is_available = True
-            await self.session.commit()
-            await self.session.refresh(seat)
+            seat.segments_mask = 0
+        return seat
+
+    async def delete_seat(self, seat_id: int) -> Optional[Seat]:
+        """Удалить строку места (LAZY_SEAT_ROWS: свободное место хранится неявно)"""
+        seat = await self.get_seat(seat_id)
+        if seat:
+            await self.session.execute(lambda_stmt(lambda: delete(Seat).where(Seat.id == seat_id)))
         return seat
 
-class TicketRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+    async def delete_unsold_seats(self) -> int:
+        """Удалить строки свободных мест без билетов (переход на LAZY_SEAT_ROWS)"""
+        result = await self.session.execute(
+            delete(Seat).where(
+                Seat.is_available == True,
+                Seat.is_reserved == False,
+                Seat.segments_mask == 0,
+                ~exists().where(Ticket.seat_id == Seat.id)
+            )
+        )
+        return result.rowcount
+
+class TicketRepository(BaseRepository):
+    model = Ticket
+    schema = TicketResponse
+    
+    async def create_tickets(self, tickets: List[Ticket]) -> List[Ticket]:
+        self.session.add_all(tickets)
+        await self.session.flush()
+        return tickets
     
     async def create_ticket(self, ticket: Ticket) -> Ticket:
         self.session.add(ticket)
-        await self.session.commit()
-        await self.session.refresh(ticket)
+        await self.session.flush()
         return ticket
     
     async def get_ticket(self, ticket_id: int) -> Optional[Ticket]:
-        result = await self.session.execute(select(Ticket).where(Ticket.id == ticket_id))
+        result = await self.session.execute(lambda_stmt(lambda: select(Ticket).where(Ticket.id == ticket_id)))
         return result.scalar_one_or_none()
     
     async def get_ticket_by_number(self, ticket_number: str) -> Optional[Ticket]:
-        result = await self.session.execute(select(Ticket).where(Ticket.ticket_number == ticket_number))
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(Ticket).where(Ticket.ticket_number == ticket_number))
+        )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    def _details_select():
+        return (
+            select(*ticket_detail_columns())
+            .join(Train, Train.id == Ticket.train_id)
+            .join(Wagon, Wagon.id == Ticket.wagon_id)
+            .join(Seat, Seat.id == Ticket.seat_id)
+        )
+    
+    async def _fetch_details(self, query) -> List[TicketDetailResponse]:
+        result = await self.session.execute(query)
+        keys = list(TicketDetailResponse.model_fields)
+        return [
+            TicketDetailResponse.model_construct(**dict(zip(keys, row)))
+            for row in result.all()
+        ]
+    
+    async def get_ticket_details(self, ticket_ids: List[int], user_id: int) -> List[TicketDetailResponse]:
+        """Билеты пользователя вместе с поездом, вагоном и местом одним запросом с JOIN"""
+        return await self._fetch_details(
+            self._details_select()
+            .where(Ticket.id.in_(ticket_ids), Ticket.user_id == user_id)
+            .order_by(Ticket.id)
+        )
+    
+    async def get_user_ticket_details_page(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TicketDetailResponse]:
+        """Страница истории билетов пользователя, новые первыми.
+
+        Keyset-пагинация по (created_at, id): курсор - ключ последней записи
+        предыдущей страницы, поэтому запрос идет по индексу
+        (user_id, created_at) и не зависит от длины истории, в отличие от OFFSET.
+        """
+        query = self._details_select().where(Ticket.user_id == user_id)
+        if after is not None:
+            created_at, ticket_id = after
+            query = query.where(
+                or_(
+                    Ticket.created_at < created_at,
+                    and_(Ticket.created_at == created_at, Ticket.id < ticket_id),
+                )
+            )
+        return await self._fetch_details(
+            query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit)
+        )
+    
     async def get_user_tickets(self, passenger_email: str) -> List[Ticket]:
         result = await self.session.execute(
-            select(Ticket).where(Ticket.passenger_email == passenger_email).order_by(Ticket.created_at.desc())
+            lambda_stmt(lambda: select(Ticket).where(Ticket.passenger_email == passenger_email)
+                        .order_by(Ticket.created_at.desc()))
         )
         return result.scalars().all()
     
-    async def get_all_tickets(self) -> List[Ticket]:
-        result = await self.session.execute(select(Ticket))
-        return result.scalars().all()
+    async def get_all_tickets(self, limit: int, cursor: Optional[str] = None,
+                              fields: Optional[Tuple[str, ...]] = None) -> Page[TicketResponse]:
+        return await self.get_page(limit, cursor, fields)
     
     async def update_ticket_payment(self, ticket_id: int, is_paid: bool) -> Ticket:
         ticket = await self.get_ticket(ticket_id)
         if ticket:
             ticket.is_paid = is_paid
-            await self.session.commit()
-            await self.session.refresh(ticket)
         return ticket
     
-    async def delete_ticket(self, ticket_id: int) -> bool:
+    async def delete_ticket(self, ticket_id: int) -> None:
         """Удалить билет"""
-        try:
-            await self.session.execute(
-                delete(Ticket).where(Ticket.id == ticket_id)
-            )
-            await self.session.commit()
-            return True
-        except Exception as e:
-            print(f"Error deleting ticket: {e}")
-            await self.session.rollback()
-            return False
+        await self.session.execute(
+            lambda_stmt(lambda: delete(Ticket).where(Ticket.id == ticket_id))
+        )
     
     async def get_tickets_by_train(self, train_id: int) -> List[Ticket]:
         result = await self.session.execute(
             select(Ticket).where(Ticket.train_id == train_id)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+@cache
+def ticket_detail_columns() -> tuple:
+    """Колонки для TicketDetailResponse в порядке полей схемы"""
+    def stop_station(stop_index, default):
+        # Билет на участок: станция остановки, на весь маршрут - конечная поезда
+        station = (
+            select(StationModel.name)
+            .join(TrainStop, TrainStop.station_id == StationModel.id)
+            .where(TrainStop.train_id == Ticket.train_id, TrainStop.stop_index == stop_index)
+            .scalar_subquery()
+        )
+        return func.coalesce(station, default)
+
+    joined = {
+        "train_number": Train.train_number,
+        "route_from": stop_station(Ticket.from_stop, Train.route_from),
+        "route_to": stop_station(Ticket.to_stop, Train.route_to),
+        "wagon_number": Wagon.wagon_number,
+        "wagon_type": Wagon.wagon_type,
+        "seat_number": Seat.seat_number,
+    }
+    return tuple(
+        joined.get(field, getattr(Ticket, field, None))
+        for field in TicketDetailResponse.model_fields
+    )
@@ -10,6 +10,7 @@ from app.schemes.relations_users_roles import SUserGetWithRels
 class UsersRepository(BaseRepository):
     model = UserModel
     schema = SUserGet
+    projection = True
 
     async def get_one_or_none_with_role(self, **filter_by):
         query = (
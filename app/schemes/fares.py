@@ -0,0 +1,64 @@
+from pydantic import BaseModel, Field, model_validator
+
+from app.utils.fare_rules import parse_month_day
+
+
+class SDiscountCategoryAdd(BaseModel):
+    code: str = Field(max_length=20)
+    description: str = ""
+    percent: float = Field(ge=0, le=100)
+    is_active: bool = True
+
+
+class SDiscountCategoryGet(SDiscountCategoryAdd):
+    id: int
+
+
+class SWagonClassAdd(BaseModel):
+    wagon_type: str = Field(max_length=20)
+    description: str = ""
+    multiplier: float = Field(gt=0)
+
+
+class SWagonClassGet(SWagonClassAdd):
+    id: int
+
+
+class SFareRuleAdd(BaseModel):
+    name: str = Field(max_length=100)
+    route_from: str | None = None
+    route_to: str | None = None
+    wagon_type: str | None = None
+    season_start: str | None = Field(default=None, pattern=r"^\d{2}-\d{2}$")
+    season_end: str | None = Field(default=None, pattern=r"^\d{2}-\d{2}$")
+    advance_min_days: int | None = Field(default=None, ge=0)
+    advance_max_days: int | None = Field(default=None, ge=0)
+    multiplier: float = Field(gt=0)
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def check_period(self):
+        if (self.season_start is None) != (self.season_end is None):
+            raise ValueError("Сезон задается двумя датами MM-DD")
+        if self.season_start is not None:
+            parse_month_day(self.season_start)
+            parse_month_day(self.season_end)
+            if self.advance_min_days is not None or self.advance_max_days is not None:
+                raise ValueError("Сезон и срок покупки задаются разными правилами")
+        return self
+
+
+class SFareRuleGet(SFareRuleAdd):
+    id: int
+
+
+class SOccupancyTierAdd(BaseModel):
+    train_id: int | None = None
+    wagon_type: str | None = None
+    min_load_percent: int = Field(ge=0, le=100)
+    multiplier: float = Field(gt=0)
+    is_active: bool = True
+
+
+class SOccupancyTierGet(SOccupancyTierAdd):
+    id: int
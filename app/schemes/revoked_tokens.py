@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SRevokedTokenAdd(BaseModel):
+    jti: str
+    expires_at: datetime
+
+
+class SRevokedTokenGet(SRevokedTokenAdd):
+    id: int
@@ -0,0 +1,23 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class SRouteDayFareAdd(BaseModel):
+    from_station_id: int
+    to_station_id: int
+    day: date
+    min_fare: float | None = None
+    available_seats: int = 0
+    trains_count: int = 0
+
+
+class SRouteDayFareGet(SRouteDayFareAdd):
+    id: int
+
+
+class SRouteCalendarDay(BaseModel):
+    day: date
+    min_fare: float | None = None
+    available_seats: int = 0
+    trains_count: int = 0
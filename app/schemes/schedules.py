@@ -0,0 +1,45 @@
+from datetime import date, time
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.models.schedules import EVERY_DAY
+
+
+class SScheduleWagon(BaseModel):
+    wagon_number: int = Field(ge=1)
+    wagon_type: str = Field(max_length=20)  # platzkart, coupe, suite
+    total_seats: int = Field(ge=1)
+    # Не задан - множитель класса вагона из тарифных правил
+    price_multiplier: float | None = Field(default=None, gt=0)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SScheduleAdd(BaseModel):
+    train_number: str = Field(min_length=1, max_length=50)
+    route_from: str = Field(min_length=1, max_length=100)
+    route_to: str = Field(min_length=1, max_length=100)
+    departure_time: time
+    duration_minutes: int = Field(gt=0)
+    base_price: float = Field(gt=0)
+    # Биты дней недели: 1 - понедельник, 2 - вторник, ... 64 - воскресенье
+    days_of_week: int = Field(default=EVERY_DAY, ge=1, le=EVERY_DAY)
+    valid_from: date
+    valid_to: date | None = None
+    is_active: bool = True
+    wagons: list[SScheduleWagon] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def check_schedule(self):
+        if self.valid_to is not None and self.valid_to < self.valid_from:
+            raise ValueError("valid_to не может быть раньше valid_from")
+        numbers = [wagon.wagon_number for wagon in self.wagons]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("Номера вагонов в составе повторяются")
+        return self
+
+
+class SScheduleGet(SScheduleAdd):
+    id: int
+
+    model_config = ConfigDict(from_attributes=True)
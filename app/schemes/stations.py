@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class SStationAdd(BaseModel):
+    name: str
+
+
+class SStationGet(SStationAdd):
+    id: int
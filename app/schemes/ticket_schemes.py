@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import datetime
 from typing import Optional, List
+from app.utils.segments import MAX_STOPS
 
 class TrainBase(BaseModel):
     train_number: str
@@ -11,8 +12,27 @@ class TrainBase(BaseModel):
     duration_hours: int
     base_price: float = Field(gt=0)
 
+class TrainStopCreate(BaseModel):
+    station: str = Field(min_length=1, max_length=100)
+    arrival_time: Optional[datetime] = None
+    departure_time: Optional[datetime] = None
+
+class TrainStopResponse(TrainStopCreate):
+    stop_index: int
+    
+    class Config:
+        from_attributes = True
+
 class TrainCreate(TrainBase):
     is_active: bool = True
+    # Все остановки по порядку, от route_from до route_to; не заданы - поезд без остановок
+    stops: Optional[List[TrainStopCreate]] = Field(default=None, min_length=2, max_length=MAX_STOPS)
+
+    @model_validator(mode="after")
+    def check_stops(self):
+        if self.stops and (self.stops[0].station != self.route_from or self.stops[-1].station != self.route_to):
+            raise ValueError("Первая и последняя остановки должны совпадать с route_from и route_to")
+        return self
 
 class TrainResponse(TrainBase):
     id: int
@@ -45,13 +65,42 @@ class SeatBase(BaseModel):
     is_reserved: bool = False
 
 class SeatResponse(SeatBase):
-    id: int
+    id: Optional[int] = None  # None - место еще не продавалось (LAZY_SEAT_ROWS)
     wagon_id: int
-    created_at: datetime
+    created_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
+class SeatMapResponse(BaseModel):
+    """Компактная схема мест: бит i маски (старший бит байта первым) - место
+    seat_offset + i, 1 - свободно. id места = first_seat_id + i, если задан,
+    иначе бронировать по seat_number. version - версия мест вагона в БД (ETag)"""
+    wagon_id: int
+    seat_offset: int
+    seat_count: int
+    free_seats: int
+    first_seat_id: Optional[int] = None
+    bitmap: str  # base64
+    version: int
+
+class SeatChange(BaseModel):
+    seat_number: int
+    free: bool
+
+class SeatMapChanges(BaseModel):
+    """Места, изменившиеся после версии since запроса, - последнее состояние каждого"""
+    wagon_id: int
+    version: int
+    free_seats: int
+    changes: List[SeatChange]
+
+class SegmentAvailability(BaseModel):
+    wagon_id: int
+    wagon_number: int
+    wagon_type: str
+    free_seats: int
+
 class WagonWithSeatsResponse(WagonResponse):
     seats: List[SeatResponse] = []
 
@@ -70,6 +119,42 @@ class PriceCalculationResponse(BaseModel):
     final_price: float
     discount_type: str
 
+class FareMatrixWagon(BaseModel):
+    wagon_id: int
+    wagon_number: int
+    wagon_type: str
+    base_price: float
+    final_prices: List[float]  # в порядке FareMatrixResponse.discount_types
+
+class FareMatrixTrain(BaseModel):
+    train_id: int
+    train_number: str
+    wagons: List[FareMatrixWagon]
+
+class FareMatrixResponse(BaseModel):
+    discount_types: List[str]
+    discount_percents: List[float]
+    trains: List[FareMatrixTrain]
+
+class JourneyLeg(BaseModel):
+    train_id: int
+    train_number: str
+    route_from: str
+    route_to: str
+    departure_time: datetime
+    arrival_time: datetime
+    # Участок поезда для брони (from_stop/to_stop ноги маршрута)
+    from_stop: int
+    to_stop: int
+    price: float  # самый дешевый тариф поезда до скидки
+
+class JourneyOption(BaseModel):
+    departure_time: datetime
+    arrival_time: datetime
+    transfers: int
+    price: float
+    legs: List[JourneyLeg]
+
 class TicketBase(BaseModel):
     train_id: int
     wagon_id: int
@@ -79,7 +164,31 @@ class TicketBase(BaseModel):
     passenger_phone: str = Field(min_length=10, max_length=20)
     discount_type: str = "none"
 
-class TicketCreate(TicketBase):
+class SeatChoice(BaseModel):
+    """Место по id или по номеру в вагоне (у непроданного места может не быть id)"""
+    seat_id: Optional[int] = None
+    seat_number: Optional[int] = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_seat(self):
+        if self.seat_id is None and self.seat_number is None:
+            raise ValueError("Укажите seat_id или seat_number")
+        return self
+
+class SegmentChoice(BaseModel):
+    """Участок маршрута по номерам остановок поезда; не задан - весь маршрут"""
+    from_stop: Optional[int] = Field(default=None, ge=0)
+    to_stop: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def check_segment(self):
+        if (self.from_stop is None) != (self.to_stop is None):
+            raise ValueError("Укажите обе остановки участка: from_stop и to_stop")
+        if self.from_stop is not None and self.from_stop >= self.to_stop:
+            raise ValueError("from_stop должна быть раньше to_stop")
+        return self
+
+class TicketCreate(SeatChoice, SegmentChoice, TicketBase):
     pass
 
 class TicketResponse(TicketBase):
@@ -92,10 +201,28 @@ class TicketResponse(TicketBase):
     created_at: datetime
     departure_time: datetime
     arrival_time: datetime
+    from_stop: Optional[int] = None
+    to_stop: Optional[int] = None
     
     class Config:
         from_attributes = True
 
+class ItineraryLeg(SeatChoice, SegmentChoice):
+    train_id: int
+    wagon_id: int
+    discount_type: str = "none"
+
+class ItineraryCreate(BaseModel):
+    """Поездка из нескольких поездов (туда-обратно, с пересадками) для одного пассажира"""
+    passenger_name: str = Field(min_length=1, max_length=200)
+    passenger_email: EmailStr
+    passenger_phone: str = Field(min_length=10, max_length=20)
+    legs: List[ItineraryLeg] = Field(min_length=1, max_length=6)
+
+class ItineraryResponse(BaseModel):
+    tickets: List[TicketResponse]
+    total_price: float
+
 class TicketDetailResponse(TicketResponse):
     train_number: str
     wagon_number: int
@@ -120,6 +247,11 @@ class TrainScheduleResponse(BaseModel):
     base_price: float
     available_seats_count: int = 0
     wagons: List[WagonResponse] = []
+    is_alternative: bool = False  # Другая дата: на запрошенную мест нет
+
+class CitySuggestion(BaseModel):
+    name: str
+    departures: int
 
 class PaymentRequest(BaseModel):
     ticket_id: int
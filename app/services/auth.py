@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timezone, timedelta
 
 from app.config import settings
@@ -29,7 +30,7 @@ class AuthService(BaseService):
         expire: datetime = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        to_encode |= {"exp": expire}
+        to_encode |= {"exp": expire, "jti": uuid.uuid4().hex}
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
@@ -0,0 +1,46 @@
+import logging
+from typing import Sequence
+
+from app.database.db_manager import DBManager
+from app.models.tickets import Train, TrainStop
+from app.services.base import BaseService
+from app.utils.cities import CityIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CityIndexService(BaseService):
+    """Автодополнение городов по индексу в памяти процесса.
+
+    Индекс собирается из маршрутов и остановок активных поездов при старте и после
+    правок расписания в админке; поезда, созданные через API, добавляются
+    после фиксации.
+    """
+
+    _index: CityIndex = CityIndex()
+
+    @classmethod
+    def index(cls) -> CityIndex:
+        return cls._index
+
+    @classmethod
+    def add_train(cls, train: Train, stops: Sequence[TrainStop] = ()) -> None:
+        cls._index.add(train.route_from, 1)
+        cls._index.add(train.route_to)
+        for stop in stops[1:-1]:
+            cls._index.add(stop.station, 1)
+
+    @classmethod
+    def resolve(cls, name: str) -> str:
+        """Название города в расписании; неизвестный ввод возвращается как есть"""
+        return cls._index.resolve(name) or name
+
+    async def rebuild(self) -> int:
+        type(self)._index = CityIndex(await self.db.trains.get_city_departures())
+        return len(type(self)._index)
+
+
+async def rebuild_city_index(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await CityIndexService(db).rebuild()
+    logger.info("Индекс городов собран: %s городов", count)
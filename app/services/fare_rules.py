@@ -0,0 +1,123 @@
+import asyncio
+import logging
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.models.tickets import Train, Wagon
+from app.services.base import BaseService
+from app.services.occupancy import OccupancyService
+from app.utils.fare_rules import CompiledFareRules
+
+logger = logging.getLogger(__name__)
+
+# Значения, действовавшие до переноса тарифов в БД; ими заполняются
+# пустые таблицы при первом запуске
+DEFAULT_DISCOUNT_CATEGORIES = [
+    {"code": "child", "description": "Детская скидка (0-12 лет)", "percent": 50},
+    {"code": "student", "description": "Студенческая скидка", "percent": 25},
+    {"code": "pensioner", "description": "Пенсионная скидка", "percent": 40},
+    {"code": "none", "description": "Без скидки", "percent": 0},
+]
+DEFAULT_WAGON_CLASSES = [
+    {"wagon_type": "platzkart", "description": "Плацкарт", "multiplier": 1.0},
+    {"wagon_type": "coupe", "description": "Купе", "multiplier": 1.5},
+    {"wagon_type": "suite", "description": "Люкс", "multiplier": 2.0},
+]
+
+
+class FareRulesService(BaseService):
+    """Тарифы из таблиц discount_categories, wagon_classes, fare_rules и occupancy_tiers.
+
+    Таблицы читаются целиком и компилируются в CompiledFareRules, который
+    держится в памяти процесса; расчет цены обращается только к нему.
+    Новая версия подменяет старую одним присваиванием, так что запросы,
+    уже считающие цену, дорабатывают на прежней.
+    """
+
+    _rules: CompiledFareRules = CompiledFareRules(
+        {row["code"]: row["percent"] / 100 for row in DEFAULT_DISCOUNT_CATEGORIES},
+        {row["wagon_type"]: row["multiplier"] for row in DEFAULT_WAGON_CLASSES},
+    )
+    _discount_list: list[dict] = [
+        {
+            "type": row["code"],
+            "description": row["description"],
+            "percent": row["percent"],
+        }
+        for row in DEFAULT_DISCOUNT_CATEGORIES
+    ]
+
+    @classmethod
+    def rules(cls) -> CompiledFareRules:
+        return cls._rules
+
+    @classmethod
+    def discounts(cls) -> list[dict]:
+        return cls._discount_list
+
+    @classmethod
+    def base_price(
+        cls, train: Train, wagon: Wagon, rules: CompiledFareRules | None = None
+    ) -> float:
+        """Цена места до скидки с надбавками по маршруту, сезону, сроку покупки и загрузке"""
+        rules = rules or cls._rules
+        price = (
+            train.base_price
+            * wagon.price_multiplier
+            * rules.adjustment(
+                train.route_from,
+                train.route_to,
+                wagon.wagon_type,
+                train.departure_time,
+            )
+        )
+        if rules.has_occupancy_tiers:
+            load = OccupancyService.tracker().load_percent(train.id, wagon.wagon_type)
+            price *= rules.occupancy_multiplier(train.id, wagon.wagon_type, load)
+        return price
+
+    async def seed_defaults(self) -> None:
+        if not await self.db.discount_categories.get_all():
+            await self.db.discount_categories.add_bulk(DEFAULT_DISCOUNT_CATEGORIES)
+        if not await self.db.wagon_classes.get_all():
+            await self.db.wagon_classes.add_bulk(DEFAULT_WAGON_CLASSES)
+        await self.db.commit()
+
+    async def reload(self) -> int:
+        """Перечитывает таблицы и подменяет скомпилированные правила"""
+        categories = await self.db.discount_categories.get_filtered(is_active=True)
+        wagon_classes = await self.db.wagon_classes.get_all()
+        rules = await self.db.fare_rules.get_filtered(is_active=True)
+        occupancy_tiers = await self.db.occupancy_tiers.get_filtered(is_active=True)
+
+        cls = type(self)
+        cls._rules = CompiledFareRules(
+            {category.code: category.percent / 100 for category in categories},
+            {row.wagon_type: row.multiplier for row in wagon_classes},
+            rules,
+            occupancy_tiers,
+        )
+        cls._discount_list = [
+            {
+                "type": category.code,
+                "description": category.description,
+                "percent": category.percent,
+            }
+            for category in categories
+        ]
+        return len(rules)
+
+
+async def reload_fare_rules(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await FareRulesService(db).reload()
+    logger.info("Тарифные правила перезагружены: %s правил", count)
+
+
+async def reload_fare_rules_periodically(session_factory) -> None:
+    while True:
+        await asyncio.sleep(settings.FARE_RULES_RELOAD_SECONDS)
+        try:
+            await reload_fare_rules(session_factory)
+        except Exception:
+            logger.exception("Не удалось перезагрузить тарифные правила")
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Sequence
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.models.tickets import Train, TrainStop
+from app.schemes.ticket_schemes import JourneyLeg, JourneyOption
+from app.services.base import BaseService
+from app.services.fare_rules import FareRulesService
+from app.services.occupancy import OccupancyService
+from app.utils.journeys import Connection, Timetable
+from app.utils.segments import train_segment
+
+logger = logging.getLogger(__name__)
+
+
+class JourneyPlannerService(BaseService):
+    """Поиск маршрутов с пересадками по расписанию в памяти процесса.
+
+    Расписание собирается из активных поездов и их остановок одним
+    проходом, так что пересаживаться можно и на промежуточных станциях;
+    рейс до них продается как участок (from_stop/to_stop). Новые поезда
+    и вагоны добавляются после фиксации, правки в обход API догоняются
+    периодической пересборкой. Цена рейса - самый дешевый тариф поезда,
+    наличие мест проверяется по счетчикам OccupancyTracker.
+    """
+
+    _timetable: Timetable = Timetable()
+
+    @classmethod
+    def timetable(cls) -> Timetable:
+        return cls._timetable
+
+    @staticmethod
+    def connections(train: Train, stops: Sequence[TrainStop] = ()) -> list[Connection]:
+        """Рейсы поезда: весь маршрут и каждая пара остановок из train_stops"""
+        if not stops:
+            return [
+                Connection(
+                    train.departure_time,
+                    train.id,
+                    train.train_number,
+                    train.route_from,
+                    train.route_to,
+                    train.arrival_time,
+                    0,
+                    1,
+                )
+            ]
+        connections = []
+        for from_stop, to_stop in combinations(range(len(stops)), 2):
+            segment = train_segment(train, stops, from_stop, to_stop)
+            connections.append(
+                Connection(
+                    segment.departure_time,
+                    train.id,
+                    train.train_number,
+                    stops[from_stop].station,
+                    stops[to_stop].station,
+                    segment.arrival_time,
+                    from_stop,
+                    to_stop,
+                )
+            )
+        return connections
+
+    @classmethod
+    def add_train(cls, train: Train, stops: Sequence[TrainStop] = ()) -> None:
+        cls._timetable.add_train(train.id, cls.connections(train, stops))
+
+    async def rebuild(self) -> int:
+        trains = await self.db.trains.get_active_trains()
+        train_ids = [train.id for train in trains]
+        wagons_by_train = await self.db.wagons.get_wagons_by_train_ids(train_ids)
+        stops_by_train = await self.db.trains.get_stops_by_train_ids(train_ids)
+        rules = FareRulesService.rules()
+        prices = {
+            train.id: min(
+                FareRulesService.base_price(train, wagon, rules)
+                for wagon in wagons_by_train[train.id]
+            )
+            for train in trains
+            if wagons_by_train[train.id]
+        }
+        type(self)._timetable = Timetable(
+            (
+                connection
+                for train in trains
+                for connection in self.connections(
+                    train, stops_by_train.get(train.id, ())
+                )
+            ),
+            prices,
+        )
+        return len(trains)
+
+    @classmethod
+    def plan(
+        cls,
+        route_from: str,
+        route_to: str,
+        departure_after: datetime,
+        max_transfers: int,
+        min_connection_minutes: int,
+        max_hours: int,
+    ) -> list[JourneyOption]:
+        timetable = cls._timetable
+        tracker = OccupancyService.tracker()
+        journeys = timetable.plan(
+            route_from,
+            route_to,
+            departure_after,
+            max_transfers,
+            timedelta(minutes=min_connection_minutes),
+            timedelta(hours=max_hours),
+            bookable=lambda train_id: tracker.free_seats(train_id) > 0,
+        )
+        return [
+            JourneyOption.model_construct(
+                departure_time=journey.departure_time,
+                arrival_time=journey.arrival_time,
+                transfers=journey.transfers,
+                price=journey.price,
+                legs=[
+                    JourneyLeg.model_construct(
+                        **leg._asdict(), price=timetable.price(leg.train_id)
+                    )
+                    for leg in journey.legs
+                ],
+            )
+            for journey in journeys
+        ]
+
+
+async def rebuild_timetable(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await JourneyPlannerService(db).rebuild()
+    logger.info("Расписание для поиска с пересадками собрано: %s поездов", count)
+
+
+async def rebuild_timetable_periodically(session_factory) -> None:
+    while True:
+        await asyncio.sleep(settings.TIMETABLE_REBUILD_SECONDS)
+        try:
+            await rebuild_timetable(session_factory)
+        except Exception:
+            logger.exception("Не удалось пересобрать расписание")
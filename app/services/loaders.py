@@ -0,0 +1,23 @@
+import asyncio
+
+from app.database.db_manager import DBManager
+from app.utils.dataloader import DataLoader
+
+
+class TicketLoaders:
+    """Загрузчики поездов, вагонов и мест, живущие один запрос.
+
+    Обращения к одному типу сущностей за одну итерацию цикла событий
+    превращаются в один запрос `WHERE id IN (...)`, повторные - берутся
+    из кэша загрузчика.
+    """
+
+    def __init__(self, db: DBManager) -> None:
+        lock = asyncio.Lock()
+        self.trains = DataLoader(db.trains.get_trains_by_ids, lock)
+        self.wagons = DataLoader(db.wagons.get_wagons_by_ids, lock)
+        self.seats = DataLoader(db.seats.get_seats_by_ids, lock)
+        self.wagons_by_train = DataLoader(db.wagons.get_wagons_by_train_ids, lock)
+        self.available_seat_counts = DataLoader(
+            db.seats.count_available_seats_by_wagon_ids, lock
+        )
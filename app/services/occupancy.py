@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.services.base import BaseService
+from app.utils.occupancy import OccupancyTracker
+from app.utils.seat_events import SeatEvents
+from app.utils.seat_maps import SeatMap, SeatMaps
+
+logger = logging.getLogger(__name__)
+
+
+class OccupancyService(BaseService):
+    """Загрузка поездов по классам вагонов и битовые маски мест вагонов.
+
+    Трекер и маски живут в памяти процесса и обновляются после фиксации
+    брони и отмены; изменения сразу рассылаются подписчикам схемы вагона.
+    Маска вагона для ответа сверяется с версией мест в БД и перечитывается,
+    если места менялись (в том числе в обход сервисов или другим процессом);
+    остальные вагоны догоняются периодической пересборкой из таблицы мест.
+    """
+
+    _tracker: OccupancyTracker = OccupancyTracker()
+    _seat_maps: SeatMaps = SeatMaps(change_log=settings.SEAT_CHANGE_LOG_SIZE)
+    _seat_events: SeatEvents = SeatEvents(settings.SEAT_EVENTS_QUEUE_SIZE)
+
+    @classmethod
+    def tracker(cls) -> OccupancyTracker:
+        return cls._tracker
+
+    @classmethod
+    def seat_maps(cls) -> SeatMaps:
+        return cls._seat_maps
+
+    @classmethod
+    def seat_events(cls) -> SeatEvents:
+        return cls._seat_events
+
+    @classmethod
+    def reserve(cls, wagon_id: int, seat_number: int) -> None:
+        cls._tracker.reserve(wagon_id)
+        cls._seat_maps.reserve(wagon_id, seat_number)
+        cls._seat_events.publish(wagon_id, seat_number, False)
+
+    @classmethod
+    def release(cls, wagon_id: int, seat_number: int) -> None:
+        cls._tracker.release(wagon_id)
+        cls._seat_maps.release(wagon_id, seat_number)
+        cls._seat_events.publish(wagon_id, seat_number, True)
+
+    async def seat_map(self, wagon_id: int) -> SeatMap | None:
+        """Маска мест вагона на текущей версии мест в БД; None - нет вагона.
+
+        Одно чтение версии по первичному ключу; строки мест вагона читаются,
+        только если версия маски в памяти отстала.
+        """
+        version = await self.db.wagons.get_seat_version(wagon_id)
+        if version is None:
+            return None
+        seat_map = self._seat_maps.get(wagon_id)
+        if seat_map is None or seat_map.version != version:
+            self._seat_maps.add_rows(await self.db.seats.get_seat_map_rows(wagon_id))
+            seat_map = self._seat_maps.get(wagon_id)
+        return seat_map
+
+    async def resync(self) -> int:
+        rows = await self.db.wagons.get_occupancy_rows()
+        seat_rows = await self.db.seats.get_seat_map_rows()
+        old_maps = self._seat_maps
+        seat_maps = SeatMaps(seat_rows, settings.SEAT_CHANGE_LOG_SIZE)
+        seat_maps.carry_over(old_maps)
+        type(self)._tracker = OccupancyTracker(rows)
+        type(self)._seat_maps = seat_maps
+        # Подписчикам вагонов, места которых менялись в обход сервисов, - полная схема
+        for wagon_id in self._seat_events.wagon_ids():
+            old, new = old_maps.get(wagon_id), seat_maps.get(wagon_id)
+            if old is None or new is None or old.encode() != new.encode():
+                self._seat_events.invalidate(wagon_id)
+        return len(rows)
+
+
+async def resync_occupancy(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await OccupancyService(db).resync()
+    logger.info("Загрузка вагонов пересчитана: %s вагонов", count)
+
+
+async def resync_occupancy_periodically(session_factory) -> None:
+    while True:
+        await asyncio.sleep(settings.OCCUPANCY_RESYNC_SECONDS)
+        try:
+            await resync_occupancy(session_factory)
+        except Exception:
+            logger.exception("Не удалось пересчитать загрузку вагонов")
@@ -38,5 +38,10 @@ class RoleService(BaseService):
         await self.db.commit()
         return
 
-    async def get_roles(self):
-        return await self.db.roles.get_all()
+    async def get_roles(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ):
+        return await self.db.roles.get_page(limit, cursor, fields)
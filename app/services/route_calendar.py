@@ -0,0 +1,125 @@
+import logging
+from datetime import date, timedelta
+
+from app.database.db_manager import DBManager
+from app.models.tickets import Train
+from app.schemes.route_calendar import SRouteCalendarDay, SRouteDayFareAdd
+from app.services.base import BaseService
+from app.services.fare_rules import FareRulesService
+from app.services.stations import StationService
+
+logger = logging.getLogger(__name__)
+
+
+class RouteCalendarService(BaseService):
+    """Календарь низких цен: сводка route_day_fares по (маршрут, день).
+
+    Сводка дня пересчитывается в той же транзакции, что и бронирование,
+    отмена или изменение расписания, поэтому календарь на любой период -
+    одно чтение диапазона по индексу без поиска поездов и подсчета мест.
+    Тариф дня - самая низкая цена до скидки среди вагонов со свободными
+    местами, по тем же правилам, что и /calculate-price.
+    """
+
+    async def _summaries(self, trains: list[Train]) -> list[SRouteDayFareAdd]:
+        wagons_by_train = await self.db.wagons.get_wagons_by_train_ids(
+            [train.id for train in trains]
+        )
+        wagon_ids = [
+            wagon.id for wagons in wagons_by_train.values() for wagon in wagons
+        ]
+        available = await self.db.seats.count_available_seats_by_wagon_ids(wagon_ids)
+
+        rules = FareRulesService.rules()
+        days: dict[tuple, dict] = {}
+        for train in trains:
+            key = (
+                train.from_station_id,
+                train.to_station_id,
+                train.departure_time.date(),
+            )
+            summary = days.setdefault(
+                key, {"min_fare": None, "available_seats": 0, "trains_count": 0}
+            )
+            summary["trains_count"] += 1
+            for wagon in wagons_by_train[train.id]:
+                free = available[wagon.id]
+                if not free:
+                    continue
+                summary["available_seats"] += free
+                fare = FareRulesService.base_price(train, wagon, rules)
+                if summary["min_fare"] is None or fare < summary["min_fare"]:
+                    summary["min_fare"] = fare
+        return [
+            SRouteDayFareAdd(
+                from_station_id=from_station_id,
+                to_station_id=to_station_id,
+                day=day,
+                **summary,
+            )
+            for (from_station_id, to_station_id, day), summary in days.items()
+        ]
+
+    async def refresh_for_train(self, train: Train) -> None:
+        """Пересчитать сводку дня поезда в текущей транзакции (без commit)"""
+        route = (train.from_station_id, train.to_station_id)
+        day = train.departure_time.date()
+        rows = await self._summaries(
+            await self.db.trains.get_trains_departing(*route, day)
+        )
+        if rows:
+            await self.db.route_day_fares.upsert(rows)
+        else:
+            await self.db.route_day_fares.delete_day(*route, day)
+
+    async def refresh_for_wagon(self, wagon_id: int) -> None:
+        wagon = await self.db.wagons.get_wagon(wagon_id)
+        if wagon is None:
+            return
+        train = await self.db.trains.get_train(wagon.train_id)
+        if train is not None:
+            await self.refresh_for_train(train)
+
+    async def rebuild(self) -> int:
+        """Пересобрать всю сводку (старт, правка расписания или тарифов в админке)"""
+        rows = await self._summaries(await self.db.trains.get_active_trains())
+        await self.db.route_day_fares.delete_all()
+        if rows:
+            await self.db.route_day_fares.upsert(rows)
+        await self.db.commit()
+        return len(rows)
+
+    async def get_calendar(
+        self, route_from: str, route_to: str, start: date, days: int
+    ) -> list[SRouteCalendarDay]:
+        stations = StationService(self.db)
+        route = (
+            await stations.resolve(route_from),
+            await stations.resolve(route_to),
+        )
+        summaries = {}
+        if None not in route:
+            end = start + timedelta(days=days)
+            summaries = {
+                row.day: row
+                for row in await self.db.route_day_fares.get_range(*route, start, end)
+            }
+        calendar = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            row = summaries.get(day)
+            calendar.append(
+                SRouteCalendarDay.model_construct(
+                    day=day,
+                    min_fare=row.min_fare if row else None,
+                    available_seats=row.available_seats if row else 0,
+                    trains_count=row.trains_count if row else 0,
+                )
+            )
+        return calendar
+
+
+async def rebuild_route_calendar(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await RouteCalendarService(db).rebuild()
+    logger.info("Календарь цен пересобран: %s дней маршрутов", count)
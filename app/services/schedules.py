@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.exceptions.schedules import ScheduleAlreadyExistsError
+from app.models.schedules import ScheduleWagonModel, TrainScheduleModel
+from app.schemes.schedules import SScheduleAdd
+from app.services.base import BaseService
+from app.services.cities import CityIndexService
+from app.services.fare_rules import FareRulesService
+from app.services.journeys import JourneyPlannerService
+from app.services.occupancy import OccupancyService
+from app.services.route_calendar import RouteCalendarService
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleService(BaseService):
+    """Шаблоны рейсов и отправления по ним.
+
+    Отправление (поезд на дату с вагонами и местами по составу шаблона)
+    создается, когда на эту дату ищут поезда маршрута, а на ближайшие
+    SCHEDULE_HORIZON_DAYS дней - периодическим заданием. В БД остаются
+    только отправления, на которые кто-то смотрел, и ближайшие дни.
+    Дальше SCHEDULE_BOOKING_DAYS дней отправления не создаются, поэтому
+    перебор дат в публичном поиске не раздувает таблицы.
+    Шаблон меняет только еще не созданные отправления.
+    """
+
+    @staticmethod
+    def booking_end() -> date:
+        """Первый день, на который продажа еще не открыта"""
+        return date.today() + timedelta(days=settings.SCHEDULE_BOOKING_DAYS + 1)
+
+    async def create_schedule(self, data: SScheduleAdd) -> TrainScheduleModel:
+        schedule = TrainScheduleModel(
+            **data.model_dump(exclude={"wagons"}),
+            wagons=[ScheduleWagonModel(**wagon.model_dump()) for wagon in data.wagons],
+        )
+        try:
+            await self.db.train_schedules.create(schedule)
+        except ObjectAlreadyExistsError:
+            raise ScheduleAlreadyExistsError
+        await self.db.commit()
+        return schedule
+
+    async def get_schedules(self) -> list[TrainScheduleModel]:
+        return await self.db.train_schedules.get_schedules()
+
+    async def materialize(
+        self, start: date, end: date, route: tuple[int, int] | None = None
+    ) -> int:
+        """Создать недостающие отправления шаблонов (маршрута) в днях [start, end).
+
+        Уже созданные отправления - одно чтение по (шаблон, день); прошедшие
+        дни и дни после окна продажи пропускаются. Возвращает число
+        созданных отправлений.
+        """
+        start = max(start, date.today())
+        end = min(end, self.booking_end())
+        if start >= end:
+            return 0
+        schedules = {
+            schedule.id: schedule
+            for schedule in await self.db.train_schedules.get_running(start, end, route)
+        }
+        if not schedules:
+            return 0
+        existing = await self.db.train_schedules.get_departure_days(
+            list(schedules), start, end
+        )
+        days = [start + timedelta(days=i) for i in range((end - start).days)]
+        departures = [
+            self._departure(schedule, day)
+            for schedule in schedules.values()
+            for day in days
+            if (schedule.id, day) not in existing and schedule.runs_on(day)
+        ]
+        if not departures:
+            return 0
+        train_ids = await self.db.trains.add_departures(departures)
+        if not train_ids:
+            return 0
+        trains = await self.db.trains.get_trains_by_ids(train_ids)
+
+        rules = FareRulesService.rules()
+        await self.db.wagons.add_bulk(
+            {
+                "train_id": train.id,
+                "wagon_number": wagon.wagon_number,
+                "wagon_type": wagon.wagon_type,
+                "total_seats": wagon.total_seats,
+                "price_multiplier": wagon.price_multiplier
+                or rules.class_multiplier(wagon.wagon_type),
+            }
+            for train in trains.values()
+            for wagon in schedules[train.schedule_id].wagons
+        )
+        wagons_by_train = await self.db.wagons.get_wagons_by_train_ids(list(trains))
+        wagons = [wagon for wagons in wagons_by_train.values() for wagon in wagons]
+        # При LAZY_SEAT_ROWS места подразумеваются по total_seats
+        seat_ids = []
+        if not settings.LAZY_SEAT_ROWS:
+            seat_ids = await self.db.seats.add_bulk(
+                (
+                    {"wagon_id": wagon.id, "seat_number": number}
+                    for wagon in wagons
+                    for number in range(1, wagon.total_seats + 1)
+                ),
+                returning=True,
+            )
+
+        calendar = RouteCalendarService(self.db)
+        refreshed = set()
+        for train in trains.values():
+            key = (train.from_station_id, train.to_station_id, train.service_date)
+            if key not in refreshed:
+                refreshed.add(key)
+                await calendar.refresh_for_train(train)
+        await self.db.commit()
+
+        timetable = JourneyPlannerService.timetable()
+        seat_ids = iter(seat_ids)
+        for train in trains.values():
+            JourneyPlannerService.add_train(train)
+            CityIndexService.add_train(train)
+            for wagon in wagons_by_train[train.id]:
+                OccupancyService.tracker().add_wagon(
+                    wagon.id, train.id, wagon.wagon_type, wagon.total_seats
+                )
+                seats = (
+                    []
+                    if settings.LAZY_SEAT_ROWS
+                    else [
+                        (next(seat_ids), number, True)
+                        for number in range(1, wagon.total_seats + 1)
+                    ]
+                )
+                OccupancyService.seat_maps().add_wagon(
+                    wagon.id, wagon.total_seats, seats
+                )
+                timetable.offer_price(
+                    train.id, FareRulesService.base_price(train, wagon)
+                )
+        return len(trains)
+
+    @staticmethod
+    def _departure(schedule: TrainScheduleModel, day: date) -> dict:
+        departure_time = datetime.combine(day, schedule.departure_time)
+        return {
+            "train_number": schedule.train_number,
+            "from_station_id": schedule.from_station_id,
+            "to_station_id": schedule.to_station_id,
+            "departure_time": departure_time,
+            "arrival_time": departure_time
+            + timedelta(minutes=schedule.duration_minutes),
+            "duration_hours": round(schedule.duration_minutes / 60),
+            "base_price": schedule.base_price,
+            "schedule_id": schedule.id,
+            "service_date": day,
+        }
+
+
+async def materialize_schedules(session_factory) -> None:
+    today = date.today()
+    async with DBManager(session_factory=session_factory) as db:
+        count = await ScheduleService(db).materialize(
+            today, today + timedelta(days=settings.SCHEDULE_HORIZON_DAYS)
+        )
+    logger.info("Отправления по расписанию созданы: %s", count)
+
+
+async def materialize_schedules_periodically(session_factory) -> None:
+    while True:
+        await asyncio.sleep(settings.SCHEDULE_MATERIALIZE_SECONDS)
+        try:
+            await materialize_schedules(session_factory)
+        except Exception:
+            logger.exception("Не удалось создать отправления по расписанию")
@@ -0,0 +1,35 @@
+import logging
+
+from app.database.db_manager import DBManager
+from app.services.base import BaseService
+
+logger = logging.getLogger(__name__)
+
+
+class StationService(BaseService):
+    """Названия станций из запросов -> id для поиска по целочисленным ключам.
+
+    Справочник загружается в память при старте; станции, появившиеся
+    позже (новый поезд, скрипт загрузки), дочитываются из БД при первом
+    обращении и кэшируются. Неизвестное название не кэшируется.
+    """
+
+    _ids: dict[str, int] = {}
+
+    async def resolve(self, name: str) -> int | None:
+        station_id = self._ids.get(name)
+        if station_id is None:
+            station_id = await self.db.stations.get_id(name)
+            if station_id is not None:
+                self._ids[name] = station_id
+        return station_id
+
+    async def load(self) -> int:
+        type(self)._ids = dict(await self.db.stations.get_name_ids())
+        return len(self._ids)
+
+
+async def load_stations(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        count = await StationService(db).load()
+    logger.info("Справочник станций загружен: %s станций", count)
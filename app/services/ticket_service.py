@@ -1,26 +1,44 @@
 import uuid
-from datetime import datetime
-from typing import List, Optional, Tuple
-from app.repositories.ticket_repository import TrainRepository, WagonRepository, SeatRepository, TicketRepository
-from app.models.tickets import Train, Wagon, Seat, Ticket, DiscountType
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+from app.config import settings
+from app.models.tickets import Train, TrainStop, Wagon, Seat, Ticket, DiscountType
 from app.schemes.ticket_schemes import (
-    TrainCreate, WagonCreate, PriceCalculationRequest, PriceCalculationResponse, TicketCreate
+    TrainCreate, WagonCreate, PriceCalculationRequest, PriceCalculationResponse, TicketCreate,
+    TicketDetailResponse, TrainResponse, FareMatrixResponse, FareMatrixTrain, FareMatrixWagon,
+    ItineraryCreate, SeatChange, SeatMapChanges, SeatMapResponse, SegmentAvailability, TrainStopResponse
 )
+from app.schemes.pagination import Page
+from app.services.base import BaseService
+from app.services.cities import CityIndexService
+from app.services.fare_rules import FareRulesService
+from app.services.journeys import JourneyPlannerService
+from app.services.occupancy import OccupancyService
+from app.services.route_calendar import RouteCalendarService
+from app.services.schedules import ScheduleService
+from app.services.stations import StationService
+from app.exceptions.booking import InvalidItineraryError, InvalidSegmentError, SeatUnavailableError
+from app.exceptions.pagination import InvalidCursorError
+from app.utils.pagination import decode_cursor, split_page
+from app.utils.seat_events import SeatSubscription
+from app.utils.seat_maps import SeatMap
+from app.utils.segments import FULL_ROUTE, Segment, segment_mask, train_segment
+
+# Порция отправлений за один запрос при поиске альтернативных дат
+DEPARTURES_BATCH = 16
 
 class DiscountService:
     """Сервис для расчета скидок"""
     
-    DISCOUNT_RATES = {
-        "child": 0.50,      # 50% скидка для детей (0-12 лет)
-        "student": 0.25,    # 25% скидка для студентов
-        "pensioner": 0.40,  # 40% скидка для пенсионеров
-        "none": 0.0         # Нет скидки
-    }
+    @staticmethod
+    def get_discounts() -> List[dict]:
+        """Действующие категории скидок"""
+        return FareRulesService.discounts()
     
     @staticmethod
     def get_discount_percent(discount_type: str) -> float:
-        """Получить процент скидки по типу"""
-        return DiscountService.DISCOUNT_RATES.get(discount_type, 0.0)
+        """Получить долю скидки по типу"""
+        return FareRulesService.rules().discount_rate(discount_type)
     
     @staticmethod
     def calculate_final_price(base_price: float, discount_type: str) -> Tuple[float, float]:
@@ -30,113 +48,325 @@ class DiscountService:
         final_price = base_price - discount_amount
         return final_price, discount_percent * 100
 
-class TrainService:
+class TrainService(BaseService):
     """Сервис для управления поездами"""
     
-    def __init__(self, train_repo: TrainRepository):
-        self.train_repo = train_repo
-    
     async def create_train(self, train_data: TrainCreate) -> Train:
-        """Создать новый поезд"""
-        train = Train(**train_data.model_dump())
-        return await self.train_repo.create_train(train)
-    
-    async def search_trains(self, route_from: str, route_to: str) -> List[Train]:
-        """Поиск поездов по маршруту"""
-        return await self.train_repo.search_trains(route_from, route_to)
+        """Создать новый поезд (с остановками, если заданы)"""
+        train = Train(**train_data.model_dump(exclude={"stops"}))
+        if train_data.stops:
+            train.stops = [
+                TrainStop(stop_index=index, **stop.model_dump()) for index, stop in enumerate(train_data.stops)
+            ]
+        await self.db.trains.create_train(train)
+        await RouteCalendarService(self.db).refresh_for_train(train)
+        await self.db.commit()
+        if train.is_active:
+            stops = train.stops if train_data.stops else ()
+            JourneyPlannerService.add_train(train, stops)
+            CityIndexService.add_train(train, stops)
+        return train
+    
+    async def search_trains(self, route_from: str, route_to: str,
+                            departure_date: Optional[date] = None) -> List[Train]:
+        """Поиск поездов по маршруту (и дню отправления, если указан)"""
+        route = await self._route(route_from, route_to)
+        if route is None:
+            return []
+        # Отправления по расписанию на искомые дни создаются при первом поиске
+        schedules = ScheduleService(self.db)
+        if departure_date is not None:
+            if departure_date >= schedules.booking_end():
+                return []
+            await schedules.materialize(departure_date, departure_date + timedelta(days=1), route)
+            return await self.db.trains.get_trains_departing(*route, departure_date)
+        today = date.today()
+        await schedules.materialize(today, today + timedelta(days=settings.SCHEDULE_HORIZON_DAYS), route)
+        return await self.db.trains.search_trains(*route)
+    
+    async def get_stops(self, train: Train) -> List[TrainStopResponse]:
+        """Остановки поезда по порядку; у поезда без остановок - начальная и конечная"""
+        stops = await self.db.trains.get_stops(train.id)
+        if not stops:
+            return [
+                TrainStopResponse(stop_index=0, station=train.route_from, departure_time=train.departure_time),
+                TrainStopResponse(stop_index=1, station=train.route_to, arrival_time=train.arrival_time),
+            ]
+        return [TrainStopResponse.model_validate(stop) for stop in stops]
+    
+    async def segment(self, train: Train, from_stop: Optional[int], to_stop: Optional[int]) -> Segment:
+        """Участок маршрута поезда между остановками (None - весь маршрут)"""
+        stops = await self.db.trains.get_stops(train.id) if from_stop is not None else ()
+        segment = train_segment(train, stops, from_stop, to_stop)
+        if segment is None:
+            raise InvalidSegmentError
+        return segment
+    
+    async def get_segment_availability(self, train: Train, from_stop: Optional[int],
+                                       to_stop: Optional[int]) -> List[SegmentAvailability]:
+        """Свободные места по вагонам на участке: одна агрегация по маскам мест"""
+        segment = await self.segment(train, from_stop, to_stop)
+        rows = await self.db.seats.count_free_seats_by_segment(train.id, segment.mask)
+        return [
+            SegmentAvailability.model_construct(
+                wagon_id=wagon_id, wagon_number=wagon_number, wagon_type=wagon_type, free_seats=free_seats
+            )
+            for wagon_id, wagon_number, wagon_type, free_seats in rows
+        ]
+    
+    async def _route(self, route_from: str, route_to: str) -> Optional[Tuple[int, int]]:
+        """id станций маршрута; None, если такой станции нет в справочнике"""
+        stations = StationService(self.db)
+        route = (await stations.resolve(route_from), await stations.resolve(route_to))
+        return None if None in route else route
+    
+    async def _departures(self, route: Tuple[int, int], start: datetime, end: datetime,
+                          descending: bool) -> AsyncIterator[Train]:
+        after = None
+        while True:
+            batch = await self.db.trains.get_route_departures(
+                *route, start, end, DEPARTURES_BATCH, after, descending
+            )
+            for train in batch:
+                yield train
+            if len(batch) < DEPARTURES_BATCH:
+                return
+            after = (batch[-1].departure_time, batch[-1].id)
+    
+    async def find_alternatives(self, route_from: str, route_to: str, departure_date: date,
+                                wagon_type: Optional[str], count: int, flex_days: int) -> List[Train]:
+        """Ближайшие к дню отправления поезда в пределах ±flex_days со свободными местами.
+        
+        Два обхода индекса маршрута по дате - вперед от конца дня и назад от
+        его начала - сливаются по удаленности от дня; свободные места берутся
+        из счетчиков OccupancyTracker, поэтому обход останавливается, как только
+        найдено count поездов, и не читает ни вагоны, ни места.
+        """
+        route = await self._route(route_from, route_to)
+        if route is None:
+            return []
+        await ScheduleService(self.db).materialize(
+            departure_date - timedelta(days=flex_days), departure_date + timedelta(days=flex_days + 1), route
+        )
+        day_start = datetime.combine(departure_date, time.min)
+        day_end = day_start + timedelta(days=1)
+        middle = day_start + timedelta(hours=12)
+        streams = [
+            self._departures(route, day_end, day_end + timedelta(days=flex_days), False),
+            self._departures(route, day_start - timedelta(days=flex_days), day_start, True),
+        ]
+        free_seats = OccupancyService.tracker().free_seats
+        found = []
+        try:
+            heads = [await anext(stream, None) for stream in streams]
+            while len(found) < count and (heads[0] or heads[1]):
+                i = min((i for i in (0, 1) if heads[i]),
+                        key=lambda i: abs(heads[i].departure_time - middle))
+                if free_seats(heads[i].id, wagon_type) > 0:
+                    found.append(heads[i])
+                heads[i] = await anext(streams[i], None)
+        finally:
+            for stream in streams:
+                await stream.aclose()
+        return sorted(found, key=lambda train: train.departure_time)
     
     async def get_train(self, train_id: int) -> Optional[Train]:
         """Получить информацию о поезде"""
-        return await self.train_repo.get_train(train_id)
-    
-    async def get_all_trains(self) -> List[Train]:
-        """Получить все активные поезда"""
-        return await self.train_repo.get_all_trains()
+        return await self.db.trains.get_train(train_id)
+    
+    async def get_all_trains(self,
+                             limit: int,
+                             cursor: Optional[str] = None,
+                             fields: Optional[Tuple[str, ...]] = None) -> Page[TrainResponse]:
+        """Получить поезда постранично"""
+        return await self.db.trains.get_all_trains(limit, cursor, fields)
 
-class WagonService:
+class WagonService(BaseService):
     """Сервис для управления вагонами"""
     
-    WAGON_TYPE_MULTIPLIERS = {
-        "platzkart": 1.0,   # Плацкарт - базовая цена
-        "coupe": 1.5,       # Купе - 1.5x цена
-        "suite": 2.0        # Люкс - 2x цена
-    }
-    
-    def __init__(self, wagon_repo: WagonRepository, seat_repo: SeatRepository):
-        self.wagon_repo = wagon_repo
-        self.seat_repo = seat_repo
-    
     async def create_wagon(self, wagon_data: WagonCreate) -> Wagon:
-        """Создать новый вагон"""
+        """Создать новый вагон вместе со всеми местами"""
         wagon = Wagon(**wagon_data.model_dump())
-        return await self.wagon_repo.create_wagon(wagon)
+        if "price_multiplier" not in wagon_data.model_fields_set:
+            wagon.price_multiplier = self.get_price_multiplier(wagon.wagon_type)
+        await self.db.wagons.create_wagon(wagon)
+        # При LAZY_SEAT_ROWS места подразумеваются по total_seats, строки появятся при продаже
+        seat_ids = [] if settings.LAZY_SEAT_ROWS else await self.db.seats.create_seats(wagon.id, wagon.total_seats)
+        train = await self.db.trains.get_train(wagon.train_id)
+        if train is not None:
+            await RouteCalendarService(self.db).refresh_for_train(train)
+        await self.db.commit()
+        OccupancyService.tracker().add_wagon(wagon.id, wagon.train_id, wagon.wagon_type, wagon.total_seats)
+        OccupancyService.seat_maps().add_wagon(
+            wagon.id, wagon.total_seats, ((seat_id, number, True) for number, seat_id in enumerate(seat_ids, 1))
+        )
+        if train is not None:
+            JourneyPlannerService.timetable().offer_price(train.id, FareRulesService.base_price(train, wagon))
+        return wagon
     
     async def get_wagon(self, wagon_id: int) -> Optional[Wagon]:
         """Получить информацию о вагоне"""
-        return await self.wagon_repo.get_wagon(wagon_id)
+        return await self.db.wagons.get_wagon(wagon_id)
     
     async def get_wagons_by_train(self, train_id: int) -> List[Wagon]:
         """Получить все вагоны поезда"""
-        return await self.wagon_repo.get_wagons_by_train(train_id)
+        return await self.db.wagons.get_wagons_by_train(train_id)
     
     async def get_wagons_by_type(self, train_id: int, wagon_type: str) -> List[Wagon]:
         """Получить вагоны определенного типа в поезде"""
-        return await self.wagon_repo.get_wagons_by_type(train_id, wagon_type)
+        return await self.db.wagons.get_wagons_by_type(train_id, wagon_type)
     
     def get_price_multiplier(self, wagon_type: str) -> float:
         """Получить множитель цены для типа вагона"""
-        return self.WAGON_TYPE_MULTIPLIERS.get(wagon_type, 1.0)
+        return FareRulesService.rules().class_multiplier(wagon_type)
 
-class SeatService:
+class SeatService(BaseService):
     """Сервис для управления местами"""
     
-    def __init__(self, seat_repo: SeatRepository):
-        self.seat_repo = seat_repo
-    
-    async def create_seats(self, wagon_id: int, total_seats: int) -> List[Seat]:
+    async def create_seats(self, wagon_id: int, total_seats: int) -> List[int]:
         """Создать места для вагона"""
-        seats = []
-        for seat_number in range(1, total_seats + 1):
-            seat = Seat(wagon_id=wagon_id, seat_number=seat_number)
-            seats.append(seat)
-        
-        for seat in seats:
-            await self.seat_repo.create_seat(seat)
-        
-        return seats
+        seat_ids = await self.db.seats.create_seats(wagon_id, total_seats)
+        await self.db.commit()
+        return seat_ids
     
     async def get_seat(self, seat_id: int) -> Optional[Seat]:
         """Получить информацию о месте"""
-        return await self.seat_repo.get_seat(seat_id)
-    
-    async def get_available_seats(self, wagon_id: int) -> List[Seat]:
-        """Получить свободные места в вагоне"""
-        return await self.seat_repo.get_available_seats(wagon_id)
+        return await self.db.seats.get_seat(seat_id)
+    
+    async def get_available_seats(self, wagon_id: int, from_stop: Optional[int] = None,
+                                  to_stop: Optional[int] = None) -> List[Seat]:
+        """Получить свободные места в вагоне на всем маршруте или на участке между остановками"""
+        if from_stop is None:
+            return [seat for seat in await self.get_wagon_layout(wagon_id) if seat.is_available and not seat.is_reserved]
+        wagon = await self.db.wagons.get_wagon(wagon_id)
+        train = await self.db.trains.get_train(wagon.train_id) if wagon else None
+        if train is None:
+            return []
+        segment = await TrainService(self.db).segment(train, from_stop, to_stop)
+        return [seat for seat in await self.get_wagon_layout(wagon_id) if not seat.segments_mask & segment.mask]
     
     async def get_wagon_layout(self, wagon_id: int) -> List[Seat]:
-        """Получить всю схему мест вагона"""
-        return await self.seat_repo.get_all_seats(wagon_id)
+        """Получить всю схему мест вагона, включая места без строки в таблице мест"""
+        wagon = await self.db.wagons.get_wagon(wagon_id)
+        if wagon is None:
+            return []
+        seats = {seat.seat_number: seat for seat in await self.db.seats.get_all_seats(wagon_id)}
+        for number in range(1, wagon.total_seats + 1):
+            if number not in seats:
+                # Непроданное место LAZY_SEAT_ROWS: несохраняемый объект без id
+                seats[number] = Seat(
+                    wagon_id=wagon_id, seat_number=number, is_available=True, is_reserved=False, segments_mask=0
+                )
+        return [seats[number] for number in sorted(seats)]
+    
+    async def get_seat_map(self, wagon_id: int) -> Optional[SeatMapResponse]:
+        """Схема мест вагона битовой маской из памяти, без чтения строк мест"""
+        seat_map = await OccupancyService(self.db).seat_map(wagon_id)
+        if seat_map is None:
+            return None
+        return self._seat_map_response(wagon_id, seat_map)
+    
+    def get_seat_map_changes(self, wagon_id: int, since: int) -> Optional[SeatMapChanges]:
+        """Места, изменившиеся после версии since, из журнала маски, сверенной get_seat_map.
+        
+        None - версии since нет в журнале вагона (слишком старая или ее видел
+        только другой процесс): клиенту нужна полная схема.
+        """
+        seat_map = OccupancyService.seat_maps().get(wagon_id)
+        changes = None if seat_map is None else seat_map.changes_since(since)
+        if changes is None:
+            return None
+        return SeatMapChanges.model_construct(
+            wagon_id=wagon_id,
+            version=seat_map.version,
+            free_seats=seat_map.free,
+            changes=[SeatChange.model_construct(seat_number=number, free=free) for number, free in changes]
+        )
+    
+    async def watch_seat_map(self, wagon_id: int) -> Optional[AsyncIterator[dict]]:
+        """Схема мест вагона, затем изменения мест по мере брони и отмены; None - нет вагона.
+        
+        Подписка оформляется до чтения схемы, поэтому изменение между ними
+        не теряется (повторное применение изменения к схеме безвредно).
+        Поток читает только маски в памяти и не держит соединение с БД.
+        """
+        events = OccupancyService.seat_events()
+        subscription = events.subscribe(wagon_id)
+        seat_map = await self.get_seat_map(wagon_id)
+        if seat_map is None:
+            events.unsubscribe(subscription)
+            return None
+        return self._seat_map_stream(seat_map, subscription)
+    
+    async def _seat_map_stream(self, seat_map: SeatMapResponse,
+                               subscription: SeatSubscription) -> AsyncIterator[dict]:
+        wagon_id = subscription.wagon_id
+        try:
+            yield {"type": "snapshot", **seat_map.model_dump()}
+            while True:
+                changes = await subscription.next(settings.SEAT_EVENTS_PING_SECONDS)
+                current = OccupancyService.seat_maps().get(wagon_id)
+                if current is None:
+                    return
+                if changes is None:
+                    # Клиент отстал или места менялись в обход сервисов
+                    yield {"type": "snapshot", **self._seat_map_response(wagon_id, current).model_dump()}
+                elif changes:
+                    yield {
+                        "type": "delta",
+                        "wagon_id": wagon_id,
+                        "free_seats": current.free,
+                        "changes": [{"seat_number": number, "free": free} for number, free in changes],
+                    }
+                else:
+                    yield {"type": "ping"}
+        finally:
+            OccupancyService.seat_events().unsubscribe(subscription)
+    
+    @staticmethod
+    def _seat_map_response(wagon_id: int, seat_map: SeatMap) -> SeatMapResponse:
+        return SeatMapResponse.model_construct(
+            wagon_id=wagon_id,
+            seat_offset=seat_map.offset,
+            seat_count=seat_map.size,
+            free_seats=seat_map.free,
+            first_seat_id=seat_map.first_seat_id,
+            bitmap=seat_map.encode(),
+            version=seat_map.version
+        )
     
     async def reserve_seat(self, seat_id: int) -> Seat:
         """Зарезервировать место"""
-        return await self.seat_repo.reserve_seat(seat_id)
+        seat = await self.db.seats.get_seat(seat_id)
+        was_free = seat is not None and seat.is_available and not seat.is_reserved
+        seat = await self.db.seats.reserve_seat(seat_id)
+        if was_free:
+            await RouteCalendarService(self.db).refresh_for_wagon(seat.wagon_id)
+        await self.db.commit()
+        if was_free:
+            OccupancyService.reserve(seat.wagon_id, seat.seat_number)
+        return seat
     
     async def release_seat(self, seat_id: int) -> Seat:
         """Освободить место (отменить резервацию)"""
-        return await self.seat_repo.release_seat(seat_id)
+        seat = await self.db.seats.get_seat(seat_id)
+        was_taken = seat is not None and (not seat.is_available or seat.is_reserved)
+        seat = await self.db.seats.release_seat(seat_id)
+        if was_taken:
+            await RouteCalendarService(self.db).refresh_for_wagon(seat.wagon_id)
+        await self.db.commit()
+        if was_taken:
+            OccupancyService.release(seat.wagon_id, seat.seat_number)
+        return seat
     
     async def count_available_seats(self, wagon_id: int) -> int:
         """Подсчитать количество свободных мест"""
         available = await self.get_available_seats(wagon_id)
         return len(available)
 
-class TicketService:
+class TicketService(BaseService):
     """Сервис для управления билетами"""
     
-    def __init__(self, ticket_repo: TicketRepository, seat_repo: SeatRepository):
-        self.ticket_repo = ticket_repo
-        self.seat_repo = seat_repo
-    
     def _generate_ticket_number(self) -> str:
         """Сгенерировать номер билета"""
         return f"WM-{datetime.utcnow().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
@@ -146,7 +376,7 @@ class TicketService:
                             wagon: Wagon, 
                             discount_type: str = "none") -> PriceCalculationResponse:
         """Рассчитать стоимость билета"""
-        base_price = train.base_price * wagon.price_multiplier
+        base_price = FareRulesService.base_price(train, wagon)
         final_price, discount_percent = DiscountService.calculate_final_price(base_price, discount_type)
         
         return PriceCalculationResponse(
@@ -156,17 +386,58 @@ class TicketService:
             discount_type=discount_type
         )
     
-    async def create_ticket(self, 
-                          ticket_data: TicketCreate,
-                          base_price: float,
-                          final_price: float,
-                          train: Train) -> Ticket:
-        """Создать билет и зарезервировать место"""
+    async def get_fare_matrix(self, train_ids: List[int]) -> FareMatrixResponse:
+        """Цены всех вагонов поездов по всем типам скидок.
+
+        Поезда и вагоны выбираются двумя запросами, цены считаются одним
+        проходом по строкам с заранее собранным вектором ставок вместо
+        отдельного расчета на каждую пару (вагон, скидка).
+        """
+        trains = await self.db.trains.get_trains_by_ids(train_ids)
+        wagons_by_train = await self.db.wagons.get_wagons_by_train_ids(list(trains))
+        
+        rules = FareRulesService.rules()
+        discount_types = list(rules.discounts)
+        rates = list(rules.discounts.values())
+        rows = []
+        # Порядок поездов - как в запросе, повторы и несуществующие id пропускаются
+        for train_id in dict.fromkeys(train_ids):
+            train = trains.get(train_id)
+            if train is None:
+                continue
+            wagons = []
+            for wagon in wagons_by_train[train_id]:
+                base_price = FareRulesService.base_price(train, wagon, rules)
+                # Та же формула, что в DiscountService.calculate_final_price
+                wagons.append(FareMatrixWagon.model_construct(
+                    wagon_id=wagon.id,
+                    wagon_number=wagon.wagon_number,
+                    wagon_type=wagon.wagon_type,
+                    base_price=base_price,
+                    final_prices=[base_price - base_price * rate for rate in rates]
+                ))
+            rows.append(FareMatrixTrain.model_construct(
+                train_id=train.id, train_number=train.train_number, wagons=wagons
+            ))
+        
+        return FareMatrixResponse.model_construct(
+            discount_types=discount_types,
+            discount_percents=[rate * 100 for rate in rates],
+            trains=rows
+        )
+    
+    def _new_ticket(self,
+                    ticket_data: TicketCreate,
+                    base_price: float,
+                    final_price: float,
+                    train: Train,
+                    user_id: Optional[int],
+                    segment: Segment) -> Ticket:
         # Рассчитать скидку
         _, discount_percent = DiscountService.calculate_final_price(base_price, ticket_data.discount_type)
         
-        # Создать билет
-        ticket = Ticket(
+        return Ticket(
+            user_id=user_id,
             train_id=ticket_data.train_id,
             wagon_id=ticket_data.wagon_id,
             seat_id=ticket_data.seat_id,
@@ -178,46 +449,176 @@ class TicketService:
             base_price=base_price,
             final_price=final_price,
             ticket_number=self._generate_ticket_number(),
-            departure_time=train.departure_time,
-            arrival_time=train.arrival_time,
+            departure_time=segment.departure_time,
+            arrival_time=segment.arrival_time,
+            from_stop=segment.from_stop,
+            to_stop=segment.to_stop,
             is_paid=False
         )
+    
+    async def materialize_seat(self, wagon: Wagon, seat_number: int) -> Optional[Seat]:
+        """Место вагона по номеру; строка непроданного места создается в текущей транзакции"""
+        if not 1 <= seat_number <= wagon.total_seats:
+            return None
+        return await self.db.seats.materialize_seat(wagon.id, seat_number)
+    
+    async def create_ticket(self, 
+                          ticket_data: TicketCreate,
+                          base_price: float,
+                          final_price: float,
+                          train: Train,
+                          user_id: Optional[int] = None) -> Ticket:
+        """Создать билет и занять место на всем маршруте или на участке"""
+        # Место должно быть в этом вагоне, а вагон - в этом поезде: иначе бронь
+        # попадет в счетчики и схему мест чужого вагона
+        seat = await self.db.seats.get_seat(ticket_data.seat_id)
+        wagon = await self.db.wagons.get_wagon(ticket_data.wagon_id)
+        if (seat is None or wagon is None
+                or wagon.train_id != train.id or seat.wagon_id != wagon.id):
+            raise InvalidItineraryError
+        segment = await TrainService(self.db).segment(train, ticket_data.from_stop, ticket_data.to_stop)
+        ticket = self._new_ticket(ticket_data, base_price, final_price, train, user_id, segment)
+        
+        # Занять участок места и сохранить билет одной транзакцией
+        masks = await self.db.seats.claim_seats({ticket_data.seat_id: segment.mask})
+        if masks is None:
+            raise SeatUnavailableError
+        await self.db.tickets.create_ticket(ticket)
+        await RouteCalendarService(self.db).refresh_for_train(train)
+        await self.db.commit()
+        if not masks[ticket_data.seat_id] & ~segment.mask:
+            # До брони место было свободно на всем маршруте
+            OccupancyService.reserve(ticket_data.wagon_id, seat.seat_number)
+        return ticket
+    
+    async def create_itinerary(self, itinerary: ItineraryCreate,
+                               user_id: Optional[int] = None) -> List[Ticket]:
+        """Забронировать места на нескольких поездах: все билеты или ни одного.
+        
+        Места (или их участки) занимаются условным UPDATE в порядке возрастания id, билеты
+        создаются в той же транзакции; если хоть одно место занято, commit
+        не выполняется и DBManager откатывает всю бронь.
+        """
+        legs = itinerary.legs
+        trains = await self.db.trains.get_trains_by_ids(list({leg.train_id for leg in legs}))
+        wagons = await self.db.wagons.get_wagons_by_ids(list({leg.wagon_id for leg in legs}))
+        for leg in legs:
+            if leg.seat_id is None:
+                wagon = wagons.get(leg.wagon_id)
+                seat = await self.materialize_seat(wagon, leg.seat_number) if wagon else None
+                if seat is None:
+                    raise InvalidItineraryError
+                leg.seat_id = seat.id
+        
+        seat_ids = [leg.seat_id for leg in legs]
+        if len(set(seat_ids)) != len(seat_ids):
+            raise InvalidItineraryError
+        seats = await self.db.seats.get_seats_by_ids(seat_ids)
+        for leg in legs:
+            wagon, seat = wagons.get(leg.wagon_id), seats.get(leg.seat_id)
+            if (leg.train_id not in trains or wagon is None or seat is None
+                    or wagon.train_id != leg.train_id or seat.wagon_id != leg.wagon_id):
+                raise InvalidItineraryError
+        
+        train_service = TrainService(self.db)
+        segments = [await train_service.segment(trains[leg.train_id], leg.from_stop, leg.to_stop) for leg in legs]
+        masks = await self.db.seats.claim_seats(
+            {leg.seat_id: segment.mask for leg, segment in zip(legs, segments)}
+        )
+        if masks is None:
+            raise SeatUnavailableError
         
-        # Зарезервировать место
-        await self.seat_repo.reserve_seat(ticket_data.seat_id)
+        passenger = itinerary.model_dump(exclude={"legs"})
+        tickets = []
+        for leg, segment in zip(legs, segments):
+            train, wagon = trains[leg.train_id], wagons[leg.wagon_id]
+            price = await self.calculate_price(train, wagon, leg.discount_type)
+            tickets.append(self._new_ticket(
+                TicketCreate(**leg.model_dump(), **passenger),
+                price.base_price, price.final_price, train, user_id, segment
+            ))
+        await self.db.tickets.create_tickets(tickets)
         
-        # Сохранить билет
-        return await self.ticket_repo.create_ticket(ticket)
+        calendar = RouteCalendarService(self.db)
+        for train in trains.values():
+            await calendar.refresh_for_train(train)
+        await self.db.commit()
+        for leg, segment in zip(legs, segments):
+            if not masks[leg.seat_id] & ~segment.mask:
+                OccupancyService.reserve(leg.wagon_id, seats[leg.seat_id].seat_number)
+        return tickets
     
     async def get_ticket(self, ticket_id: int) -> Optional[Ticket]:
         """Получить информацию о билете"""
-        return await self.ticket_repo.get_ticket(ticket_id)
+        return await self.db.tickets.get_ticket(ticket_id)
+    
+    async def get_ticket_detail(self, ticket_id: int, user_id: int) -> Optional[TicketDetailResponse]:
+        """Получить билет пользователя с данными поезда, вагона и места"""
+        details = await self.db.tickets.get_ticket_details([ticket_id], user_id)
+        return details[0] if details else None
+    
+    async def get_ticket_details(self, ticket_ids: List[int], user_id: int) -> List[TicketDetailResponse]:
+        """Получить несколько билетов пользователя с деталями одним запросом; чужие пропускаются"""
+        return await self.db.tickets.get_ticket_details(ticket_ids, user_id)
+    
+    async def get_my_tickets(self, user_id: int, limit: int,
+                             cursor: Optional[str] = None) -> Page[TicketDetailResponse]:
+        """История билетов пользователя постранично по курсору"""
+        after = tuple(decode_cursor(cursor)) if cursor else None
+        if after is not None and (len(after) != 2 or not isinstance(after[0], datetime)
+                                  or not isinstance(after[1], int)):
+            raise InvalidCursorError
+        # Берем на одну запись больше, чтобы узнать, есть ли следующая страница
+        items = await self.db.tickets.get_user_ticket_details_page(user_id, limit + 1, after)
+        items, next_cursor = split_page(items, limit, lambda ticket: (ticket.created_at, ticket.id))
+        return Page[TicketDetailResponse](items=items, next_cursor=next_cursor)
     
     async def get_user_tickets(self, passenger_email: str) -> List[Ticket]:
         """Получить все билеты пассажира"""
-        return await self.ticket_repo.get_user_tickets(passenger_email)
+        return await self.db.tickets.get_user_tickets(passenger_email)
     
-    async def delete_ticket(self, ticket_id: int) -> bool:
+    async def delete_ticket(self, ticket_id: int) -> None:
         """Удалить билет"""
-        return await self.ticket_repo.delete_ticket(ticket_id)
+        await self.db.tickets.delete_ticket(ticket_id)
+        await self.db.commit()
+    
+    async def cancel_ticket(self, ticket: Ticket) -> None:
+        """Освободить место (или участок) и удалить билет одной транзакцией"""
+        await self.db.tickets.delete_ticket(ticket.id)
+        if ticket.from_stop is None:
+            mask = FULL_ROUTE
+        else:
+            mask = segment_mask(ticket.from_stop, ticket.to_stop)
+        seat = await self.db.seats.get_seat(ticket.seat_id)
+        # Строку места могли удалить в обход API: тогда освобождать нечего
+        remaining = await self.db.seats.release_segments(ticket.seat_id, mask) if seat else None
+        if settings.LAZY_SEAT_ROWS and remaining == 0:
+            await self.db.seats.delete_seat(ticket.seat_id)
+        await RouteCalendarService(self.db).refresh_for_wagon(ticket.wagon_id)
+        await self.db.commit()
+        if remaining == 0:
+            # Место снова свободно на всем маршруте
+            OccupancyService.release(ticket.wagon_id, seat.seat_number)
     
     async def pay_ticket(self, ticket_id: int) -> Ticket:
         """Оплатить билет"""
-        return await self.ticket_repo.update_ticket_payment(ticket_id, True)
+        ticket = await self.db.tickets.update_ticket_payment(ticket_id, True)
+        await self.db.commit()
+        return ticket
     
-    async def generate_pdf_ticket(self, ticket: Ticket, train: Train, wagon: Wagon, seat: Seat) -> dict:
+    async def generate_pdf_ticket(self, ticket: TicketDetailResponse) -> dict:
         """Сгенерировать данные для электронного билета"""
         return {
             "ticket_number": ticket.ticket_number,
             "passenger_name": ticket.passenger_name,
-            "train_number": train.train_number,
-            "wagon_number": wagon.wagon_number,
-            "wagon_type": wagon.wagon_type,
-            "seat_number": seat.seat_number,
-            "route_from": train.route_from,
-            "route_to": train.route_to,
-            "departure_time": train.departure_time,
-            "arrival_time": train.arrival_time,
+            "train_number": ticket.train_number,
+            "wagon_number": ticket.wagon_number,
+            "wagon_type": ticket.wagon_type,
+            "seat_number": ticket.seat_number,
+            "route_from": ticket.route_from,
+            "route_to": ticket.route_to,
+            "departure_time": ticket.departure_time,
+            "arrival_time": ticket.arrival_time,
             "discount_type": ticket.discount_type,
             "base_price": ticket.base_price,
             "discount_percent": ticket.discount_percent,
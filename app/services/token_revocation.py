@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.exceptions.auth import TokenRevokedError
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.schemes.revoked_tokens import SRevokedTokenAdd
+from app.services.base import BaseService
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TokenRevocationService(BaseService):
+    """Отзыв JWT по jti.
+
+    Отозванные jti хранятся в таблице revoked_tokens, а в памяти процесса
+    держится Bloom-фильтр по ним: для подавляющего большинства запросов
+    проверка заканчивается на фильтре, и в БД идём только при возможном
+    совпадении. Фильтр периодически пересобирается из таблицы, при этом
+    записи с истекшим exp удаляются.
+
+    Фильтр свой у каждого процесса: отзыв в другом воркере становится
+    виден здесь только после пересборки (см. REVOKED_TOKENS_REBUILD_SECONDS).
+    """
+
+    _bloom: BloomFilter = BloomFilter(
+        settings.REVOKED_TOKENS_BLOOM_CAPACITY,
+        settings.REVOKED_TOKENS_BLOOM_ERROR_RATE,
+    )
+    # jti, отозванные во время пересборки, чтобы не потерять их при подмене фильтра
+    _added_during_rebuild: list[str] | None = None
+
+    @classmethod
+    def _remember(cls, jti: str) -> None:
+        cls._bloom.add(jti)
+        if cls._added_during_rebuild is not None:
+            cls._added_during_rebuild.append(jti)
+
+    async def revoke_token(self, payload: dict) -> None:
+        jti = payload.get("jti")
+        if jti is None:
+            return
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc).replace(
+            tzinfo=None
+        )
+        try:
+            await self.db.revoked_tokens.add(
+                SRevokedTokenAdd(jti=jti, expires_at=expires_at)
+            )
+        except ObjectAlreadyExistsError:
+            pass
+        await self.db.commit()
+        self._remember(jti)
+
+    @classmethod
+    def may_be_revoked(cls, payload: dict) -> bool:
+        """Проверка только по фильтру в памяти: False - токен точно не отозван"""
+        jti = payload.get("jti")
+        return jti is not None and jti in cls._bloom
+
+    async def is_revoked(self, payload: dict) -> bool:
+        if not self.may_be_revoked(payload):
+            return False
+        jti = payload["jti"]
+        token = await self.db.revoked_tokens.get_one_or_none(jti=jti)
+        return token is not None
+
+    async def ensure_not_revoked(self, payload: dict) -> None:
+        if await self.is_revoked(payload):
+            raise TokenRevokedError
+
+    async def rebuild_filter(self) -> int:
+        """Пересобирает фильтр из таблицы и удаляет истекшие записи.
+
+        Фильтр собирается до удаления: чтение не ждет блокировки на запись,
+        и если очистку придется отложить, фильтр все равно будет актуален.
+        """
+        cls = type(self)
+        cls._added_during_rebuild = []
+        now = _utcnow()
+        try:
+            jtis = await self.db.revoked_tokens.get_active_jtis(now)
+            bloom = BloomFilter.from_keys(
+                jtis + cls._added_during_rebuild,
+                settings.REVOKED_TOKENS_BLOOM_CAPACITY,
+                settings.REVOKED_TOKENS_BLOOM_ERROR_RATE,
+            )
+            cls._bloom = bloom
+        finally:
+            cls._added_during_rebuild = None
+        await self.db.revoked_tokens.delete_expired(now)
+        await self.db.commit()
+        return len(bloom)
+
+
+async def rebuild_revocation_filter_periodically(session_factory) -> None:
+    while True:
+        try:
+            async with DBManager(session_factory=session_factory) as db:
+                count = await TokenRevocationService(db).rebuild_filter()
+            logger.info("Фильтр отозванных токенов пересобран: %s записей", count)
+        except Exception:
+            logger.exception("Не удалось пересобрать фильтр отозванных токенов")
+        await asyncio.sleep(settings.REVOKED_TOKENS_REBUILD_SECONDS)
@@ -0,0 +1,55 @@
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Вероятностное множество строк без ложноотрицательных ответов.
+
+    `key in bloom` возвращает False только если ключ точно не добавлялся,
+    True означает "возможно добавлялся" с вероятностью ошибки ~error_rate
+    при заполнении до capacity.
+    """
+
+    __slots__ = ("capacity", "error_rate", "size", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_keys(
+        cls, keys: Iterable[str], capacity: int, error_rate: float = 0.01
+    ) -> "BloomFilter":
+        keys = list(keys)
+        bloom = cls(max(capacity, len(keys) * 2), error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key: str):
+        # Двойное хеширование: k позиций из двух 64-битных половин одного дайджеста
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,100 @@
+import re
+from typing import Iterable
+
+# Две распространенные схемы латиницы: "бытовая" и паспортная (ICAO)
+_COMMON = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sch",
+    "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}  # fmt: skip
+_ICAO = {
+    **_COMMON,
+    "й": "i", "щ": "shch", "ъ": "ie", "ю": "iu", "я": "ia",
+}  # fmt: skip
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+
+
+def normalize(name: str) -> str:
+    """Регистр, ё/е, пробелы и дефисы не различаются: ' санкт-Петербург' == 'Санкт Петербург'"""
+    return _SEPARATORS.sub(" ", name.casefold().replace("ё", "е")).strip()
+
+
+def transliterations(normalized: str) -> set[str]:
+    """Латинские написания нормализованного названия"""
+    variants = {
+        "".join(table.get(char, char) for char in normalized)
+        for table in (_COMMON, _ICAO)
+    }
+    # Екатеринбург - Yekaterinburg
+    if normalized.startswith("е"):
+        variants |= {"y" + variant for variant in variants}
+    return variants
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.top: list[str] = []
+
+
+class CityIndex:
+    """Префиксное дерево названий городов для автодополнения.
+
+    Каждый город лежит в дереве под нормализованным названием и его
+    латинскими написаниями. В каждом узле заранее хранится limit лучших
+    городов с этим префиксом по числу отправлений, поэтому подсказка -
+    проход по символам запроса без обхода поддерева.
+    """
+
+    __slots__ = ("_root", "_departures", "_names", "_limit")
+
+    def __init__(self, departures: Iterable[tuple[str, int]] = (), limit: int = 20):
+        self._root = _Node()
+        self._departures: dict[str, int] = {}
+        # нормализованное название или транслитерация -> название в расписании
+        self._names: dict[str, str] = {}
+        self._limit = limit
+        for city, count in departures:
+            self.add(city, count)
+
+    def __len__(self) -> int:
+        return len(self._departures)
+
+    def _rank(self, city: str) -> tuple[int, str]:
+        return -self._departures[city], city
+
+    def add(self, city: str, departures: int = 0) -> None:
+        """Добавить город или увеличить число его отправлений"""
+        self._departures[city] = self._departures.get(city, 0) + departures
+        normalized = normalize(city)
+        for key in (normalized, *transliterations(normalized)):
+            self._names.setdefault(key, city)
+            node = self._root
+            self._place(node, city)
+            for char in key:
+                node = node.children.setdefault(char, _Node())
+                self._place(node, city)
+
+    def _place(self, node: _Node, city: str) -> None:
+        top = node.top
+        if city not in top:
+            top.append(city)
+        top.sort(key=self._rank)
+        del top[self._limit :]
+
+    def resolve(self, name: str) -> str | None:
+        """Название города в расписании по вводу пользователя"""
+        return self._names.get(normalize(name))
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        node = self._root
+        for char in normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(city, self._departures[city]) for city in node.top[:limit]]
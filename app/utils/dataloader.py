@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Пакетная загрузка по ключам в рамках одного запроса.
+
+    Все load(), вызванные до следующей итерации цикла событий, собираются в
+    один вызов batch_load_fn(keys) -> {key: value}. Результаты запоминаются:
+    повторный load() того же ключа не ходит в БД. Отсутствующие в ответе
+    ключи получают None.
+
+    AsyncSession не допускает параллельных запросов, поэтому загрузчики,
+    работающие с одной сессией, должны делить общий lock.
+    """
+
+    def __init__(
+        self,
+        batch_load_fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+        lock: asyncio.Lock | None = None,
+    ) -> None:
+        self._batch_load_fn = batch_load_fn
+        self._lock = lock or asyncio.Lock()
+        self._cache: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+        self._dispatch_task: asyncio.Task | None = None
+
+    def load(self, key: K) -> "asyncio.Future[V | None]":
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def prime(self, key: K, value: V) -> None:
+        """Положить уже загруженное значение в кэш загрузчика"""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    async def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        try:
+            async with self._lock:
+                values = await self._batch_load_fn(keys)
+        except Exception as exc:
+            # Ошибки не кэшируем: следующий load() повторит запрос
+            for key in keys:
+                self._cache.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            self._cache[key].set_result(values.get(key))
@@ -0,0 +1,198 @@
+import logging
+from array import array
+from datetime import date, datetime
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Горизонт предварительной покупки: дальше все считается одним окном
+ADVANCE_HORIZON_DAYS = 365
+
+# Смещения месяцев в високосном году: день сезона "MM-DD" -> индекс 0..365
+_MONTH_OFFSETS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+
+def day_index(month: int, day: int) -> int:
+    return _MONTH_OFFSETS[month - 1] + day - 1
+
+
+def parse_month_day(value: str) -> int:
+    """'MM-DD' -> индекс дня в году"""
+    month, day = value.split("-")
+    date(2000, int(month), int(day))  # ValueError для несуществующей даты
+    return day_index(int(month), int(day))
+
+
+class _KeyRules:
+    """Правила одного ключа (откуда, куда, тип вагона), разложенные по измерениям"""
+
+    __slots__ = ("multiplier", "season", "advance")
+
+    def __init__(self) -> None:
+        self.multiplier = 1.0
+        self.season: array | None = None
+        self.advance: array | None = None
+
+    def apply(self, rule) -> None:
+        """Добавить правило; ValueError - правило некорректно, ключ не меняется"""
+        if rule.season_start or rule.season_end:
+            if not (rule.season_start and rule.season_end):
+                raise ValueError("Сезон задается двумя датами MM-DD")
+            start = parse_month_day(rule.season_start)
+            end = parse_month_day(rule.season_end)
+            if self.season is None:
+                self.season = array("d", [1.0]) * 366
+            # Сезон может переходить через Новый год: 12-20 .. 01-10
+            days = (
+                range(start, end + 1)
+                if start <= end
+                else [
+                    *range(start, 366),
+                    *range(0, end + 1),
+                ]
+            )
+            for i in days:
+                self.season[i] *= rule.multiplier
+        elif rule.advance_min_days is not None or rule.advance_max_days is not None:
+            if (rule.advance_min_days or 0) < 0 or (rule.advance_max_days or 0) < 0:
+                raise ValueError("Срок покупки не может быть отрицательным")
+            if self.advance is None:
+                self.advance = array("d", [1.0]) * (ADVANCE_HORIZON_DAYS + 1)
+            low = rule.advance_min_days or 0
+            high = min(
+                (
+                    ADVANCE_HORIZON_DAYS
+                    if rule.advance_max_days is None
+                    else rule.advance_max_days
+                ),
+                ADVANCE_HORIZON_DAYS,
+            )
+            for i in range(low, high + 1):
+                self.advance[i] *= rule.multiplier
+        else:
+            self.multiplier *= rule.multiplier
+
+
+def compile_occupancy_tiers(tiers: Iterable) -> dict[tuple, array]:
+    """Шкалы загрузки -> массив множителей по целому проценту загрузки 0..100"""
+    steps: dict[tuple, list] = {}
+    for tier in tiers:
+        if not 0 <= tier.min_load_percent <= 100:
+            logger.warning(
+                "Ступень цены по загрузке %s пропущена: min_load_percent=%s вне 0..100",
+                tier.id,
+                tier.min_load_percent,
+            )
+            continue
+        key = (tier.train_id, tier.wagon_type)
+        steps.setdefault(key, []).append((tier.min_load_percent, tier.multiplier))
+    compiled = {}
+    for key, key_steps in steps.items():
+        table = array("d", [1.0]) * 101
+        for min_load, multiplier in sorted(key_steps):
+            for percent in range(min_load, 101):
+                table[percent] = multiplier
+        compiled[key] = table
+    return compiled
+
+
+class CompiledFareRules:
+    """Тарифные правила, скомпилированные в таблицы поиска.
+
+    Надбавки по маршруту, типу вагона, сезону и сроку покупки группируются
+    по ключу (откуда, куда, тип вагона), где None - любое значение. Для
+    каждого ключа сезонные множители развернуты в массив по дням года,
+    а множители предварительной покупки - в массив по дням до отправления.
+    Расчет цены - 8 обращений к словарю (все сочетания "конкретное
+    значение / любое") и индексация массивов, без запросов к БД.
+    Подходящие правила перемножаются.
+
+    Шкалы цены по загрузке развернуты в массивы по проценту занятых мест;
+    для (поезд, класс) берется самая конкретная шкала.
+    """
+
+    __slots__ = ("discounts", "wagon_classes", "_by_key", "_occupancy")
+
+    def __init__(
+        self,
+        discounts: dict[str, float],
+        wagon_classes: dict[str, float],
+        rules: Iterable = (),
+        occupancy_tiers: Iterable = (),
+    ) -> None:
+        # Доли скидок (0.25 = 25%) и множители классов вагонов
+        self.discounts = dict(discounts)
+        self.wagon_classes = dict(wagon_classes)
+        by_key: dict[tuple, _KeyRules] = {}
+        for rule in rules:
+            key = (rule.route_from, rule.route_to, rule.wagon_type)
+            entry = by_key.get(key) or _KeyRules()
+            try:
+                entry.apply(rule)
+            except (TypeError, ValueError) as e:
+                # Строки таблицы читаются без валидации схемой, а админка
+                # пишет их напрямую: битое правило не должно ронять запуск
+                logger.warning("Тарифное правило %s пропущено: %s", rule.id, e)
+                continue
+            by_key[key] = entry
+        self._by_key = by_key
+        self._occupancy = compile_occupancy_tiers(occupancy_tiers)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def discount_rate(self, discount_type: str) -> float:
+        return self.discounts.get(discount_type, 0.0)
+
+    def class_multiplier(self, wagon_type: str) -> float:
+        return self.wagon_classes.get(wagon_type, 1.0)
+
+    @property
+    def has_occupancy_tiers(self) -> bool:
+        return bool(self._occupancy)
+
+    def occupancy_multiplier(
+        self, train_id: int, wagon_type: str, load_percent: int
+    ) -> float:
+        occupancy = self._occupancy
+        if not occupancy:
+            return 1.0
+        for key in (
+            (train_id, wagon_type),
+            (train_id, None),
+            (None, wagon_type),
+            (None, None),
+        ):
+            table = occupancy.get(key)
+            if table is not None:
+                return table[min(max(load_percent, 0), 100)]
+        return 1.0
+
+    def adjustment(
+        self,
+        route_from: str,
+        route_to: str,
+        wagon_type: str,
+        departure: datetime,
+        today: date | None = None,
+    ) -> float:
+        """Произведение множителей всех правил, подходящих к поездке"""
+        by_key = self._by_key
+        if not by_key:
+            return 1.0
+        today = today or date.today()
+        season_day = day_index(departure.month, departure.day)
+        advance_day = min(max((departure.date() - today).days, 0), ADVANCE_HORIZON_DAYS)
+        result = 1.0
+        for rf in (route_from, None):
+            for rt in (route_to, None):
+                for wt in (wagon_type, None):
+                    entry = by_key.get((rf, rt, wt))
+                    if entry is None:
+                        continue
+                    result *= entry.multiplier
+                    if entry.season is not None:
+                        result *= entry.season[season_day]
+                    if entry.advance is not None:
+                        result *= entry.advance[advance_day]
+        return result
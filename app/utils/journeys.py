@@ -0,0 +1,168 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, NamedTuple
+
+
+class Connection(NamedTuple):
+    """Поездка на поезде от остановки from_stop до to_stop; сортируется по отправлению.
+
+    Номера остановок - как в train_stops; у поезда без остановок их две:
+    0 (route_from) и 1 (route_to).
+    """
+
+    departure_time: datetime
+    train_id: int
+    train_number: str
+    route_from: str
+    route_to: str
+    arrival_time: datetime
+    from_stop: int
+    to_stop: int
+
+
+class Journey(NamedTuple):
+    legs: tuple[Connection, ...]
+    price: float
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def transfers(self) -> int:
+        return len(self.legs) - 1
+
+
+# Метка станции: (прибытие, число поездов, цена, рейс, метка-родитель)
+_Label = tuple
+
+
+def _dominated(bag: list[_Label], arrival: datetime, legs: int, price: float) -> bool:
+    return any(
+        other[0] <= arrival and other[1] <= legs and other[2] <= price for other in bag
+    )
+
+
+def _insert(bag: list[_Label], label: _Label) -> None:
+    arrival, legs, price = label[:3]
+    bag[:] = [
+        other
+        for other in bag
+        if not (arrival <= other[0] and legs <= other[1] and price <= other[2])
+    ]
+    bag.append(label)
+
+
+class Timetable:
+    """Расписание в памяти для поиска маршрутов с пересадками.
+
+    Рейсы лежат одним массивом по времени отправления; у поезда с
+    остановками рейс есть для каждой пары остановок, так что поездка через
+    промежуточные станции - один рейс, а не пересадки. Поиск - сканирование
+    рейсов (Connection Scan) от момента отправления до горизонта: у каждой
+    станции хранится набор Парето-оптимальных меток (прибытие, пересадки,
+    цена), рейс продлевает метки станции отправления, с которых успевает
+    пересадка. Метки, которые хуже уже найденных вариантов в пункте
+    назначения, отбрасываются сразу.
+    """
+
+    __slots__ = ("_connections", "_by_train", "_prices")
+
+    def __init__(
+        self, connections: Iterable[Connection] = (), prices: dict | None = None
+    ) -> None:
+        # Рейс с прибытием не позже отправления (ошибка данных) сломал бы скан
+        self._connections = sorted(
+            c for c in connections if c.arrival_time > c.departure_time
+        )
+        self._by_train: dict[int, list[Connection]] = {}
+        for c in self._connections:
+            self._by_train.setdefault(c.train_id, []).append(c)
+        # train_id -> самый дешевый тариф поезда до скидки
+        self._prices: dict[int, float] = dict(prices or {})
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def price(self, train_id: int) -> float | None:
+        return self._prices.get(train_id)
+
+    def add_train(self, train_id: int, connections: Iterable[Connection]) -> None:
+        """Добавить рейсы поезда или заменить прежние"""
+        for old in self._by_train.pop(train_id, ()):
+            self._connections.remove(old)
+        added = [c for c in connections if c.arrival_time > c.departure_time]
+        for connection in added:
+            insort(self._connections, connection)
+        if added:
+            self._by_train[train_id] = added
+
+    def offer_price(self, train_id: int, price: float) -> None:
+        current = self._prices.get(train_id)
+        if current is None or price < current:
+            self._prices[train_id] = price
+
+    def plan(
+        self,
+        origin: str,
+        destination: str,
+        departure_after: datetime,
+        max_transfers: int,
+        min_connection: timedelta,
+        horizon: timedelta,
+        bookable: Callable[[int], bool] = lambda train_id: True,
+    ) -> list[Journey]:
+        """Парето-оптимальные варианты по (прибытие, пересадки, цена)"""
+        max_legs = max_transfers + 1
+        end = departure_after + horizon
+        prices = self._prices
+        connections = self._connections
+        start: _Label = (departure_after, 0, 0.0, None, None)
+        bags: dict[str, list[_Label]] = {}
+        best: list[_Label] = []
+
+        for i in range(bisect_left(connections, (departure_after,)), len(connections)):
+            c = connections[i]
+            if c.departure_time > end:
+                break
+            if c.route_to == origin or c.route_from == destination:
+                continue
+            if c.route_from == origin:
+                labels = (start,)
+            else:
+                labels = bags.get(c.route_from)
+                if not labels:
+                    continue
+            price = prices.get(c.train_id)
+            if price is None or not bookable(c.train_id):
+                continue
+            ready = c.departure_time - min_connection
+            target = best if c.route_to == destination else None
+            for label in tuple(labels):
+                if label[1] >= max_legs or (label is not start and label[0] > ready):
+                    continue
+                # Поездка дальше на том же поезде - его рейс от более ранней остановки
+                if label is not start and label[3].train_id == c.train_id:
+                    continue
+                legs = label[1] + 1
+                total = label[2] + price
+                if _dominated(best, c.arrival_time, legs, total):
+                    continue
+                bag = target if target is not None else bags.setdefault(c.route_to, [])
+                if target is None and _dominated(bag, c.arrival_time, legs, total):
+                    continue
+                _insert(bag, (c.arrival_time, legs, total, c, label))
+
+        journeys = []
+        for found in sorted(best, key=lambda label: label[:3]):
+            path = []
+            label = found
+            while label[3] is not None:
+                path.append(label[3])
+                label = label[4]
+            journeys.append(Journey(tuple(reversed(path)), round(found[2], 2)))
+        return journeys
@@ -0,0 +1,67 @@
+from typing import Iterable
+
+
+class OccupancyTracker:
+    """Счетчики занятых мест по (поезд, класс вагона).
+
+    Заполняется одним агрегирующим запросом, дальше обновляется на
+    бронировании и отмене: загрузка для котировки - чтение двух чисел
+    из словаря вместо COUNT(*) по местам.
+    """
+
+    __slots__ = ("_wagons", "_counters", "_trains")
+
+    def __init__(self, rows: Iterable = ()) -> None:
+        # wagon_id -> (train_id, wagon_type); (train_id, wagon_type) -> [занято, всего]
+        self._wagons: dict[int, tuple[int, str]] = {}
+        self._counters: dict[tuple[int, str], list[int]] = {}
+        # train_id -> счетчики всех классов поезда (те же списки, что в _counters)
+        self._trains: dict[int, list[list[int]]] = {}
+        for wagon_id, train_id, wagon_type, total_seats, occupied in rows:
+            self.add_wagon(wagon_id, train_id, wagon_type, total_seats, occupied)
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def add_wagon(
+        self,
+        wagon_id: int,
+        train_id: int,
+        wagon_type: str,
+        total_seats: int,
+        occupied: int = 0,
+    ) -> None:
+        key = (train_id, wagon_type)
+        self._wagons[wagon_id] = key
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [0, 0]
+            self._trains.setdefault(train_id, []).append(counter)
+        counter[0] += occupied
+        counter[1] += total_seats
+
+    def _change(self, wagon_id: int, delta: int) -> None:
+        key = self._wagons.get(wagon_id)
+        if key is None:
+            return
+        counter = self._counters[key]
+        counter[0] = min(max(counter[0] + delta, 0), counter[1])
+
+    def reserve(self, wagon_id: int) -> None:
+        self._change(wagon_id, 1)
+
+    def release(self, wagon_id: int) -> None:
+        self._change(wagon_id, -1)
+
+    def load_percent(self, train_id: int, wagon_type: str) -> int:
+        counter = self._counters.get((train_id, wagon_type))
+        if not counter or not counter[1]:
+            return 0
+        return counter[0] * 100 // counter[1]
+
+    def free_seats(self, train_id: int, wagon_type: str | None = None) -> int:
+        """Свободные места поезда в классе вагона (None - во всех классах)"""
+        if wagon_type is None:
+            return sum(total - taken for taken, total in self._trains.get(train_id, ()))
+        counter = self._counters.get((train_id, wagon_type))
+        return counter[1] - counter[0] if counter else 0
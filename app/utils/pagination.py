@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+
+from app.exceptions.pagination import InvalidCursorError
+
+
+def encode_cursor(*values) -> str:
+    """Упаковывает значения ключа сортировки последней записи в непрозрачную строку"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError from exc
+
+
+def split_page(items: list, limit: int, key) -> tuple[list, str | None]:
+    """Отрезает лишнюю запись у выборки из limit + 1 строк.
+
+    Если она была, возвращает курсор следующей страницы из key(последняя запись).
+    """
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(*key(items[-1]))
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Набор token bucket'ов одного маршрута, по одному на клиента.
+
+    Состояние клиента - кортеж (токены, время последнего обновления),
+    пополнение считается лениво при обращении. Ведра хранятся в порядке
+    последнего обращения: ведро, к которому не обращались дольше period,
+    успело наполниться и ничем не отличается от отсутствующего, поэтому
+    такие записи снимаются с начала очереди. Если клиентов больше max_keys,
+    вытесняются самые давние ведра.
+    """
+
+    __slots__ = ("capacity", "period", "rate", "max_keys", "_buckets")
+
+    def __init__(self, capacity: int, period: float, max_keys: int = 100_000) -> None:
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    @classmethod
+    def from_string(cls, limit: str, **kwargs) -> "TokenBucketLimiter":
+        """Создает лимитер из строки вида "10/60" (10 запросов за 60 секунд)"""
+        capacity, period = limit.split("/")
+        return cls(int(capacity), float(period), **kwargs)
+
+    def acquire(
+        self, key: str, now: float | None = None
+    ) -> tuple[bool, int, float, float]:
+        """Пытается забрать токен.
+
+        Возвращает (разрешено, осталось токенов, секунд до следующего токена,
+        секунд до полного восстановления ведра).
+        """
+        if now is None:
+            now = time.monotonic()
+        self.sweep(now)
+
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = self.capacity
+            # Место под нового клиента: вытеснить самые давние ведра
+            while len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, updated = bucket
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        retry_after = 0.0 if allowed else (1 - tokens) / self.rate
+        reset_after = (self.capacity - tokens) / self.rate
+        return allowed, int(tokens), retry_after, reset_after
+
+    def sweep(self, now: float) -> None:
+        """Снять наполнившиеся ведра; время - O(число снятых)"""
+        buckets, expired = self._buckets, now - self.period
+        while buckets:
+            key, (_, updated) = next(iter(buckets.items()))
+            if updated > expired:
+                break
+            del buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,90 @@
+import asyncio
+from collections import deque
+from typing import Iterable
+
+
+class SeatSubscription:
+    """Очередь изменений мест одного вагона для одного клиента.
+
+    Очередь ограничена: если клиент не успевает забирать изменения и их
+    накопилось больше limit, очередь сбрасывается и клиенту один раз
+    отправляется полная схема вагона вместо пропущенных изменений.
+    Публикация никогда не ждет медленного клиента.
+    """
+
+    __slots__ = ("wagon_id", "_limit", "_changes", "_stale", "_ready")
+
+    def __init__(self, wagon_id: int, limit: int) -> None:
+        self.wagon_id = wagon_id
+        self._limit = limit
+        self._changes: deque[tuple[int, bool]] = deque()
+        self._stale = False
+        self._ready = asyncio.Event()
+
+    def push(self, seat_number: int, free: bool) -> None:
+        if not self._stale:
+            if len(self._changes) < self._limit:
+                self._changes.append((seat_number, free))
+            else:
+                self.invalidate()
+                return
+        self._ready.set()
+
+    def invalidate(self) -> None:
+        """Вместо накопленных изменений отдать клиенту полную схему"""
+        self._changes.clear()
+        self._stale = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> list[tuple[int, bool]] | None:
+        """(номер места, свободно) с прошлого вызова; None - нужна полная схема.
+
+        Без изменений за timeout секунд возвращает пустой список.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except TimeoutError:
+            return []
+        self._ready.clear()
+        if self._stale:
+            self._stale = False
+            return None
+        changes = list(self._changes)
+        self._changes.clear()
+        return changes
+
+
+class SeatEvents:
+    """Раздача изменений мест подписчикам внутри процесса: тема - вагон"""
+
+    __slots__ = ("_limit", "_topics")
+
+    def __init__(self, limit: int = 256) -> None:
+        self._limit = limit
+        self._topics: dict[int, set[SeatSubscription]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(subscribers) for subscribers in self._topics.values())
+
+    def wagon_ids(self) -> Iterable[int]:
+        return self._topics.keys()
+
+    def subscribe(self, wagon_id: int) -> SeatSubscription:
+        subscription = SeatSubscription(wagon_id, self._limit)
+        self._topics.setdefault(wagon_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: SeatSubscription) -> None:
+        subscribers = self._topics.get(subscription.wagon_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[subscription.wagon_id]
+
+    def publish(self, wagon_id: int, seat_number: int, free: bool) -> None:
+        for subscription in self._topics.get(wagon_id, ()):
+            subscription.push(seat_number, free)
+
+    def invalidate(self, wagon_id: int) -> None:
+        for subscription in self._topics.get(wagon_id, ()):
+            subscription.invalidate()
@@ -0,0 +1,214 @@
+from base64 import b64encode
+from collections import deque
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Iterable
+
+# Шагов изменений мест, которые помнит вагон для запросов since=<версия>
+CHANGE_LOG_SIZE = 64
+
+
+class SeatMap:
+    """Свободные места вагона битовой маской.
+
+    Бит i (старший бит байта первым) - место с номером offset + i:
+    1 - свободно, 0 - занято или места с таким номером нет. Места
+    1..total_seats без строки в таблице мест (LAZY_SEAT_ROWS) свободны.
+    Если у всех мест есть строки и их id идут подряд в порядке номеров,
+    first_seat_id позволяет клиенту получить id места без списка мест.
+
+    version - версия мест вагона в БД (wagons.seat_version), по которой
+    собрана маска; None - неизвестна. Брони этого процесса меняют маску
+    сразу, а версию - только при следующей сверке с БД (carry_over): тогда
+    отличия от маски на прежней версии записываются шагом журнала, и
+    последние change_log шагов позволяют отдать клиенту только изменения.
+    """
+
+    __slots__ = (
+        "offset",
+        "size",
+        "first_seat_id",
+        "free",
+        "version",
+        "_bits",
+        "_synced",
+        "_change_log",
+        "_changes",
+    )
+
+    def __init__(
+        self,
+        total_seats: int,
+        seats: Iterable[tuple[int, int, bool]] = (),
+        version: int | None = None,
+        change_log: int = CHANGE_LOG_SIZE,
+    ) -> None:
+        # seats: строки мест (seat_id, seat_number, свободно) по возрастанию номера
+        seats = list(seats)
+        numbers = [seat[1] for seat in seats]
+        self.offset = min(numbers[:1] + [1])
+        last = max(numbers[-1:] + [total_seats])
+        self.size = max(last - self.offset + 1, 0)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.free = 0
+        for number in range(1, total_seats + 1):
+            self._set(number, True)
+        for _, number, free in seats:
+            self._set(number, free)
+
+        first_id = seats[0][0] if len(seats) == self.size else None
+        for index, (seat_id, _, _) in enumerate(seats):
+            if first_id is None or seat_id != first_id + index:
+                first_id = None
+                break
+        self.first_seat_id = first_id
+        self.version = version
+        # Маска на версии version, копируется при первой брони после сверки
+        self._synced: bytes | None = None
+        self._change_log = change_log
+        # Шаги (с версии, до версии, изменения мест); журнал создается при
+        # первом шаге - у большинства вагонов его нет
+        self._changes: deque[tuple[int, int, tuple]] | None = None
+
+    def _set(self, seat_number: int, free: bool) -> bool:
+        """Поменять бит места; True, если он изменился"""
+        index = seat_number - self.offset
+        if not 0 <= index < self.size:
+            return False
+        mask = 0x80 >> (index & 7)
+        byte = self._bits[index >> 3]
+        if bool(byte & mask) == free:
+            return False
+        self._bits[index >> 3] = byte ^ mask
+        self.free += 1 if free else -1
+        return True
+
+    def is_free(self, seat_number: int) -> bool:
+        index = seat_number - self.offset
+        return 0 <= index < self.size and bool(
+            self._bits[index >> 3] & (0x80 >> (index & 7))
+        )
+
+    def reserve(self, seat_number: int) -> None:
+        self._change(seat_number, False)
+
+    def release(self, seat_number: int) -> None:
+        self._change(seat_number, True)
+
+    def _change(self, seat_number: int, free: bool) -> None:
+        if self._synced is None and self.version is not None:
+            self._synced = bytes(self._bits)
+        self._set(seat_number, free)
+
+    def changes_since(self, version: int) -> list[tuple[int, bool]] | None:
+        """(номер места, свободно) после версии version, по одному на место.
+
+        None - версии нет в журнале (старше журнала или ее видел только
+        другой процесс), клиенту нужна полная схема.
+        """
+        if self.version is None:
+            return None
+        if version == self.version:
+            return []
+        steps = self._changes or ()
+        for index, (start, _, _) in enumerate(steps):
+            if start == version:
+                changes = {}
+                for _, _, step in islice(steps, index, None):
+                    changes.update(step)
+                return list(changes.items())
+        return None
+
+    def carry_over(self, previous: "SeatMap") -> None:
+        """Продолжить журнал прежней маски вагона; self - маска, только что прочитанная из БД.
+
+        Отличия от маски на прежней версии записываются шагом журнала. Если
+        поменялась разметка (число мест), журнал не переносится и клиенты
+        получат полную схему.
+        """
+        if previous.version is None or self.version is None:
+            return
+        if self.version == previous.version:
+            self._changes = previous._changes
+            return
+        if (previous.offset, previous.size) != (self.offset, self.size):
+            return
+        before = previous._synced if previous._synced is not None else previous._bits
+        changes = []
+        for index, (old, new) in enumerate(zip(before, self._bits)):
+            diff = old ^ new
+            for bit in range(8) if diff else ():
+                mask = 0x80 >> bit
+                if diff & mask:
+                    changes.append((self.offset + index * 8 + bit, bool(new & mask)))
+        self._changes = previous._changes or deque(maxlen=self._change_log)
+        self._changes.append((previous.version, self.version, tuple(changes)))
+
+    def encode(self) -> str:
+        return b64encode(self._bits).decode("ascii")
+
+
+class SeatMaps:
+    """Битовые маски мест всех вагонов: wagon_id -> SeatMap"""
+
+    __slots__ = ("_maps", "_change_log")
+
+    def __init__(
+        self, rows: Iterable[tuple] = (), change_log: int = CHANGE_LOG_SIZE
+    ) -> None:
+        # rows: (wagon_id, total_seats, seat_version, seat_id, seat_number,
+        # свободно) по вагону и номеру; у вагона без строк мест - одна строка
+        # с seat_id None
+        self._maps: dict[int, SeatMap] = {}
+        self._change_log = change_log
+        self.add_rows(rows)
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def get(self, wagon_id: int) -> SeatMap | None:
+        return self._maps.get(wagon_id)
+
+    def add_wagon(
+        self,
+        wagon_id: int,
+        total_seats: int,
+        seats: Iterable[tuple[int, int, bool]] = (),
+        version: int | None = None,
+    ) -> SeatMap:
+        seat_map = SeatMap(total_seats, seats, version, self._change_log)
+        old = self._maps.get(wagon_id)
+        self._maps[wagon_id] = seat_map if old is None else _newer(old, seat_map)
+        return self._maps[wagon_id]
+
+    def add_rows(self, rows: Iterable[tuple]) -> None:
+        """Добавить маски вагонов или заменить их прочитанными из БД"""
+        for wagon_id, wagon_rows in groupby(rows, key=itemgetter(0)):
+            wagon_rows = list(wagon_rows)
+            seats = [row[3:] for row in wagon_rows if row[3] is not None]
+            self.add_wagon(wagon_id, wagon_rows[0][1], seats, wagon_rows[0][2])
+
+    def carry_over(self, previous: "SeatMaps") -> None:
+        """Продолжить журналы вагонов прежнего набора масок"""
+        for wagon_id, seat_map in self._maps.items():
+            old = previous.get(wagon_id)
+            if old is not None:
+                self._maps[wagon_id] = _newer(old, seat_map)
+
+    def reserve(self, wagon_id: int, seat_number: int) -> None:
+        seat_map = self._maps.get(wagon_id)
+        if seat_map is not None:
+            seat_map.reserve(seat_number)
+
+    def release(self, wagon_id: int, seat_number: int) -> None:
+        seat_map = self._maps.get(wagon_id)
+        if seat_map is not None:
+            seat_map.release(seat_number)
+
+
+def _newer(old: SeatMap, new: SeatMap) -> SeatMap:
+    """Маска new с журналом old; old, если она собрана по более новой версии"""
+    if old.version is not None and (new.version is None or old.version > new.version):
+        return old
+    new.carry_over(old)
+    return new
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import NamedTuple, Sequence
+
+# Маска места, занятого на всем маршруте: пересекается с любым участком
+FULL_ROUTE = -1
+# Участки хранятся битами 0..62 знакового 64-битного целого
+MAX_STOPS = 64
+
+
+def segment_mask(from_stop: int, to_stop: int) -> int:
+    """Биты участков from_stop..to_stop - 1 (участок k - от остановки k до k + 1)"""
+    return ((1 << (to_stop - from_stop)) - 1) << from_stop
+
+
+class Segment(NamedTuple):
+    """Часть маршрута поезда, на которую продается место"""
+
+    mask: int
+    from_stop: int | None
+    to_stop: int | None
+    departure_time: datetime
+    arrival_time: datetime
+
+
+def train_segment(
+    train, stops: Sequence, from_stop: int | None, to_stop: int | None
+) -> Segment | None:
+    """Участок поезда между остановками; None, если таких остановок нет.
+
+    У поезда без списка остановок их две: route_from (0) и route_to (1).
+    Весь маршрут (без остановок в запросе или от первой до последней)
+    занимает место целиком - маской FULL_ROUTE.
+    """
+    last = len(stops) - 1 if stops else 1
+    if from_stop is None or (from_stop, to_stop) == (0, last):
+        return Segment(FULL_ROUTE, None, None, train.departure_time, train.arrival_time)
+    if not 0 <= from_stop < to_stop <= last:
+        return None
+    return Segment(
+        segment_mask(from_stop, to_stop),
+        from_stop,
+        to_stop,
+        stops[from_stop].departure_time or train.departure_time,
+        stops[to_stop].arrival_time or train.arrival_time,
+    )
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Количество COMMIT (а значит и групп fsync в SQLite) на типовые операции
+с билетами при работе через DBManager.
+
+    python -m benchmarks.bench_booking_commits
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.schemes.ticket_schemes import TicketCreate, TrainCreate, WagonCreate
+from app.services.ticket_service import TicketService, TrainService, WagonService
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    commits = 0
+
+    def on_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine.sync_engine, "commit", on_commit)
+
+    async def count(label, operation):
+        nonlocal commits
+        commits = 0
+        async with DBManager(session_factory=session_maker) as db:
+            result = await operation(db)
+        print(f"  {label:28s} {commits} commit")
+        return result
+
+    departure = datetime.now() + timedelta(days=1)
+    train = await count(
+        "создание поезда",
+        lambda db: TrainService(db).create_train(
+            TrainCreate(
+                train_number="001А",
+                route_from="Москва",
+                route_to="Казань",
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=12),
+                duration_hours=12,
+                base_price=2500,
+            )
+        ),
+    )
+    wagon = await count(
+        "создание вагона (54 места)",
+        lambda db: WagonService(db).create_wagon(
+            WagonCreate(
+                train_id=train.id,
+                wagon_number=1,
+                wagon_type="platzkart",
+                total_seats=54,
+            )
+        ),
+    )
+
+    async def book(db):
+        seat = (await db.seats.get_available_seats(wagon.id))[0]
+        service = TicketService(db)
+        price = await service.calculate_price(train, wagon)
+        ticket_data = TicketCreate(
+            train_id=train.id,
+            wagon_id=wagon.id,
+            seat_id=seat.id,
+            passenger_name="Иван Иванов",
+            passenger_email="ivan@example.com",
+            passenger_phone="+79990000000",
+        )
+        return await service.create_ticket(
+            ticket_data, price.base_price, price.final_price, train
+        )
+
+    ticket = await count("бронирование", book)
+    await count("оплата", lambda db: TicketService(db).pay_ticket(ticket.id))
+    await count("отмена", lambda db: TicketService(db).cancel_ticket(ticket))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Автодополнение городов: задержка CityIndex.suggest на городах add_trains.py
+и на тысяче синтетических названий, ввод кириллицей и латиницей.
+
+    python -m benchmarks.bench_city_index
+"""
+
+import random
+import statistics
+import time
+
+from add_trains import CITIES
+from app.utils.cities import CityIndex, normalize, transliterations
+
+QUERIES = 20_000
+SYLLABLES = ["ка", "зань", "мо", "ск", "ва", "пе", "тер", "бург", "но", "во", "сибирск"]
+
+
+def bench(index: CityIndex, names: list[str]) -> None:
+    prefixes = []
+    for _ in range(QUERIES):
+        name = normalize(random.choice(names))
+        if random.random() < 0.5:
+            name = sorted(transliterations(name))[0]
+        prefixes.append(name[: random.randint(1, len(name))])
+    latency = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        assert index.suggest(prefix), prefix
+        latency.append(time.perf_counter() - start)
+    latency.sort()
+    print(
+        f"  {len(index):5d} городов: p50 {statistics.median(latency) * 1e6:5.1f} мкс"
+        f"  p99 {latency[int(len(latency) * 0.99)] * 1e6:5.1f} мкс"
+    )
+
+
+def main() -> None:
+    random.seed(42)
+    bench(CityIndex((city, random.randint(1, 100)) for city in CITIES), CITIES)
+    synthetic = list(
+        {
+            "".join(random.choices(SYLLABLES, k=random.randint(2, 4))).capitalize()
+            for _ in range(1200)
+        }
+    )[:1000]
+    bench(CityIndex((city, random.randint(1, 100)) for city in synthetic), synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Экран цен: /calculate-price на каждую пару (вагон, скидка) против одного
+/fare-matrix для поезда и для выдачи поиска из нескольких поездов.
+Каждый "запрос" открывает свой DBManager, как зависимость DBDep.
+
+    python -m benchmarks.bench_fare_matrix
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.tickets import Train, Wagon
+from app.services.loaders import TicketLoaders
+from app.services.fare_rules import FareRulesService
+from app.services.ticket_service import TicketService
+
+TRAINS = 20
+WAGONS_PER_TRAIN = 12
+WAGON_TYPES = [("platzkart", 1.0), ("coupe", 1.5), ("suite", 2.0)]
+
+
+async def seed(session_maker) -> list[int]:
+    departure = datetime.now() + timedelta(days=1)
+    async with session_maker() as session:
+        trains = [
+            Train(
+                train_number=f"{i:03d}А",
+                route_from="Москва",
+                route_to="Казань",
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=12),
+                duration_hours=12,
+                base_price=2000 + 10 * i,
+            )
+            for i in range(TRAINS)
+        ]
+        session.add_all(trains)
+        await session.flush()
+        for train in trains:
+            for number in range(1, WAGONS_PER_TRAIN + 1):
+                wagon_type, multiplier = WAGON_TYPES[number % len(WAGON_TYPES)]
+                session.add(
+                    Wagon(
+                        train_id=train.id,
+                        wagon_number=number,
+                        wagon_type=wagon_type,
+                        total_seats=54,
+                        price_multiplier=multiplier,
+                    )
+                )
+        await session.commit()
+        return [train.id for train in trains]
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    train_ids = await seed(session_maker)
+
+    queries = 0
+
+    def on_execute(*args):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+
+    async with DBManager(session_factory=session_maker) as db:
+        wagon_ids = {
+            train_id: [wagon.id for wagon in wagons]
+            for train_id, wagons in (
+                await db.wagons.get_wagons_by_train_ids(train_ids)
+            ).items()
+        }
+
+    async def per_pair(ids):
+        # Как /calculate-price: поезд и вагон через загрузчики, одна цена
+        prices = []
+        for train_id in ids:
+            for wagon_id in wagon_ids[train_id]:
+                for discount_type in FareRulesService.rules().discounts:
+                    async with DBManager(session_factory=session_maker) as db:
+                        loaders = TicketLoaders(db)
+                        train, wagon = await asyncio.gather(
+                            loaders.trains.load(train_id),
+                            loaders.wagons.load(wagon_id),
+                        )
+                        price = await TicketService(db).calculate_price(
+                            train, wagon, discount_type
+                        )
+                        prices.append(price.final_price)
+        return prices
+
+    async def matrix(ids):
+        async with DBManager(session_factory=session_maker) as db:
+            fares = await TicketService(db).get_fare_matrix(ids)
+        return [
+            price
+            for train in fares.trains
+            for wagon in train.wagons
+            for price in wagon.final_prices
+        ]
+
+    for label, ids in (("1 поезд", train_ids[:1]), (f"{TRAINS} поездов", train_ids)):
+        print(f"{label}, {WAGONS_PER_TRAIN} вагонов в поезде:")
+        results = []
+        for name, run in (("/calculate-price x N", per_pair), ("/fare-matrix", matrix)):
+            queries = 0
+            start = time.perf_counter()
+            prices = await run(ids)
+            elapsed = time.perf_counter() - start
+            results.append(prices)
+            print(
+                f"  {name:22s} {len(prices):5d} цен  {queries:5d} запросов  "
+                f"{elapsed * 1000:9.1f} мс"
+            )
+        assert results[0] == results[1], "цены расходятся"
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Поиск маршрутов с пересадками: задержка Timetable.plan на сети из 13 городов
+add_trains.py с плотным расписанием на месяц. Для проверки варианты без
+пересадок и с одной пересадкой сверяются с перебором.
+
+    python -m benchmarks.bench_journeys
+"""
+
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from add_trains import CITIES
+from app.utils.journeys import Connection, Timetable
+
+DAYS = 30
+TRAINS_PER_DAY = 200
+QUERIES = 500
+MIN_CONNECTION = timedelta(minutes=30)
+HORIZON = timedelta(hours=72)
+
+
+def build() -> tuple[list[Connection], dict[int, float]]:
+    start = datetime(2030, 1, 1)
+    connections, prices = [], {}
+    for train_id in range(DAYS * TRAINS_PER_DAY):
+        route_from, route_to = random.sample(CITIES, 2)
+        departure = start + timedelta(minutes=random.randrange(DAYS * 24 * 60))
+        arrival = departure + timedelta(hours=random.randint(2, 14))
+        connections.append(
+            Connection(
+                departure, train_id, str(train_id), route_from, route_to, arrival, 0, 1
+            )
+        )
+        prices[train_id] = float(random.randint(500, 3000))
+    return connections, prices
+
+
+def brute_force(connections, prices, origin, destination, after):
+    """Все варианты из 1-2 поездов перебором - для сверки"""
+    end = after + HORIZON
+    window = [c for c in connections if after <= c.departure_time <= end]
+    options = [
+        (c.arrival_time, 1, prices[c.train_id])
+        for c in window
+        if c.route_from == origin and c.route_to == destination
+    ]
+    for first in window:
+        if first.route_from != origin or first.route_to == destination:
+            continue
+        for second in window:
+            if (
+                second.route_from == first.route_to
+                and second.route_to == destination
+                and second.departure_time - MIN_CONNECTION >= first.arrival_time
+            ):
+                options.append(
+                    (
+                        second.arrival_time,
+                        2,
+                        prices[first.train_id] + prices[second.train_id],
+                    )
+                )
+    return sorted(
+        {
+            option
+            for option in options
+            if not any(
+                other != option and all(o <= v for o, v in zip(other, option))
+                for other in options
+            )
+        }
+    )
+
+
+def main() -> None:
+    random.seed(42)
+    connections, prices = build()
+    timetable = Timetable(connections, prices)
+    print(f"Расписание: {len(timetable)} рейсов, {len(CITIES)} городов")
+
+    queries = [
+        (
+            *random.sample(CITIES, 2),
+            datetime(2030, 1, 1) + timedelta(days=random.randrange(DAYS - 3)),
+        )
+        for _ in range(QUERIES)
+    ]
+    for transfers in (0, 1, 2):
+        latency, options = [], []
+        for origin, destination, after in queries:
+            start = time.perf_counter()
+            journeys = timetable.plan(
+                origin, destination, after, transfers, MIN_CONNECTION, HORIZON
+            )
+            latency.append(time.perf_counter() - start)
+            options.append(len(journeys))
+        latency.sort()
+        print(
+            f"  до {transfers} пересадок: p50 {statistics.median(latency) * 1000:6.2f} мс"
+            f"  p99 {latency[int(len(latency) * 0.99)] * 1000:6.2f} мс"
+            f"  вариантов в среднем {statistics.mean(options):.1f}"
+        )
+
+    for origin, destination, after in queries[:20]:
+        journeys = timetable.plan(
+            origin, destination, after, 1, MIN_CONNECTION, HORIZON
+        )
+        found = sorted((j.arrival_time, len(j.legs), j.price) for j in journeys)
+        assert found == brute_force(connections, prices, origin, destination, after), (
+            origin,
+            destination,
+            after,
+        )
+    print("Варианты до 1 пересадки совпадают с перебором")
+
+
+if __name__ == "__main__":
+    main()
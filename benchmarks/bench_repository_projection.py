@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Сравнение режимов BaseRepository.get_all: ORM-сущности + model_validate
+против проекции колонок в схемы.
+
+    python -m benchmarks.bench_repository_projection --rows 20000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+from app.repositories.users import UsersRepository
+
+
+async def fill(session_maker, rows: int) -> None:
+    async with session_maker() as session:
+        await session.execute(insert(RoleModel).values(id=1, name="user"))
+        await session.execute(
+            insert(UserModel),
+            [
+                {
+                    "name": f"Пассажир {i}",
+                    "email": f"user{i}@example.com",
+                    "hashed_password": "$2b$12$" + "x" * 53,
+                    "role_id": 1,
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+
+
+async def measure(session_maker, projection: bool, repeat: int) -> tuple[float, int]:
+    UsersRepository.projection = projection
+    best = float("inf")
+    for _ in range(repeat):
+        async with session_maker() as session:
+            started = time.perf_counter()
+            users = await UsersRepository(session).get_all()
+            best = min(best, time.perf_counter() - started)
+
+    # Память меряем отдельным прогоном: tracemalloc заметно замедляет выборку
+    async with session_maker() as session:
+        tracemalloc.start()
+        await UsersRepository(session).get_all()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return len(users) / best, peak
+
+
+async def main(rows: int, repeat: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await fill(session_maker, rows)
+
+    print(f"Строк: {rows}")
+    for projection in (False, True):
+        rows_per_sec, peak = await measure(session_maker, projection, repeat)
+        mode = "проекция" if projection else "ORM"
+        print(
+            f"  {mode:9s} {rows_per_sec:12,.0f} строк/с"
+            f"   пик памяти {peak / 2**20:8.1f} МиБ"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Подписка на схему популярного вагона против опроса /layout: стоимость
+публикации изменения места на N подписчиков, задержка доставки и объем
+данных на клиента за серию продаж; опрос с since=<версия> получает только
+изменившиеся места или 304.
+
+    python -m benchmarks.bench_seat_events --subscribers 1000 --changes 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.utils.seat_events import SeatEvents
+from app.utils.seat_maps import SeatMap, SeatMaps
+
+SEATS = 54
+# Размер ответа /layout со списком мест вагона на 54 места
+LAYOUT_BYTES = 7227
+
+
+async def main(subscribers: int, changes: int, poll_seconds: float) -> None:
+    events = SeatEvents()
+    seat_map = SeatMap(SEATS)
+    delays: list[float] = []
+    received = [0] * subscribers
+    sizes = [0] * subscribers
+    sent_at: dict[int, float] = {}
+
+    async def client(index: int) -> None:
+        subscription = events.subscribe(1)
+        try:
+            while received[index] < changes:
+                batch = await subscription.next(5)
+                now = time.perf_counter()
+                for number, free in batch or ():
+                    delays.append(now - sent_at[number])
+                message = {
+                    "type": "delta",
+                    "wagon_id": 1,
+                    "free_seats": seat_map.free,
+                    "changes": [{"seat_number": n, "free": f} for n, f in batch or ()],
+                }
+                received[index] += len(batch or ())
+                sizes[index] += len(json.dumps(message))
+        finally:
+            events.unsubscribe(subscription)
+
+    tasks = [asyncio.create_task(client(i)) for i in range(subscribers)]
+    await asyncio.sleep(0)
+
+    publish = []
+    for i in range(changes):
+        number = i % SEATS + 1
+        free = i >= SEATS
+        if free:
+            seat_map.release(number)
+        else:
+            seat_map.reserve(number)
+        sent_at[number] = time.perf_counter()
+        started = time.perf_counter()
+        events.publish(1, number, free)
+        publish.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    duration = changes * 5  # одна продажа в 5 секунд
+    polled = duration / poll_seconds * LAYOUT_BYTES
+    polled_since, not_modified = since_polling(changes, poll_seconds)
+    print(f"Подписчиков: {subscribers}, изменений мест: {changes}")
+    print(
+        f"  публикация на всех подписчиков   {statistics.median(publish) * 1e6:10.1f} мкс (p50)"
+    )
+    print(
+        f"  задержка доставки                {statistics.median(delays) * 1e3:10.3f} мс (p50)"
+    )
+    print(
+        f"  данных на клиента: подписка      {statistics.mean(sizes) / 1024:10.1f} КБ"
+    )
+    print(f"  данных на клиента: опрос {poll_seconds:g} с     {polled / 1024:10.1f} КБ")
+    print(
+        f"  данных на клиента: опрос с since {polled_since / 1024:10.1f} КБ"
+        f" ({not_modified} ответов 304)"
+    )
+
+
+def since_polling(changes: int, poll_seconds: float) -> tuple[int, int]:
+    """Байт изменений за серию продаж при опросе с since и число ответов 304.
+
+    Каждая продажа - запись места (версия мест в БД + 1); на опросе маска
+    сверяется со строками мест, как в OccupancyService.seat_map.
+    """
+    seat_maps = SeatMaps(change_log=changes)
+    free = dict.fromkeys(range(1, SEATS + 1), True)
+    seat_maps.add_wagon(1, SEATS, version=0)
+    version = 0
+    size = not_modified = 0
+    polls = int(changes * 5 / poll_seconds)
+    sale = 0
+    for poll in range(1, polls + 1):
+        while sale < changes and sale * 5 < poll * poll_seconds:
+            free[sale % SEATS + 1] = sale >= SEATS
+            sale += 1
+        if sale == version:
+            not_modified += 1
+            continue
+        rows = [(1, SEATS, sale, n, n, f) for n, f in free.items()]
+        seat_maps.add_rows(rows)
+        seat_map = seat_maps.get(1)
+        message = {
+            "wagon_id": 1,
+            "version": seat_map.version,
+            "free_seats": seat_map.free,
+            "changes": [
+                {"seat_number": n, "free": f}
+                for n, f in seat_map.changes_since(version)
+            ],
+        }
+        size += len(json.dumps(message))
+        version = seat_map.version
+    return size, not_modified
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--changes", type=int, default=200)
+    parser.add_argument("--poll-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.changes, args.poll_seconds))
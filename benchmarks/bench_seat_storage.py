@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Хранение мест: строка на каждое место (по умолчанию) против LAZY_SEAT_ROWS,
+где строки есть только у проданных мест. Размер таблицы мест с индексами
+и задержка типовых запросов, каждый в своем DBManager, как зависимость DBDep.
+
+    python -m benchmarks.bench_seat_storage --trains 10000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.stations import StationModel
+from app.models.tickets import Seat, Train, Wagon
+from app.services.ticket_service import SeatService, TicketService
+from app.utils.segments import FULL_ROUTE
+
+SEATS_PER_WAGON = 54
+SEARCH_TRAINS = 20
+
+
+def chunks(rows, size: int = 50_000):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+async def fill(session_maker, trains: int, wagons: int, sold: float, lazy: bool):
+    departure = datetime(2030, 1, 1, 8, 0)
+    rng = random.Random(1)
+    async with session_maker() as session:
+        await session.execute(
+            insert(StationModel), [{"name": "Москва"}, {"name": "Казань"}]
+        )
+        await session.execute(
+            insert(Train),
+            [
+                {
+                    "train_number": f"{i:05d}А",
+                    "from_station_id": 1,
+                    "to_station_id": 2,
+                    "departure_time": departure + timedelta(hours=i % 2000),
+                    "arrival_time": departure + timedelta(hours=i % 2000 + 12),
+                    "duration_hours": 12,
+                    "base_price": 2500,
+                }
+                for i in range(trains)
+            ],
+        )
+        await session.execute(
+            insert(Wagon),
+            [
+                {
+                    "train_id": train_id,
+                    "wagon_number": number,
+                    "wagon_type": "platzkart",
+                    "total_seats": SEATS_PER_WAGON,
+                    "price_multiplier": 1.0,
+                }
+                for train_id in range(1, trains + 1)
+                for number in range(1, wagons + 1)
+            ],
+        )
+        seats = (
+            {
+                "wagon_id": wagon_id,
+                "seat_number": number,
+                "is_available": not taken,
+                "is_reserved": taken,
+            }
+            for wagon_id in range(1, trains * wagons + 1)
+            for number in range(1, SEATS_PER_WAGON + 1)
+            for taken in (rng.random() < sold,)
+            if taken or not lazy
+        )
+        for chunk in chunks(seats):
+            await session.execute(insert(Seat), chunk)
+        await session.commit()
+
+
+async def seats_size(session_maker) -> tuple[int, int]:
+    async with session_maker() as session:
+        rows = await session.execute(text("SELECT count(*) FROM seats"))
+        size = await session.execute(
+            text(
+                "SELECT sum(pgsize) FROM dbstat "
+                "JOIN sqlite_master AS m ON m.name = dbstat.name "
+                "WHERE m.tbl_name = 'seats'"
+            )
+        )
+        return rows.scalar(), size.scalar()
+
+
+async def latency(session_maker, operation, samples: int) -> float:
+    timings = []
+    for i in range(samples):
+        async with DBManager(session_factory=session_maker) as db:
+            started = time.perf_counter()
+            await operation(db, i)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def run(trains: int, wagons: int, sold: float, samples: int, lazy: bool):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    await fill(session_maker, trains, wagons, sold, lazy)
+    filled = time.perf_counter() - started
+    rows, size = await seats_size(session_maker)
+
+    rng = random.Random(2)
+    wagon_ids = [rng.randint(1, trains * wagons) for _ in range(samples)]
+    search = [
+        [
+            (train_id - 1) * wagons + number
+            for train_id in rng.sample(range(1, trains + 1), SEARCH_TRAINS)
+            for number in range(1, wagons + 1)
+        ]
+        for _ in range(samples)
+    ]
+
+    async def layout(db, i):
+        await SeatService(db).get_wagon_layout(wagon_ids[i])
+
+    async def counts(db, i):
+        await db.seats.count_available_seats_by_wagon_ids(search[i])
+
+    async def claim(db, i):
+        # Занять место по номеру и откатить: materialize + условный UPDATE
+        wagon = await db.wagons.get_wagon(wagon_ids[i])
+        seat = await TicketService(db).materialize_seat(wagon, SEATS_PER_WAGON)
+        await db.seats.claim_seats({seat.id: FULL_ROUTE})
+
+    mode = "LAZY_SEAT_ROWS" if lazy else "строка на место"
+    print(f"{mode} (заполнение {filled:.1f} с)")
+    print(f"  строк мест            {rows:12,d}")
+    print(f"  таблица + индексы     {size / 2**20:12.1f} МиБ")
+    print(f"  файл БД               {os.path.getsize(path) / 2**20:12.1f} МиБ")
+    for label, operation in (
+        ("схема вагона", layout),
+        (f"свободные места {SEARCH_TRAINS} поездов", counts),
+        ("занять место по номеру", claim),
+    ):
+        ms = await latency(session_maker, operation, samples)
+        print(f"  {label:28s} {ms:8.3f} мс (p50)")
+    await engine.dispose()
+
+
+async def main(trains: int, wagons: int, sold: float, samples: int) -> None:
+    print(
+        f"Поездов: {trains}, вагонов в поезде: {wagons}, "
+        f"мест в вагоне: {SEATS_PER_WAGON}, продано: {sold:.0%}"
+    )
+    for lazy in (False, True):
+        await run(trains, wagons, sold, samples, lazy)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trains", type=int, default=10_000)
+    parser.add_argument("--wagons", type=int, default=8)
+    parser.add_argument("--sold", type=float, default=0.3)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.trains, args.wagons, args.sold, args.samples))
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Продажа мест по участкам маршрута с промежуточными остановками: свободные
+места на участке по маскам мест (одна агрегация по seats) против подсчета
+пересекающихся билетов по tickets, и задержка условного UPDATE брони.
+
+    python -m benchmarks.bench_segment_inventory --trains 200 --stops 24
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.stations import StationModel
+from app.models.tickets import Seat, Ticket, Train, TrainStop, Wagon
+from app.utils.segments import segment_mask
+
+SEATS_PER_WAGON = 54
+
+
+def random_segment(rng: random.Random, stops: int) -> tuple[int, int]:
+    from_stop = rng.randrange(stops - 1)
+    return from_stop, rng.randint(from_stop + 1, min(from_stop + 6, stops - 1))
+
+
+async def fill(session_maker, trains: int, wagons: int, stops: int, sold: int):
+    departure = datetime(2030, 1, 1, 8, 0)
+    rng = random.Random(1)
+    async with session_maker() as session:
+        await session.execute(
+            insert(StationModel), [{"name": f"Станция {i}"} for i in range(stops)]
+        )
+        await session.execute(
+            insert(Train),
+            [
+                {
+                    "train_number": f"{i:05d}А",
+                    "from_station_id": 1,
+                    "to_station_id": stops,
+                    "departure_time": departure,
+                    "arrival_time": departure + timedelta(hours=stops),
+                    "duration_hours": stops,
+                    "base_price": 2500,
+                }
+                for i in range(trains)
+            ],
+        )
+        await session.execute(
+            insert(TrainStop),
+            [
+                {
+                    "train_id": train_id,
+                    "stop_index": index,
+                    "station_id": index + 1,
+                    "arrival_time": departure + timedelta(hours=index),
+                    "departure_time": departure + timedelta(hours=index, minutes=5),
+                }
+                for train_id in range(1, trains + 1)
+                for index in range(stops)
+            ],
+        )
+        await session.execute(
+            insert(Wagon),
+            [
+                {
+                    "train_id": train_id,
+                    "wagon_number": number,
+                    "wagon_type": "platzkart",
+                    "total_seats": SEATS_PER_WAGON,
+                    "price_multiplier": 1.0,
+                }
+                for train_id in range(1, trains + 1)
+                for number in range(1, wagons + 1)
+            ],
+        )
+
+        # Каждое место продается по непересекающимся участкам, пока хватает попыток
+        seats, tickets = [], []
+        for wagon_id in range(1, trains * wagons + 1):
+            train_id = (wagon_id - 1) // wagons + 1
+            for number in range(1, SEATS_PER_WAGON + 1):
+                seat_id = len(seats) + 1
+                mask = 0
+                for _ in range(sold):
+                    from_stop, to_stop = random_segment(rng, stops)
+                    if mask & segment_mask(from_stop, to_stop):
+                        continue
+                    mask |= segment_mask(from_stop, to_stop)
+                    tickets.append(
+                        {
+                            "train_id": train_id,
+                            "wagon_id": wagon_id,
+                            "seat_id": seat_id,
+                            "passenger_name": "Пассажир",
+                            "passenger_email": "p@example.com",
+                            "passenger_phone": "+79990000000",
+                            "base_price": 2500,
+                            "final_price": 2500,
+                            "ticket_number": f"T{len(tickets):09d}",
+                            "departure_time": departure,
+                            "arrival_time": departure,
+                            "from_stop": from_stop,
+                            "to_stop": to_stop,
+                        }
+                    )
+                seats.append(
+                    {
+                        "wagon_id": wagon_id,
+                        "seat_number": number,
+                        "is_available": mask == 0,
+                        "is_reserved": mask != 0,
+                        "segments_mask": mask,
+                    }
+                )
+        await session.execute(insert(Seat), seats)
+        await session.execute(insert(Ticket), tickets)
+        await session.commit()
+        return len(tickets)
+
+
+async def latency(session_maker, operation, samples: int) -> float:
+    timings = []
+    for i in range(samples):
+        async with DBManager(session_factory=session_maker) as db:
+            started = time.perf_counter()
+            await operation(db, i)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def main(trains: int, wagons: int, stops: int, sold: int, samples: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    started = time.perf_counter()
+    sold_tickets = await fill(session_maker, trains, wagons, stops, sold)
+    print(
+        f"Поездов: {trains}, остановок: {stops}, вагонов в поезде: {wagons}, "
+        f"мест в вагоне: {SEATS_PER_WAGON}, билетов: {sold_tickets:,d} "
+        f"(заполнение {time.perf_counter() - started:.1f} с)"
+    )
+
+    rng = random.Random(2)
+    queries = [
+        (rng.randint(1, trains), *random_segment(rng, stops)) for _ in range(samples)
+    ]
+
+    async def by_mask(db, i):
+        train_id, from_stop, to_stop = queries[i]
+        return await db.seats.count_free_seats_by_segment(
+            train_id, segment_mask(from_stop, to_stop)
+        )
+
+    async def by_tickets(db, i):
+        # Без масок: место занято, если есть билет на пересекающийся участок
+        train_id, from_stop, to_stop = queries[i]
+        taken = (
+            select(
+                Ticket.wagon_id, func.count(func.distinct(Ticket.seat_id)).label("n")
+            )
+            .where(
+                Ticket.train_id == train_id,
+                Ticket.from_stop < to_stop,
+                Ticket.to_stop > from_stop,
+            )
+            .group_by(Ticket.wagon_id)
+            .subquery()
+        )
+        result = await db.session.execute(
+            select(
+                Wagon.id,
+                Wagon.wagon_number,
+                Wagon.wagon_type,
+                Wagon.total_seats - func.coalesce(taken.c.n, 0),
+            )
+            .outerjoin(taken, taken.c.wagon_id == Wagon.id)
+            .where(Wagon.train_id == train_id)
+            .order_by(Wagon.wagon_number)
+        )
+        return result.tuples().all()
+
+    async def claim(db, i):
+        # Занять участок места и откатить: один условный UPDATE по маске
+        train_id, from_stop, to_stop = queries[i]
+        seat_id = ((train_id - 1) * wagons) * SEATS_PER_WAGON + 1 + i % SEATS_PER_WAGON
+        await db.seats.claim_seats({seat_id: segment_mask(from_stop, to_stop)})
+
+    async with DBManager(session_factory=session_maker) as db:
+        for i in range(samples):
+            assert await by_mask(db, i) == await by_tickets(db, i)
+
+    for label, operation in (
+        ("свободно на участке: маски мест", by_mask),
+        ("свободно на участке: пересечение билетов", by_tickets),
+        ("занять участок места", claim),
+    ):
+        ms = await latency(session_maker, operation, samples)
+        print(f"  {label:42s} {ms:8.3f} мс (p50)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trains", type=int, default=200)
+    parser.add_argument("--wagons", type=int, default=8)
+    parser.add_argument("--stops", type=int, default=24)
+    parser.add_argument("--sold", type=int, default=3, help="попыток продажи на место")
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.trains, args.wagons, args.stops, args.sold, args.samples))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Симуляция продаж с ценой по загрузке: проигрывает кривую продаж поезда
+за 60 дней до отправления (с отменами), показывает, как растет цена по
+ступеням загрузки, и сравнивает задержку котировки по счетчикам
+OccupancyTracker с подсчетом загрузки через COUNT(*) на каждую котировку.
+
+    python -m benchmarks.simulate_occupancy_pricing
+"""
+
+import asyncio
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models.fares import OccupancyTierModel
+from app.models.tickets import Seat, Wagon
+from app.schemes.ticket_schemes import TicketCreate, TrainCreate, WagonCreate
+from app.services.fare_rules import FareRulesService
+from app.services.occupancy import OccupancyService
+from app.services.ticket_service import TicketService, TrainService, WagonService
+
+DAYS = 60
+WAGONS = [("platzkart", 54), ("coupe", 36), ("suite", 18)]
+TIERS = [(0, 1.0), (50, 1.15), (75, 1.3), (90, 1.5)]
+TARGET_LOAD = 0.95
+CANCEL_RATE = 0.05
+
+
+def sales_curve(total: int) -> list[int]:
+    """Продажи по дням: логистическая кривая с пиком за ~2 недели до отправления"""
+    cumulative = [
+        total / (1 + math.exp(-(day - DAYS + 14) / 5)) for day in range(DAYS + 1)
+    ]
+    return [
+        round(cumulative[day]) - round(cumulative[day - 1])
+        for day in range(1, DAYS + 1)
+    ]
+
+
+async def count_load_percent(db: DBManager, train_id: int, wagon_type: str) -> int:
+    """Загрузка прямым подсчетом мест - то, что заменяет трекер"""
+    occupied = func.count(Seat.id).filter(
+        or_(Seat.is_available == False, Seat.is_reserved == True)  # noqa: E712
+    )
+    result = await db.session.execute(
+        select(occupied, func.count(Seat.id))
+        .join(Wagon, Wagon.id == Seat.wagon_id)
+        .where(Wagon.train_id == train_id, Wagon.wagon_type == wagon_type)
+    )
+    taken, total = result.one()
+    return taken * 100 // total if total else 0
+
+
+def percentile(values: list[float], q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * q))]
+
+
+async def main() -> None:
+    random.seed(42)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    departure = datetime.now().replace(microsecond=0) + timedelta(days=DAYS)
+    async with DBManager(session_factory=session_maker) as db:
+        train = await TrainService(db).create_train(
+            TrainCreate(
+                train_number="001А",
+                route_from="Москва",
+                route_to="Казань",
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=12),
+                duration_hours=12,
+                base_price=2500,
+            )
+        )
+        wagons = [
+            await WagonService(db).create_wagon(
+                WagonCreate(
+                    train_id=train.id,
+                    wagon_number=number,
+                    wagon_type=wagon_type,
+                    total_seats=seats,
+                )
+            )
+            for number, (wagon_type, seats) in enumerate(WAGONS, 1)
+        ]
+        db.session.add_all(
+            OccupancyTierModel(min_load_percent=load, multiplier=multiplier)
+            for load, multiplier in TIERS
+        )
+        await db.commit()
+
+    # Отдельный DBManager: его rollback не должен просрочить train и wagons
+    async with DBManager(session_factory=session_maker) as db:
+        await FareRulesService(db).reload()
+        await OccupancyService(db).resync()
+        free_seats = {
+            wagon.id: [seat.id for seat in await db.seats.get_available_seats(wagon.id)]
+            for wagon in wagons
+        }
+
+    tracker = OccupancyService.tracker()
+    capacity = sum(seats for _, seats in WAGONS)
+    tracker_latency, count_latency = [], []
+    booked = []
+
+    print(f"Поезд {capacity} мест, ступени загрузки {TIERS}")
+    print(f"{'день':>5} {'продано':>8} " + " ".join(f"{t:>16}" for t, _ in WAGONS))
+    for day, sales in enumerate(sales_curve(round(capacity * TARGET_LOAD)), 1):
+        for _ in range(sales):
+            candidates = [wagon for wagon in wagons if free_seats[wagon.id]]
+            if not candidates:
+                break
+            wagon = random.choice(candidates)
+            async with DBManager(session_factory=session_maker) as db:
+                service = TicketService(db)
+                start = time.perf_counter()
+                price = await service.calculate_price(train, wagon)
+                tracker_latency.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                await count_load_percent(db, train.id, wagon.wagon_type)
+                count_latency.append(time.perf_counter() - start)
+
+                seat_id = free_seats[wagon.id].pop()
+                ticket = await service.create_ticket(
+                    TicketCreate(
+                        train_id=train.id,
+                        wagon_id=wagon.id,
+                        seat_id=seat_id,
+                        passenger_name="Пассажир",
+                        passenger_email="passenger@example.com",
+                        passenger_phone="+79990000000",
+                    ),
+                    price.base_price,
+                    price.final_price,
+                    train,
+                )
+                booked.append(ticket)
+            if random.random() < CANCEL_RATE:
+                ticket = booked.pop(random.randrange(len(booked)))
+                async with DBManager(session_factory=session_maker) as db:
+                    await TicketService(db).cancel_ticket(ticket)
+                free_seats[ticket.wagon_id].append(ticket.seat_id)
+
+        if day % 10 == 0 or day == DAYS:
+            cells = []
+            async with DBManager(session_factory=session_maker) as db:
+                service = TicketService(db)
+                for wagon in wagons:
+                    load = tracker.load_percent(train.id, wagon.wagon_type)
+                    assert load == await count_load_percent(
+                        db, train.id, wagon.wagon_type
+                    ), "счетчик разошелся с таблицей мест"
+                    price = await service.calculate_price(train, wagon)
+                    cells.append(f"{load:3d}% {price.final_price:9.0f}₽")
+            print(f"{day:>5} {len(booked):>8} " + " ".join(f"{c:>16}" for c in cells))
+
+    print(f"\nКотировок: {len(tracker_latency)}")
+    for label, values in (
+        ("трекер в памяти", tracker_latency),
+        ("COUNT(*) на котировку", count_latency),
+    ):
+        print(
+            f"  {label:22s} p50 {statistics.median(values) * 1e6:8.1f} мкс"
+            f"  p99 {percentile(values, 0.99) * 1e6:8.1f} мкс"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+"""Переход на LAZY_SEAT_ROWS: удалить строки непроданных мест.
+
+Свободные места без билетов подразумеваются по wagons.total_seats, в таблице
+мест остаются только проданные и придержанные. Запускать после миграции
+e6c1a8f3d2b9 (уникальность (wagon_id, seat_number)) и включения
+LAZY_SEAT_ROWS=true, иначе новые вагоны снова получат строки всех мест.
+
+    python compact_seats.py
+"""
+
+import asyncio
+
+from app.config import settings
+from app.database.database import async_session_maker, engine
+from app.database.db_manager import DBManager
+
+
+async def compact_seats():
+    if not settings.LAZY_SEAT_ROWS:
+        print(
+            "⚠️  LAZY_SEAT_ROWS выключен: новые вагоны по-прежнему создают строки всех мест"
+        )
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        deleted = await db.seats.delete_unsold_seats()
+        await db.commit()
+    print(f"🪑 Удалено строк непроданных мест: {deleted}")
+
+    # Освободившиеся страницы возвращаются файлу БД только после VACUUM
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.exec_driver_sql("VACUUM")
+    await engine.dispose()
+    print("✅ VACUUM выполнен")
+
+
+if __name__ == "__main__":
+    asyncio.run(compact_seats())
@@ -1,6 +1,7 @@
+import asyncio
 import uvicorn
 import logging
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pathlib import Path
@@ -11,8 +12,33 @@ from app.api.sample import router as sample_router
 from app.api.auth import router as auth_router
 from app.api.roles import router as role_router
 from app.api.tickets import router as tickets_router
-from app.database.database import Base, engine
+from app.api.dependencies import get_admin_user_id
+from app.database.database import (
+    Base,
+    engine,
+    async_session_maker,
+    statement_cache_stats,
+)
+from app.database.db_manager import DBManager
 from app.services.auth import AuthService
+from app.services.token_revocation import (
+    TokenRevocationService,
+    rebuild_revocation_filter_periodically,
+)
+from app.services.fare_rules import (
+    FareRulesService,
+    reload_fare_rules,
+    reload_fare_rules_periodically,
+)
+from app.services.occupancy import resync_occupancy, resync_occupancy_periodically
+from app.services.cities import rebuild_city_index
+from app.services.stations import load_stations
+from app.services.schedules import (
+    materialize_schedules,
+    materialize_schedules_periodically,
+)
+from app.services.journeys import rebuild_timetable, rebuild_timetable_periodically
+from app.services.route_calendar import rebuild_route_calendar
 from app.exceptions.auth import InvalidJWTTokenError, JWTTokenExpiredError
 
 # Логирование
@@ -30,12 +56,51 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("✅ Таблицы успешно созданы")
+
+    # Тарифы: заполнить пустые таблицы значениями по умолчанию и скомпилировать
+    async with DBManager(session_factory=async_session_maker) as db:
+        await FareRulesService(db).seed_defaults()
+    await reload_fare_rules(async_session_maker)
+    fare_rules_task = asyncio.create_task(
+        reload_fare_rules_periodically(async_session_maker)
+    )
+    # Справочник станций: названия из запросов -> id
+    await load_stations(async_session_maker)
+    # Отправления по расписанию на ближайшие дни, до сборки индексов по поездам
+    await materialize_schedules(async_session_maker)
+    schedules_task = asyncio.create_task(
+        materialize_schedules_periodically(async_session_maker)
+    )
+    # Загрузка вагонов для цены по загрузке
+    await resync_occupancy(async_session_maker)
+    occupancy_task = asyncio.create_task(
+        resync_occupancy_periodically(async_session_maker)
+    )
+    # Календарь цен по маршрутам: после тарифов и загрузки, от которых зависит цена
+    await rebuild_route_calendar(async_session_maker)
+    # Индекс городов для автодополнения
+    await rebuild_city_index(async_session_maker)
+    # Расписание для поиска с пересадками
+    await rebuild_timetable(async_session_maker)
+    timetable_task = asyncio.create_task(
+        rebuild_timetable_periodically(async_session_maker)
+    )
+
+    # Фильтр отозванных токенов: первая сборка сразу, далее периодически
+    revocation_task = asyncio.create_task(
+        rebuild_revocation_filter_periodically(async_session_maker)
+    )
     
     # Здесь выполняется основной код приложения
     yield
     
     # Shutdown - очистка при выключении
     logger.info("😴 Приложение останавливается...")
+    revocation_task.cancel()
+    fare_rules_task.cancel()
+    occupancy_task.cancel()
+    timetable_task.cancel()
+    schedules_task.cancel()
     await engine.dispose()
     logger.info("✅ Соединение с БД закрыто")
 
@@ -74,7 +139,10 @@ async def auth_middleware(request: Request, call_next):
         # Разрешаем публичные эндпоинты для поиска и информации
         request.url.path.startswith("/api/tickets/trains/search") or
         request.url.path.startswith("/api/tickets/trains") or
-        request.url.path.startswith("/api/tickets/discounts")):
+        request.url.path.startswith("/api/tickets/discounts") or
+        # Поток схемы мест проверяет токен сам: EventSource не передает заголовки
+        (request.url.path.startswith("/api/tickets/wagons/") and
+         request.url.path.endswith("/layout/events"))):
         return await call_next(request)
     
     # Для остальных API routes проверяем токен
@@ -88,15 +156,35 @@ async def auth_middleware(request: Request, call_next):
         
         token = auth_header.replace("Bearer ", "")
         try:
-            AuthService.decode_token(token)
+            payload = AuthService.decode_token(token)
         except (InvalidJWTTokenError, JWTTokenExpiredError):
             return FileResponse(
                 Path(__file__).parent / "app" / "static" / "index.html",
                 status_code=200
             )
+
+        # Bloom-фильтр отсекает неотозванные токены без обращения к БД:
+        # сессия открывается только при возможном совпадении
+        if TokenRevocationService.may_be_revoked(payload):
+            async with DBManager(session_factory=async_session_maker) as db:
+                revoked = await TokenRevocationService(db).is_revoked(payload)
+        else:
+            revoked = False
+        if revoked:
+            return FileResponse(
+                Path(__file__).parent / "app" / "static" / "index.html",
+                status_code=200
+            )
     
     return await call_next(request)
 
+# Заголовки X-RateLimit-* из RateLimit - и на ответы с ошибкой (401, 409, ...)
+@app.middleware("http")
+async def rate_limit_headers_middleware(request: Request, call_next):
+    response = await call_next(request)
+    response.headers.update(getattr(request.state, "rate_limit_headers", {}))
+    return response
+
 # Маршруты API
 app.include_router(sample_router)
 app.include_router(auth_router)
@@ -117,6 +205,12 @@ try:
     from app.models.users import UserModel
     from app.models.tickets import Train, Wagon, Seat, Ticket
     from app.models.roles import RoleModel
+    from app.models.stations import StationModel
+    from app.models.schedules import TrainScheduleModel, ScheduleWagonModel
+    from app.models.fares import (
+        DiscountCategoryModel, WagonClassModel, FareRuleModel, OccupancyTierModel
+    )
+    from app.schemes.fares import SFareRuleAdd, SOccupancyTierAdd
     
     # SQLAdmin ModelViews
     class UserAdmin(ModelView, model=UserModel):
@@ -126,7 +220,22 @@ try:
         page_size = 10
         page_size_options = [10, 25, 50]
 
-    class TrainAdmin(ModelView, model=Train):
+    class ScheduleAdminMixin:
+        # Правка расписания или мест в обход API - пересобрать календарь цен
+        # и расписание для поиска с пересадками, справочник станций и индекс городов
+        async def after_model_change(self, data, model, is_created, request):
+            await load_stations(async_session_maker)
+            await rebuild_route_calendar(async_session_maker)
+            await rebuild_timetable(async_session_maker)
+            await rebuild_city_index(async_session_maker)
+
+        async def after_model_delete(self, model, request):
+            await load_stations(async_session_maker)
+            await rebuild_route_calendar(async_session_maker)
+            await rebuild_timetable(async_session_maker)
+            await rebuild_city_index(async_session_maker)
+
+    class TrainAdmin(ScheduleAdminMixin, ModelView, model=Train):
         name = "Поезд"
         name_plural = "Поезда"
         page_size = 10
@@ -134,31 +243,95 @@ try:
         # Отключаем удаление поездов для безопасности
         can_delete = False
 
-    class WagonAdmin(ModelView, model=Wagon):
+    class WagonAdmin(ScheduleAdminMixin, ModelView, model=Wagon):
         name = "Вагон"
         name_plural = "Вагоны"
         page_size = 10
         page_size_options = [10, 25, 50]
 
-    class SeatAdmin(ModelView, model=Seat):
+    class SeatAdmin(ScheduleAdminMixin, ModelView, model=Seat):
         name = "Место"
         name_plural = "Места"
         page_size = 20
         page_size_options = [10, 20, 50]
 
-    class TicketAdmin(ModelView, model=Ticket):
+    class TicketAdmin(ScheduleAdminMixin, ModelView, model=Ticket):
         name = "Билет"
         name_plural = "Билеты"
         page_size = 10
         page_size_options = [10, 25, 50]
         column_exclude_list = []  # Показываем все поля
 
+    class StationAdmin(ScheduleAdminMixin, ModelView, model=StationModel):
+        name = "Станция"
+        name_plural = "Станции"
+        page_size = 20
+        page_size_options = [10, 20, 50]
+        can_delete = False
+
+    # Шаблоны рейсов читаются при создании отправлений, пересборка индексов не нужна
+    class TrainScheduleAdmin(ModelView, model=TrainScheduleModel):
+        name = "Расписание"
+        name_plural = "Расписания"
+        page_size = 10
+        page_size_options = [10, 25, 50]
+
+    class ScheduleWagonAdmin(ModelView, model=ScheduleWagonModel):
+        name = "Вагон расписания"
+        name_plural = "Составы расписаний"
+        page_size = 20
+        page_size_options = [10, 20, 50]
+
     class RoleAdmin(ModelView, model=RoleModel):
         name = "Роль"
         name_plural = "Роли"
         page_size = 10
         page_size_options = [10, 25, 50]
     
+    class FareRulesAdminMixin:
+        # Правка тарифов сразу перекомпилирует правила в этом процессе
+        async def after_model_change(self, data, model, is_created, request):
+            await reload_fare_rules(async_session_maker)
+            await rebuild_route_calendar(async_session_maker)
+            await rebuild_timetable(async_session_maker)
+
+        async def after_model_delete(self, model, request):
+            await reload_fare_rules(async_session_maker)
+            await rebuild_route_calendar(async_session_maker)
+            await rebuild_timetable(async_session_maker)
+
+    class DiscountCategoryAdmin(FareRulesAdminMixin, ModelView, model=DiscountCategoryModel):
+        name = "Категория скидки"
+        name_plural = "Категории скидок"
+        page_size = 10
+        page_size_options = [10, 25, 50]
+
+    class WagonClassAdmin(FareRulesAdminMixin, ModelView, model=WagonClassModel):
+        name = "Класс вагона"
+        name_plural = "Классы вагонов"
+        page_size = 10
+        page_size_options = [10, 25, 50]
+
+    class FareRuleAdmin(FareRulesAdminMixin, ModelView, model=FareRuleModel):
+        name = "Тарифное правило"
+        name_plural = "Тарифные правила"
+        page_size = 10
+        page_size_options = [10, 25, 50]
+        
+        # Форма пишет в таблицу напрямую - проверяем ее схемой API, ошибка
+        # показывается в форме
+        async def on_model_change(self, data, model, is_created, request):
+            SFareRuleAdd.model_validate(data)
+    
+    class OccupancyTierAdmin(FareRulesAdminMixin, ModelView, model=OccupancyTierModel):
+        name = "Ступень цены по загрузке"
+        name_plural = "Цены по загрузке"
+        page_size = 10
+        page_size_options = [10, 25, 50]
+        
+        async def on_model_change(self, data, model, is_created, request):
+            SOccupancyTierAdd.model_validate(data)
+    
     # Регистрация SQLAdmin БЕЗ аутентификации
     admin = Admin(
         app=app,
@@ -172,7 +345,14 @@ try:
     admin.add_view(WagonAdmin)
     admin.add_view(SeatAdmin)
     admin.add_view(TicketAdmin)
+    admin.add_view(StationAdmin)
+    admin.add_view(TrainScheduleAdmin)
+    admin.add_view(ScheduleWagonAdmin)
     admin.add_view(RoleAdmin)
+    admin.add_view(DiscountCategoryAdmin)
+    admin.add_view(WagonClassAdmin)
+    admin.add_view(FareRuleAdmin)
+    admin.add_view(OccupancyTierAdmin)
     
     logger.info("✅ SQLAdmin зарегистрирован на /admin")
     logger.info("🔓 Админ панель открыта без пароля!")
@@ -195,6 +375,12 @@ async def root():
 async def health():
     return {"status": "ok", "service": "wagono-mesto"}
 
+# Статистика кэша скомпилированного SQL: в устоявшемся режиме misses не растут.
+# В top_misses - текст SQL, поэтому только для администратора
+@app.get("/health/statement-cache", dependencies=[Depends(get_admin_user_id)])
+async def statement_cache_health():
+    return statement_cache_stats.report()
+
 if __name__ == "__main__":
     logger.info("🚂 Запуск сервера ВагоноМесто...")
     uvicorn.run(
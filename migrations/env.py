@@ -12,7 +12,17 @@ from app.config import settings
 # ✅ Импортируем ВСЕ модели для Alembic
 from app.models.users import UserModel
 from app.models.roles import RoleModel
-from app.models.tickets import Train, Wagon, Seat, Ticket  # noqa: F401
+from app.models.revoked_tokens import RevokedTokenModel  # noqa: F401
+from app.models.route_calendar import RouteDayFareModel  # noqa: F401
+from app.models.schedules import TrainScheduleModel, ScheduleWagonModel  # noqa: F401
+from app.models.stations import StationModel  # noqa: F401
+from app.models.tickets import Train, TrainStop, Wagon, Seat, Ticket  # noqa: F401
+from app.models.fares import (  # noqa: F401
+    DiscountCategoryModel,
+    WagonClassModel,
+    FareRuleModel,
+    OccupancyTierModel,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,48 @@
+"""ticket user_id
+
+Revision ID: 5c7e2d41a8b3
+Revises: 3b1f7c2a9d04
+Create Date: 2026-10-19 11:02:47.518230
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7e2d41a8b3"
+down_revision: Union[str, Sequence[str], None] = "3b1f7c2a9d04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("tickets") as batch_op:
+        batch_op.add_column(sa.Column("user_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_tickets_user_id_users",
+            "users",
+            ["user_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch_op.create_index(
+            "ix_tickets_user_id_created_at", ["user_id", "created_at"], unique=False
+        )
+
+    # Старые билеты привязываем к пользователю с тем же email
+    op.execute(
+        "UPDATE tickets SET user_id = "
+        "(SELECT users.id FROM users WHERE users.email = tickets.passenger_email)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("tickets") as batch_op:
+        batch_op.drop_index("ix_tickets_user_id_created_at")
+        batch_op.drop_constraint("fk_tickets_user_id_users", type_="foreignkey")
+        batch_op.drop_column("user_id")
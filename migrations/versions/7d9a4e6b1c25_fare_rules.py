@@ -0,0 +1,142 @@
+"""fare rules
+
+Revision ID: 7d9a4e6b1c25
+Revises: 5c7e2d41a8b3
+Create Date: 2026-10-19 12:14:09.227641
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d9a4e6b1c25"
+down_revision: Union[str, Sequence[str], None] = "5c7e2d41a8b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    discount_categories = op.create_table(
+        "discount_categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("code", sa.String(length=20), nullable=False),
+        sa.Column("description", sa.String(length=200), nullable=False),
+        sa.Column("percent", sa.Float(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("code"),
+    )
+    wagon_classes = op.create_table(
+        "wagon_classes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("wagon_type", sa.String(length=20), nullable=False),
+        sa.Column("description", sa.String(length=200), nullable=False),
+        sa.Column("multiplier", sa.Float(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("wagon_type"),
+    )
+    op.create_table(
+        "fare_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("route_from", sa.String(length=100), nullable=True),
+        sa.Column("route_to", sa.String(length=100), nullable=True),
+        sa.Column("wagon_type", sa.String(length=20), nullable=True),
+        sa.Column("season_start", sa.String(length=5), nullable=True),
+        sa.Column("season_end", sa.String(length=5), nullable=True),
+        sa.Column("advance_min_days", sa.Integer(), nullable=True),
+        sa.Column("advance_max_days", sa.Integer(), nullable=True),
+        sa.Column("multiplier", sa.Float(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.CheckConstraint(
+            "season_start IS NULL OR (advance_min_days IS NULL AND advance_max_days IS NULL)",
+            name="ck_fare_rules_season_or_advance",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Значения, до этого зашитые в DiscountService и WagonService
+    op.bulk_insert(
+        discount_categories,
+        [
+            {
+                "code": "child",
+                "description": "Детская скидка (0-12 лет)",
+                "percent": 50.0,
+                "is_active": True,
+            },
+            {
+                "code": "student",
+                "description": "Студенческая скидка",
+                "percent": 25.0,
+                "is_active": True,
+            },
+            {
+                "code": "pensioner",
+                "description": "Пенсионная скидка",
+                "percent": 40.0,
+                "is_active": True,
+            },
+            {
+                "code": "none",
+                "description": "Без скидки",
+                "percent": 0.0,
+                "is_active": True,
+            },
+        ],
+    )
+    op.bulk_insert(
+        wagon_classes,
+        [
+            {"wagon_type": "platzkart", "description": "Плацкарт", "multiplier": 1.0},
+            {"wagon_type": "coupe", "description": "Купе", "multiplier": 1.5},
+            {"wagon_type": "suite", "description": "Люкс", "multiplier": 2.0},
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("fare_rules")
+    op.drop_table("wagon_classes")
+    op.drop_table("discount_categories")
@@ -0,0 +1,50 @@
+"""occupancy tiers
+
+Revision ID: 9e3b5f8c2d47
+Revises: 7d9a4e6b1c25
+Create Date: 2026-10-19 13:05:52.604318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3b5f8c2d47"
+down_revision: Union[str, Sequence[str], None] = "7d9a4e6b1c25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "occupancy_tiers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("train_id", sa.Integer(), nullable=True),
+        sa.Column("wagon_type", sa.String(length=20), nullable=True),
+        sa.Column("min_load_percent", sa.Integer(), nullable=False),
+        sa.Column("multiplier", sa.Float(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["train_id"], ["trains.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("occupancy_tiers")
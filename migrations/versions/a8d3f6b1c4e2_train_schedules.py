@@ -0,0 +1,127 @@
+"""train schedules
+
+Revision ID: a8d3f6b1c4e2
+Revises: f2a7c5e9b3d1
+Create Date: 2026-10-19 20:41:09.275318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6b1c4e2"
+down_revision: Union[str, Sequence[str], None] = "f2a7c5e9b3d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "train_schedules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("train_number", sa.String(length=50), nullable=False),
+        sa.Column("from_station_id", sa.Integer(), nullable=False),
+        sa.Column("to_station_id", sa.Integer(), nullable=False),
+        sa.Column("departure_time", sa.Time(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("base_price", sa.Float(), nullable=False),
+        sa.Column("days_of_week", sa.Integer(), nullable=False),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("valid_to", sa.Date(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["from_station_id"],
+            ["stations.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["to_station_id"],
+            ["stations.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("train_number"),
+    )
+    op.create_table(
+        "schedule_wagons",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("schedule_id", sa.Integer(), nullable=False),
+        sa.Column("wagon_number", sa.Integer(), nullable=False),
+        sa.Column("wagon_type", sa.String(length=20), nullable=False),
+        sa.Column("total_seats", sa.Integer(), nullable=False),
+        sa.Column("price_multiplier", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["schedule_id"], ["train_schedules.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "schedule_id",
+            "wagon_number",
+            name="uq_schedule_wagons_schedule_id_wagon_number",
+        ),
+    )
+
+    # Номер поезда больше не уникален сам по себе: отправления по расписанию
+    # повторяют номер шаблона и различаются временем отправления
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.add_column(sa.Column("schedule_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("service_date", sa.Date(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_trains_schedule_id_train_schedules",
+            "train_schedules",
+            ["schedule_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch_op.drop_index("ix_trains_train_number")
+        batch_op.create_index("ix_trains_train_number", ["train_number"], unique=False)
+        batch_op.create_unique_constraint(
+            "uq_trains_train_number_departure_time", ["train_number", "departure_time"]
+        )
+        batch_op.create_unique_constraint(
+            "uq_trains_schedule_id_service_date", ["schedule_id", "service_date"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.drop_constraint("uq_trains_schedule_id_service_date", type_="unique")
+        batch_op.drop_constraint(
+            "uq_trains_train_number_departure_time", type_="unique"
+        )
+        batch_op.drop_index("ix_trains_train_number")
+        batch_op.create_index("ix_trains_train_number", ["train_number"], unique=True)
+        batch_op.drop_constraint(
+            "fk_trains_schedule_id_train_schedules", type_="foreignkey"
+        )
+        batch_op.drop_column("service_date")
+        batch_op.drop_column("schedule_id")
+    op.drop_table("schedule_wagons")
+    op.drop_table("train_schedules")
@@ -0,0 +1,54 @@
+"""route day fares
+
+Revision ID: b4d8f1a6c3e9
+Revises: 9e3b5f8c2d47
+Create Date: 2026-10-19 15:21:07.318842
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d8f1a6c3e9"
+down_revision: Union[str, Sequence[str], None] = "9e3b5f8c2d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "route_day_fares",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("route_from", sa.String(length=100), nullable=False),
+        sa.Column("route_to", sa.String(length=100), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("min_fare", sa.Float(), nullable=True),
+        sa.Column("available_seats", sa.Integer(), nullable=False),
+        sa.Column("trains_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "route_from", "route_to", "day", name="uq_route_day_fares_route_day"
+        ),
+    )
+    # Сводка заполняется при старте приложения (RouteCalendarService.rebuild)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("route_day_fares")
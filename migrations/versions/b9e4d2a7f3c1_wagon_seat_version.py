@@ -0,0 +1,65 @@
+"""wagon seat version
+
+Revision ID: b9e4d2a7f3c1
+Revises: a8d3f6b1c4e2
+Create Date: 2026-10-19 23:12:36.418207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e4d2a7f3c1"
+down_revision: Union[str, Sequence[str], None] = "a8d3f6b1c4e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEAT_STATE_CHANGED = (
+    "OLD.is_available IS NOT NEW.is_available OR OLD.is_reserved IS NOT NEW.is_reserved "
+    "OR OLD.segments_mask IS NOT NEW.segments_mask OR OLD.seat_number IS NOT NEW.seat_number "
+    "OR OLD.wagon_id IS NOT NEW.wagon_id"
+)
+TRIGGERS = {
+    "seats_seat_version_insert": (
+        "CREATE TRIGGER seats_seat_version_insert AFTER INSERT ON seats BEGIN "
+        "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = NEW.wagon_id; END"
+    ),
+    "seats_seat_version_update": (
+        f"CREATE TRIGGER seats_seat_version_update AFTER UPDATE ON seats WHEN {SEAT_STATE_CHANGED} BEGIN "
+        "UPDATE wagons SET seat_version = seat_version + 1 WHERE id IN (OLD.wagon_id, NEW.wagon_id); END"
+    ),
+    "seats_seat_version_delete": (
+        "CREATE TRIGGER seats_seat_version_delete AFTER DELETE ON seats BEGIN "
+        "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = OLD.wagon_id; END"
+    ),
+    "wagons_seat_version_total_seats": (
+        "CREATE TRIGGER wagons_seat_version_total_seats AFTER UPDATE OF total_seats ON wagons "
+        "WHEN OLD.total_seats IS NOT NEW.total_seats BEGIN "
+        "UPDATE wagons SET seat_version = seat_version + 1 WHERE id = NEW.id; END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("wagons") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "seat_version", sa.BigInteger(), server_default="0", nullable=False
+            )
+        )
+    # Версия мест растет в той же транзакции, что и любая запись мест
+    for trigger in TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    with op.batch_alter_table("wagons") as batch_op:
+        batch_op.drop_column("seat_version")
@@ -0,0 +1,73 @@
+"""fare rule checks
+
+Revision ID: c3f8a1d6e2b4
+Revises: b9e4d2a7f3c1
+Create Date: 2026-10-20 10:41:17.530962
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d6e2b4"
+down_revision: Union[str, Sequence[str], None] = "b9e4d2a7f3c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def month_day_check(column: str) -> str:
+    digit = "('0','1','2','3','4','5','6','7','8','9')"
+    return (
+        f"{column} IS NULL OR (length({column}) = 5 AND substr({column}, 3, 1) = '-' "
+        f"AND substr({column}, 4, 1) IN ('0','1','2','3') AND substr({column}, 5, 1) IN {digit} "
+        f"AND substr({column}, 4, 2) >= '01' AND substr({column}, 4, 2) <= "
+        f"CASE substr({column}, 1, 2) WHEN '02' THEN '29' WHEN '04' THEN '30' "
+        f"WHEN '06' THEN '30' WHEN '09' THEN '30' WHEN '11' THEN '30' "
+        f"WHEN '01' THEN '31' WHEN '03' THEN '31' WHEN '05' THEN '31' WHEN '07' THEN '31' "
+        f"WHEN '08' THEN '31' WHEN '10' THEN '31' WHEN '12' THEN '31' ELSE '00' END)"
+    )
+
+
+FARE_RULE_CHECKS = {
+    "ck_fare_rules_season_pair": "(season_start IS NULL) = (season_end IS NULL)",
+    "ck_fare_rules_season_start": month_day_check("season_start"),
+    "ck_fare_rules_season_end": month_day_check("season_end"),
+    "ck_fare_rules_advance_days": (
+        "(advance_min_days IS NULL OR advance_min_days >= 0) AND "
+        "(advance_max_days IS NULL OR advance_max_days >= 0)"
+    ),
+}
+OCCUPANCY_TIER_CHECK = "min_load_percent BETWEEN 0 AND 100"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Строки, которые правила все равно не могли применить (несуществующий
+    # день, сезон одной датой, отрицательные сроки и проценты загрузки)
+    op.execute(
+        "DELETE FROM fare_rules WHERE NOT ("
+        + " AND ".join(
+            f"COALESCE(({condition}), 1)" for condition in FARE_RULE_CHECKS.values()
+        )
+        + ")"
+    )
+    op.execute(f"DELETE FROM occupancy_tiers WHERE NOT ({OCCUPANCY_TIER_CHECK})")
+
+    with op.batch_alter_table("fare_rules") as batch_op:
+        for name, condition in FARE_RULE_CHECKS.items():
+            batch_op.create_check_constraint(name, condition)
+    with op.batch_alter_table("occupancy_tiers") as batch_op:
+        batch_op.create_check_constraint(
+            "ck_occupancy_tiers_min_load_percent", OCCUPANCY_TIER_CHECK
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("occupancy_tiers") as batch_op:
+        batch_op.drop_constraint("ck_occupancy_tiers_min_load_percent", type_="check")
+    with op.batch_alter_table("fare_rules") as batch_op:
+        for name in reversed(FARE_RULE_CHECKS):
+            batch_op.drop_constraint(name, type_="check")
@@ -0,0 +1,33 @@
+"""trains route departure index
+
+Revision ID: c7e2a9d4f1b6
+Revises: b4d8f1a6c3e9
+Create Date: 2026-10-19 16:02:44.915207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2a9d4f1b6"
+down_revision: Union[str, Sequence[str], None] = "b4d8f1a6c3e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_trains_route_departure",
+        "trains",
+        ["route_from", "route_to", "departure_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_trains_route_departure", table_name="trains")
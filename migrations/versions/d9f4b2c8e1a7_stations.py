@@ -0,0 +1,172 @@
+"""stations
+
+Revision ID: d9f4b2c8e1a7
+Revises: c7e2a9d4f1b6
+Create Date: 2026-10-19 17:12:31.540926
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f4b2c8e1a7"
+down_revision: Union[str, Sequence[str], None] = "c7e2a9d4f1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _route_day_fares(
+    from_column: sa.Column, to_column: sa.Column, unique: tuple
+) -> None:
+    op.create_table(
+        "route_day_fares",
+        sa.Column("id", sa.Integer(), nullable=False),
+        from_column,
+        to_column,
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("min_fare", sa.Float(), nullable=True),
+        sa.Column("available_seats", sa.Integer(), nullable=False),
+        sa.Column("trains_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(*unique, name="uq_route_day_fares_route_day"),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.execute(
+        "INSERT INTO stations (name) "
+        "SELECT route_from FROM trains UNION SELECT route_to FROM trains"
+    )
+
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.add_column(sa.Column("from_station_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("to_station_id", sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE trains SET "
+        "from_station_id = (SELECT stations.id FROM stations WHERE stations.name = trains.route_from), "
+        "to_station_id = (SELECT stations.id FROM stations WHERE stations.name = trains.route_to)"
+    )
+
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.alter_column(
+            "from_station_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.alter_column(
+            "to_station_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.create_foreign_key(
+            "fk_trains_from_station_id_stations",
+            "stations",
+            ["from_station_id"],
+            ["id"],
+        )
+        batch_op.create_foreign_key(
+            "fk_trains_to_station_id_stations", "stations", ["to_station_id"], ["id"]
+        )
+        batch_op.drop_index("ix_trains_route_departure")
+        batch_op.drop_index("ix_trains_route_from")
+        batch_op.drop_index("ix_trains_route_to")
+        batch_op.drop_column("route_from")
+        batch_op.drop_column("route_to")
+        batch_op.create_index(
+            "ix_trains_route_departure",
+            ["from_station_id", "to_station_id", "departure_time"],
+            unique=False,
+        )
+
+    # Сводка календаря цен производная: пересобирается при старте приложения
+    op.drop_table("route_day_fares")
+    _route_day_fares(
+        sa.Column(
+            "from_station_id",
+            sa.Integer(),
+            sa.ForeignKey("stations.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "to_station_id", sa.Integer(), sa.ForeignKey("stations.id"), nullable=False
+        ),
+        ("from_station_id", "to_station_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("route_day_fares")
+    _route_day_fares(
+        sa.Column("route_from", sa.String(length=100), nullable=False),
+        sa.Column("route_to", sa.String(length=100), nullable=False),
+        ("route_from", "route_to", "day"),
+    )
+
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.add_column(
+            sa.Column("route_from", sa.String(length=100), nullable=True)
+        )
+        batch_op.add_column(sa.Column("route_to", sa.String(length=100), nullable=True))
+
+    op.execute(
+        "UPDATE trains SET "
+        "route_from = (SELECT stations.name FROM stations WHERE stations.id = trains.from_station_id), "
+        "route_to = (SELECT stations.name FROM stations WHERE stations.id = trains.to_station_id)"
+    )
+
+    with op.batch_alter_table("trains") as batch_op:
+        batch_op.alter_column(
+            "route_from", existing_type=sa.String(length=100), nullable=False
+        )
+        batch_op.alter_column(
+            "route_to", existing_type=sa.String(length=100), nullable=False
+        )
+        batch_op.drop_index("ix_trains_route_departure")
+        batch_op.drop_constraint(
+            "fk_trains_from_station_id_stations", type_="foreignkey"
+        )
+        batch_op.drop_constraint("fk_trains_to_station_id_stations", type_="foreignkey")
+        batch_op.drop_column("from_station_id")
+        batch_op.drop_column("to_station_id")
+        batch_op.create_index("ix_trains_route_from", ["route_from"], unique=False)
+        batch_op.create_index("ix_trains_route_to", ["route_to"], unique=False)
+        batch_op.create_index(
+            "ix_trains_route_departure",
+            ["route_from", "route_to", "departure_time"],
+            unique=False,
+        )
+
+    op.drop_table("stations")
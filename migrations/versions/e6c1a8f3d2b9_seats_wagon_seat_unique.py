@@ -0,0 +1,42 @@
+"""seats wagon seat unique
+
+Revision ID: e6c1a8f3d2b9
+Revises: d9f4b2c8e1a7
+Create Date: 2026-10-19 18:05:12.318604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c1a8f3d2b9"
+down_revision: Union[str, Sequence[str], None] = "d9f4b2c8e1a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубли номера места в вагоне: оставляем строку с билетом или с меньшим id
+    op.execute(
+        "DELETE FROM seats WHERE id NOT IN ("
+        "SELECT COALESCE(MIN(tickets.seat_id), MIN(seats.id)) FROM seats "
+        "LEFT JOIN tickets ON tickets.seat_id = seats.id "
+        "GROUP BY seats.wagon_id, seats.seat_number) "
+        "AND id NOT IN (SELECT seat_id FROM tickets)"
+    )
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.drop_index("ix_seats_wagon_id")
+        batch_op.create_unique_constraint(
+            "uq_seats_wagon_id_seat_number", ["wagon_id", "seat_number"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.drop_constraint("uq_seats_wagon_id_seat_number", type_="unique")
+        batch_op.create_index("ix_seats_wagon_id", ["wagon_id"], unique=False)
@@ -0,0 +1,87 @@
+"""train stops segments
+
+Revision ID: f2a7c5e9b3d1
+Revises: e6c1a8f3d2b9
+Create Date: 2026-10-19 19:24:47.902113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a7c5e9b3d1"
+down_revision: Union[str, Sequence[str], None] = "e6c1a8f3d2b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "train_stops",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("train_id", sa.Integer(), nullable=False),
+        sa.Column("stop_index", sa.Integer(), nullable=False),
+        sa.Column("station_id", sa.Integer(), nullable=False),
+        sa.Column("arrival_time", sa.DateTime(), nullable=True),
+        sa.Column("departure_time", sa.DateTime(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["train_id"],
+            ["trains.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["station_id"],
+            ["stations.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "train_id", "stop_index", name="uq_train_stops_train_id_stop_index"
+        ),
+    )
+    op.create_index(
+        "ix_train_stops_station_id_train_id",
+        "train_stops",
+        ["station_id", "train_id"],
+        unique=False,
+    )
+
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "segments_mask", sa.BigInteger(), server_default="0", nullable=False
+            )
+        )
+    # Проданные до участков места заняты на всем маршруте
+    op.execute(
+        "UPDATE seats SET segments_mask = -1 WHERE is_available = 0 OR is_reserved = 1"
+    )
+
+    with op.batch_alter_table("tickets") as batch_op:
+        batch_op.add_column(sa.Column("from_stop", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("to_stop", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("tickets") as batch_op:
+        batch_op.drop_column("to_stop")
+        batch_op.drop_column("from_stop")
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.drop_column("segments_mask")
+    op.drop_index("ix_train_stops_station_id_train_id", table_name="train_stops")
+    op.drop_table("train_stops")
@@ -8,7 +8,8 @@ from sqlalchemy import select
 
 from app.config import settings
 from app.database.database import Base
-from app.models.tickets import Train, Wagon, Seat
+from app.models.tickets import Train, Wagon
+from app.repositories.ticket_repository import SeatRepository
 
 engine = create_async_engine(settings.get_db_url, echo=False)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -171,9 +172,7 @@ async def setup_database():
             {"type": "suite", "number": 3, "seats": 18, "multiplier": 2.0}
         ]
         
-        wagon_count = 0
-        seat_count = 0
-        
+        wagons = []
         for train in trains:
             for config in wagon_configs:
                 wagon = Wagon(
@@ -184,19 +183,20 @@ async def setup_database():
                     price_multiplier=config["multiplier"]
                 )
                 session.add(wagon)
-                wagon_count += 1
-                await session.flush()
-                
-                # Создаём места для вагона
-                for seat_num in range(1, config["seats"] + 1):
-                    seat = Seat(
-                        wagon_id=wagon.id,
-                        seat_number=seat_num,
-                        is_reserved=False,
-                        is_available=True
-                    )
-                    session.add(seat)
-                    seat_count += 1
+                wagons.append(wagon)
+        await session.flush()
+        wagon_count = len(wagons)
+        
+        # Создаём места для всех вагонов пачками
+        seat_ids = await SeatRepository(session).add_bulk(
+            (
+                {"wagon_id": wagon.id, "seat_number": seat_num}
+                for wagon in wagons
+                for seat_num in range(1, wagon.total_seats + 1)
+            ),
+            returning=True
+        )
+        seat_count = len(seat_ids)
         
         await session.commit()
         print(f"✅ Добавлено {wagon_count} вагонов")
@@ -0,0 +1,116 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from itertools import count
+
+import pytest
+
+# Настройки читаются при импорте приложения: временная БД и без лимитов запросов
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from main import app as fastapi_app  # noqa: E402
+
+PASSENGER = {
+    "passenger_name": "Иван Петров",
+    "passenger_email": "ivan@example.com",
+    "passenger_phone": "+79990000000",
+}
+
+_numbers = count(1)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def app():
+    """Приложение с запущенным lifespan: таблицы, тарифы, индексы в памяти"""
+    from app.database.database import async_session_maker
+    from app.models.roles import RoleModel
+
+    async with fastapi_app.router.lifespan_context(fastapi_app):
+        async with async_session_maker() as session:
+            session.add(RoleModel(name="user"))
+            await session.commit()
+        yield fastapi_app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def auth_headers(client):
+    """Новый пользователь на каждый тест: его билеты не смешиваются с чужими"""
+    email = f"user{next(_numbers)}@example.com"
+    credentials = {"email": email, "password": "secret"}
+    response = await client.post(
+        "/api/auth/register", json={"name": "Тест", "role_id": 1, **credentials}
+    )
+    assert response.status_code == 200, response.text
+    response = await client.post("/api/auth/login", json=credentials)
+    assert response.status_code == 200, response.text
+    # Заголовок, а не cookie: клиент общий только в пределах теста
+    client.cookies.clear()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def create_train(client, auth_headers):
+    """Поезд с вагоном через API; stops - названия станций маршрута"""
+
+    async def create(
+        stops=("Москва", "Казань"), seats=4, start=datetime(2030, 1, 5, 8)
+    ):
+        number = next(_numbers)
+        body = {
+            "train_number": f"{number:03d}Т",
+            "route_from": stops[0],
+            "route_to": stops[-1],
+            "departure_time": start.isoformat(),
+            "arrival_time": (start + timedelta(hours=2 * (len(stops) - 1))).isoformat(),
+            "duration_hours": 2 * (len(stops) - 1),
+            "base_price": 1000,
+        }
+        if len(stops) > 2:
+            body["stops"] = [
+                {
+                    "station": station,
+                    "arrival_time": (
+                        (start + timedelta(hours=2 * i)).isoformat() if i else None
+                    ),
+                    "departure_time": (
+                        (start + timedelta(hours=2 * i, minutes=5)).isoformat()
+                        if i < len(stops) - 1
+                        else None
+                    ),
+                }
+                for i, station in enumerate(stops)
+            ]
+        response = await client.post(
+            "/api/tickets/trains", headers=auth_headers, json=body
+        )
+        assert response.status_code == 200, response.text
+        train_id = response.json()["id"]
+        response = await client.post(
+            "/api/tickets/wagons",
+            headers=auth_headers,
+            json={
+                "train_id": train_id,
+                "wagon_number": 1,
+                "wagon_type": "coupe",
+                "total_seats": seats,
+            },
+        )
+        assert response.status_code == 200, response.text
+        return train_id, response.json()["id"]
+
+    return create
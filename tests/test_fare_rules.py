@@ -0,0 +1,103 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.fare_rules import CompiledFareRules, parse_month_day
+
+
+def rule(
+    id=1, multiplier=1.0, route_from=None, route_to=None, wagon_type=None, **fields
+):
+    return SimpleNamespace(
+        id=id,
+        route_from=route_from,
+        route_to=route_to,
+        wagon_type=wagon_type,
+        multiplier=multiplier,
+        season_start=fields.get("season_start"),
+        season_end=fields.get("season_end"),
+        advance_min_days=fields.get("advance_min_days"),
+        advance_max_days=fields.get("advance_max_days"),
+    )
+
+
+def tier(id, min_load_percent, multiplier, train_id=None, wagon_type=None):
+    return SimpleNamespace(
+        id=id,
+        train_id=train_id,
+        wagon_type=wagon_type,
+        min_load_percent=min_load_percent,
+        multiplier=multiplier,
+    )
+
+
+def adjustment(rules, departure, today=date(2030, 1, 1), route=("Москва", "Казань")):
+    compiled = CompiledFareRules({}, {}, rules)
+    return compiled.adjustment(*route, "coupe", departure, today=today)
+
+
+def test_parse_month_day():
+    assert parse_month_day("01-01") == 0
+    assert parse_month_day("03-01") == 60
+    assert parse_month_day("12-31") == 365
+    with pytest.raises(ValueError):
+        parse_month_day("02-30")
+
+
+def test_rules_multiply_across_keys():
+    rules = [
+        rule(1, 1.5, route_from="Москва", route_to="Казань"),
+        rule(2, 2.0, wagon_type="coupe"),
+        rule(3, 3.0, route_from="Казань"),
+    ]
+    assert adjustment(rules, datetime(2030, 6, 1)) == pytest.approx(3.0)
+
+
+def test_season_wrapping_new_year():
+    rules = [rule(1, 1.2, season_start="12-20", season_end="01-10")]
+    for day in (datetime(2030, 12, 20), datetime(2030, 12, 31), datetime(2031, 1, 10)):
+        assert adjustment(rules, day, today=date(2030, 12, 1)) == pytest.approx(1.2)
+    for day in (datetime(2030, 12, 19), datetime(2031, 1, 11), datetime(2031, 7, 1)):
+        assert adjustment(rules, day, today=date(2030, 12, 1)) == pytest.approx(1.0)
+
+
+def test_advance_purchase_window():
+    rules = [rule(1, 0.8, advance_min_days=30), rule(2, 1.3, advance_max_days=2)]
+    today = date(2030, 1, 1)
+    assert adjustment(rules, datetime(2030, 3, 1), today) == pytest.approx(0.8)
+    assert adjustment(rules, datetime(2030, 1, 2), today) == pytest.approx(1.3)
+    assert adjustment(rules, datetime(2030, 1, 15), today) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"season_start": "12-20"},
+        {"season_start": "13-01", "season_end": "01-10"},
+        {"season_start": "12-20", "season_end": "bad"},
+        {"advance_min_days": -1},
+    ],
+)
+def test_invalid_rule_is_skipped(bad, caplog):
+    rules = [rule(1, 2.0), rule(2, 5.0, **bad)]
+    assert adjustment(rules, datetime(2030, 12, 25)) == pytest.approx(2.0)
+    assert "Тарифное правило 2 пропущено" in caplog.text
+
+
+def test_occupancy_tiers():
+    compiled = CompiledFareRules(
+        {},
+        {},
+        occupancy_tiers=[
+            tier(1, 50, 1.2),
+            tier(2, 90, 1.5),
+            tier(3, 0, 2.0, train_id=7),
+            tier(4, 120, 3.0),
+        ],
+    )
+    assert compiled.occupancy_multiplier(1, "coupe", 10) == 1.0
+    assert compiled.occupancy_multiplier(1, "coupe", 50) == 1.2
+    assert compiled.occupancy_multiplier(1, "coupe", 100) == 1.5
+    # Шкала конкретного поезда важнее общей
+    assert compiled.occupancy_multiplier(7, "coupe", 95) == 2.0
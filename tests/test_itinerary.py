@@ -0,0 +1,71 @@
+import pytest
+
+from tests.conftest import PASSENGER
+
+pytestmark = pytest.mark.anyio
+
+
+async def free_seat_numbers(client, headers, wagon_id):
+    response = await client.get(
+        f"/api/tickets/wagons/{wagon_id}/available", headers=headers
+    )
+    return [seat["seat_number"] for seat in response.json()]
+
+
+async def test_itinerary_books_all_legs(client, auth_headers, create_train):
+    first_train, first_wagon = await create_train(stops=("Москва", "Казань"))
+    second_train, second_wagon = await create_train(stops=("Казань", "Екатеринбург"))
+
+    response = await client.post(
+        "/api/tickets/itinerary",
+        headers=auth_headers,
+        json={
+            **PASSENGER,
+            "legs": [
+                {"train_id": first_train, "wagon_id": first_wagon, "seat_number": 1},
+                {"train_id": second_train, "wagon_id": second_wagon, "seat_number": 1},
+            ],
+        },
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert len(body["tickets"]) == 2
+    assert body["total_price"] == round(
+        sum(t["final_price"] for t in body["tickets"]), 2
+    )
+
+
+async def test_itinerary_rolls_back_on_seat_conflict(
+    client, auth_headers, create_train
+):
+    first_train, first_wagon = await create_train(stops=("Москва", "Казань"))
+    second_train, second_wagon = await create_train(stops=("Казань", "Екатеринбург"))
+    taken = await client.post(
+        "/api/tickets/create",
+        headers=auth_headers,
+        json={
+            **PASSENGER,
+            "train_id": second_train,
+            "wagon_id": second_wagon,
+            "seat_number": 2,
+        },
+    )
+    assert taken.status_code == 200, taken.text
+
+    response = await client.post(
+        "/api/tickets/itinerary",
+        headers=auth_headers,
+        json={
+            **PASSENGER,
+            "legs": [
+                {"train_id": first_train, "wagon_id": first_wagon, "seat_number": 1},
+                {"train_id": second_train, "wagon_id": second_wagon, "seat_number": 2},
+            ],
+        },
+    )
+    assert response.status_code == 409
+
+    # Первая нога не должна остаться проданной
+    assert await free_seat_numbers(client, auth_headers, first_wagon) == [1, 2, 3, 4]
+    response = await client.get("/api/tickets/my-tickets", headers=auth_headers)
+    assert [t["id"] for t in response.json()["items"]] == [taken.json()["id"]]
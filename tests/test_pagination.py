@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.exceptions.pagination import InvalidCursorError
+from app.utils.pagination import decode_cursor, encode_cursor, split_page
+from tests.conftest import PASSENGER
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    values = [datetime(2030, 1, 5, 8, 30), 42, "Москва"]
+    assert decode_cursor(encode_cursor(*values)) == values
+
+
+@pytest.mark.parametrize(
+    "cursor", ["не base64", raw_cursor({"a": 1})[:-2], raw_cursor([{"x": 1}])]
+)
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_split_page():
+    items, cursor = split_page([1, 2, 3], 2, key=lambda item: (item,))
+    assert items == [1, 2]
+    assert decode_cursor(cursor) == [2]
+    assert split_page([1, 2], 2, key=lambda item: (item,)) == ([1, 2], None)
+
+
+@pytest.mark.anyio
+async def test_my_tickets_pages(client, auth_headers, create_train):
+    train_id, wagon_id = await create_train(seats=5)
+    for seat_number in range(1, 6):
+        response = await client.post(
+            "/api/tickets/create",
+            headers=auth_headers,
+            json={
+                **PASSENGER,
+                "train_id": train_id,
+                "wagon_id": wagon_id,
+                "seat_number": seat_number,
+            },
+        )
+        assert response.status_code == 200, response.text
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(
+            "/api/tickets/my-tickets", headers=auth_headers, params=params
+        )
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen += [ticket["id"] for ticket in page["items"]]
+        if not page.get("next_cursor"):
+            break
+        params["cursor"] = page["next_cursor"]
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "payload",
+    [
+        ["x", 1],
+        [{"dt": "2030-01-01T00:00:00"}, "1"],
+        [{"dt": "2030-01-01T00:00:00"}],
+        [{"dt": "2030-01-01T00:00:00"}, 1, 2],
+    ],
+)
+async def test_my_tickets_rejects_bad_cursor(client, auth_headers, payload):
+    response = await client.get(
+        "/api/tickets/my-tickets",
+        headers=auth_headers,
+        params={"cursor": raw_cursor(payload)},
+    )
+    assert response.status_code == 400
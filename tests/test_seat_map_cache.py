@@ -0,0 +1,64 @@
+import pytest
+
+from tests.conftest import PASSENGER
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_layout_etag_and_since(client, auth_headers, create_train):
+    train_id, wagon_id = await create_train(seats=4)
+    url = f"/api/tickets/wagons/{wagon_id}/layout"
+
+    response = await client.get(url, headers=auth_headers, params={"compact": True})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    version = response.json()["version"]
+    assert etag == f'"{version}"'
+
+    response = await client.get(
+        url, headers={**auth_headers, "If-None-Match": etag}, params={"compact": True}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    response = await client.get(url, headers=auth_headers, params={"since": version})
+    assert response.status_code == 304
+
+    response = await client.post(
+        "/api/tickets/create",
+        headers=auth_headers,
+        json={
+            **PASSENGER,
+            "train_id": train_id,
+            "wagon_id": wagon_id,
+            "seat_number": 3,
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    # Продажа меняет версию: старый ETag больше не совпадает
+    response = await client.get(
+        url, headers={**auth_headers, "If-None-Match": etag}, params={"compact": True}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["free_seats"] == 3
+
+    response = await client.get(url, headers=auth_headers, params={"since": version})
+    assert response.status_code == 200
+    delta = response.json()
+    assert delta["version"] > version
+    assert delta["free_seats"] == 3
+    assert delta["changes"] == [{"seat_number": 3, "free": False}]
+
+
+async def test_layout_since_unknown_version_returns_full_map(
+    client, auth_headers, create_train
+):
+    _, wagon_id = await create_train(seats=4)
+    response = await client.get(
+        f"/api/tickets/wagons/{wagon_id}/layout",
+        headers=auth_headers,
+        params={"since": -100, "compact": True},
+    )
+    assert response.status_code == 200
+    assert response.json()["seat_count"] == 4
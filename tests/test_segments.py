@@ -0,0 +1,98 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.segments import FULL_ROUTE, segment_mask, train_segment
+from tests.conftest import PASSENGER
+
+TRAIN = SimpleNamespace(
+    departure_time=datetime(2030, 1, 5, 8), arrival_time=datetime(2030, 1, 5, 14)
+)
+STOPS = [
+    SimpleNamespace(arrival_time=None, departure_time=datetime(2030, 1, 5, 8)),
+    SimpleNamespace(
+        arrival_time=datetime(2030, 1, 5, 10),
+        departure_time=datetime(2030, 1, 5, 10, 5),
+    ),
+    SimpleNamespace(
+        arrival_time=datetime(2030, 1, 5, 12),
+        departure_time=datetime(2030, 1, 5, 12, 5),
+    ),
+    SimpleNamespace(arrival_time=datetime(2030, 1, 5, 14), departure_time=None),
+]
+
+
+def test_segment_mask_overlap():
+    assert segment_mask(0, 1) == 0b001
+    assert segment_mask(1, 3) == 0b110
+    # Соседние участки делят остановку, но не перегон
+    assert segment_mask(0, 1) & segment_mask(1, 3) == 0
+    assert segment_mask(0, 2) & segment_mask(1, 3) != 0
+
+
+def test_train_segment():
+    segment = train_segment(TRAIN, STOPS, 1, 3)
+    assert segment.mask == segment_mask(1, 3)
+    assert segment.departure_time == datetime(2030, 1, 5, 10, 5)
+    assert segment.arrival_time == datetime(2030, 1, 5, 14)
+
+
+def test_train_segment_full_route():
+    # Весь маршрут занимает место целиком и пересекается с любым участком
+    assert train_segment(TRAIN, STOPS, None, None).mask == FULL_ROUTE
+    assert train_segment(TRAIN, STOPS, 0, 3).mask == FULL_ROUTE
+    assert train_segment(TRAIN, (), 0, 1).mask == FULL_ROUTE
+    assert FULL_ROUTE & segment_mask(2, 3) != 0
+
+
+@pytest.mark.parametrize("from_stop, to_stop", [(0, 4), (2, 2), (3, 1)])
+def test_train_segment_invalid(from_stop, to_stop):
+    assert train_segment(TRAIN, STOPS, from_stop, to_stop) is None
+
+
+@pytest.mark.anyio
+async def test_claim_and_release_segments(client, auth_headers, create_train):
+    train_id, wagon_id = await create_train(
+        stops=("Москва", "Владимир", "Нижний Новгород", "Казань")
+    )
+
+    async def book(from_stop, to_stop):
+        return await client.post(
+            "/api/tickets/create",
+            headers=auth_headers,
+            json={
+                **PASSENGER,
+                "train_id": train_id,
+                "wagon_id": wagon_id,
+                "seat_number": 1,
+                "from_stop": from_stop,
+                "to_stop": to_stop,
+            },
+        )
+
+    async def free_seats(from_stop, to_stop):
+        response = await client.get(
+            f"/api/tickets/trains/{train_id}/availability",
+            headers=auth_headers,
+            params={"from_stop": from_stop, "to_stop": to_stop},
+        )
+        return response.json()[0]["free_seats"]
+
+    first = await book(0, 2)
+    assert first.status_code == 200, first.text
+    assert (await book(1, 3)).status_code == 409
+    second = await book(2, 3)
+    assert second.status_code == 200, second.text
+    assert await free_seats(0, 1) == 3
+    assert await free_seats(2, 3) == 3
+
+    response = await client.delete(
+        f"/api/tickets/delete/{first.json()['id']}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    # Освобождены только участки отмененного билета
+    assert await free_seats(0, 2) == 4
+    assert await free_seats(2, 3) == 3
+    assert (await book(1, 3)).status_code == 409
+    assert (await book(0, 1)).status_code == 200